@@ -0,0 +1,152 @@
+# app/core/ai_client.py
+import asyncio
+import time
+from .config import settings
+from .telemetry import record_ai_call
+
+class AIClientError(Exception):
+    """
+    Raised when a model call fails, misses its deadline or returns an unusable response.
+    """
+
+class GeminiClient:
+    """
+    A small async client for the Gemini REST API.
+
+    - One shared httpx.AsyncClient keeps connections alive across calls.
+    - A semaphore caps the number of in-flight calls, so a slow model can't
+      pile up unbounded work inside the worker.
+    - Every call has a deadline that covers both queueing and the network
+      round trip, so callers fail fast instead of hanging.
+    - Nothing happens until the first call: options left as None are read
+      from settings then, and httpx is only imported then, which keeps it
+      off the worker's cold-start path.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str | None = None,
+        base_url: str | None = None,
+        max_concurrency: int | None = None,
+        timeout: float | None = None,
+    ):
+        self._options = {
+            "api_key": api_key,
+            "model": model,
+            "base_url": base_url,
+            "max_concurrency": max_concurrency,
+            "timeout": timeout,
+        }
+        self._configured = False
+        self._semaphore = None
+        self._http = None
+        self._loop = None
+
+    def _configure(self):
+        if self._configured:
+            return
+        defaults = {
+            "api_key": settings.GEMINI_API_KEY,
+            "model": settings.GEMINI_MODEL,
+            "base_url": settings.GEMINI_API_BASE_URL,
+            "max_concurrency": settings.AI_MAX_CONCURRENCY,
+            "timeout": settings.AI_TIMEOUT_SECONDS,
+        }
+        for name, value in self._options.items():
+            setattr(self, name, value if value is not None else defaults[name])
+        self._configured = True
+
+    @property
+    def enabled(self) -> bool:
+        """
+        False when no API key is set, so every call would fail.
+        """
+        self._configure()
+        return bool(self.api_key)
+
+    def _bind_to_running_loop(self):
+        # The connection pool and semaphore belong to an event loop, so they are
+        # created lazily inside the running loop (and recreated if it changes,
+        # as it does between requests of a non-context-managed TestClient).
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._http = None
+
+    def _get_http(self):
+        import httpx
+
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+        return self._http
+
+    async def generate_content(self, prompt: str, timeout: float | None = None, operation: str = "generate") -> str:
+        """
+        Sends a prompt to the model and returns the generated text.
+        `operation` labels the call's latency and failure metrics.
+        """
+        self._configure()
+        deadline = timeout if timeout is not None else self.timeout
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            return await asyncio.wait_for(self._generate_content(prompt), timeout=deadline)
+        except asyncio.TimeoutError as e:
+            outcome = "timeout"
+            raise AIClientError(f"Model call exceeded its {deadline}s deadline") from e
+        except AIClientError:
+            outcome = "error"
+            raise
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            record_ai_call(operation, outcome, time.perf_counter() - started)
+
+    async def _generate_content(self, prompt: str) -> str:
+        import httpx
+
+        if not self.api_key:
+            raise AIClientError("GEMINI_API_KEY is not set")
+        self._bind_to_running_loop()
+        async with self._semaphore:
+            try:
+                # The key goes in a header: httpx error messages include the
+                # request URL, and those end up in the logs.
+                response = await self._get_http().post(
+                    f"/v1beta/models/{self.model}:generateContent",
+                    headers={"x-goog-api-key": self.api_key},
+                    json={"contents": [{"parts": [{"text": prompt}]}]},
+                )
+                response.raise_for_status()
+                data = response.json()
+            except httpx.HTTPStatusError as e:
+                raise AIClientError(f"Model call failed with HTTP {e.response.status_code}") from e
+            except (httpx.HTTPError, ValueError) as e:
+                # Only the exception type: its message may quote the request.
+                raise AIClientError(f"Model call failed: {type(e).__name__}") from e
+
+        try:
+            return data["candidates"][0]["content"]["parts"][0]["text"]
+        except (KeyError, IndexError, TypeError) as e:
+            raise AIClientError("Model returned no text") from e
+
+    async def aclose(self):
+        """
+        Closes the shared connection pool. Called on application shutdown.
+        """
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+# Create a single instance that the rest of our app can import (configured on first use)
+ai_client = GeminiClient()
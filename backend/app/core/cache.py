@@ -0,0 +1,75 @@
+# app/core/cache.py
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    """
+    A small thread-safe in-process LRU cache whose entries also expire after a time-to-live.
+    Keeps hit/miss counters so the hit rate can be reported as a metric.
+
+    Subclasses that index their keys can override _stored() and _dropped(), which
+    are called with the lock held whenever an entry is added or leaves the cache.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the cached value, or None if there is no live entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                    self._dropped(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            self._stored(key)
+            while len(self._entries) > self.max_size:
+                oldest_key, _ = self._entries.popitem(last=False)
+                self._dropped(oldest_key)
+
+    def delete(self, key):
+        with self._lock:
+            self._delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _delete(self, key):
+        # Caller must hold the lock.
+        if self._entries.pop(key, None) is not None:
+            self._dropped(key)
+
+    def _stored(self, key):
+        pass
+
+    def _dropped(self, key):
+        pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
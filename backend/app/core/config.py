@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
+from typing import Literal
 
 class Settings(BaseSettings):
     # This now correctly tells Pydantic to look for the .env file
@@ -7,11 +8,95 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file="./.env") 
 
     DATABASE_URL: str
-    GEMINI_API_KEY: str 
+    # Optional: without a key, AI calls fail fast and the app keeps working
+    # on local answer scoring, with hints unavailable.
+    GEMINI_API_KEY: str = ""
+    # Create missing tables and columns when a worker starts. Turn this off
+    # when `python -m app.manage init-db` runs as a separate deploy step.
+    DB_INIT_ON_STARTUP: bool = True
+
+    # --- Database Engine Profile ---
+    # "sqlite": WAL mode and tuned pragmas for a local SQLite file.
+    # "pooled": a connection pool for a client/server database such as PostgreSQL.
+    # "auto":   picks one based on DATABASE_URL.
+    DB_PROFILE: Literal["auto", "sqlite", "pooled"] = "auto"
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000     # How long a writer waits for the lock before failing
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL"] = "NORMAL"  # NORMAL is durable enough with WAL
+    SQLITE_CACHE_SIZE_KB: int = 65536      # Page cache per connection
+    # Serve requests through the fully async data-access path (AsyncSession).
+    # Needs an async driver: aiosqlite for SQLite, asyncpg for PostgreSQL.
+    DB_ASYNC: bool = False
+
+    # --- AI Client Settings ---
+    # The base URL can be pointed at a local stub server for testing.
+    GEMINI_MODEL: str = "gemini-1.0-pro"
+    GEMINI_API_BASE_URL: str = "https://generativelanguage.googleapis.com"
+    AI_MAX_CONCURRENCY: int = 8     # Max in-flight model calls per worker
+    AI_TIMEOUT_SECONDS: float = 10.0 # Deadline per call, including time spent queued
+    HINT_QUEUE_MAX_SIZE: int = 1000  # Cards waiting for a background hint; more are left to `backfill-hints`
+
+    # --- Local Answer Scoring ---
+    # Clear-cut answers are judged locally (see services/answer_scoring.py) and
+    # only the rest go to the AI. Measure changes with benchmarks/bench_answer_scoring.py.
+    ANSWER_LOCAL_SCORING: bool = True        # Off: every answer that isn't an exact match goes to the AI
+    ANSWER_ACCEPT_SIMILARITY: float = 0.9    # Text similarity (and per-word, for typos) that counts as the same answer
+    ANSWER_ACCEPT_PRECISION: float = 0.6     # Share of the user's words that must be in the answer when all of it is there
+    ANSWER_REJECT_SIMILARITY: float = 0.0    # Below this, with no word in common, an answer is wrong (0 turns it off)
+    # Without an API key, the score an unsure answer needs to count as correct. The default
+    # marks unsure answers wrong: a close score can't tell "Iraq" from "Iran".
+    ANSWER_LOCAL_ONLY_ACCEPT_SCORE: float = 1.0
+
+    # --- Answer Verification Cache ---
+    VERIFICATION_CACHE_SIZE: int = 10000          # Max cached verdicts per worker
+    VERIFICATION_CACHE_TTL_SECONDS: int = 86400   # How long a verdict stays valid
+
+    # --- Authenticated User Cache ---
+    AUTH_CACHE_SIZE: int = 10000
+    AUTH_CACHE_TTL_SECONDS: int = 300
+
+    # --- Password Hashing ---
+    # Changing BCRYPT_ROUNDS is safe: existing hashes are re-hashed at the new cost on the next login.
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2        # Processes dedicated to bcrypt
+    PASSWORD_HASH_MAX_PENDING: int = 32   # Hash jobs allowed in flight before new ones are rejected with 503
+
+    # --- Review Log ---
+    # Review history is buffered in memory and written in batches.
+    REVIEW_LOG_FLUSH_SIZE: int = 500                # Rows that trigger an early flush
+    REVIEW_LOG_FLUSH_INTERVAL_SECONDS: float = 2.0  # Longest a row waits in memory
+    REVIEW_LOG_MAX_BUFFERED_ROWS: int = 10_000      # Rows kept in memory while writes fail; the rest are spooled
+    REVIEW_LOG_SPOOL_PATH: str = "./review_log.spool.jsonl"  # Spool files are named after it, e.g. review_log.spool.<id>.jsonl
+
+    # --- Due-Count Forecast Cache ---
+    # Entries are dropped when the deck's cards or reviews change; the TTL is a backstop.
+    FORECAST_CACHE_SIZE: int = 5000
+    FORECAST_CACHE_TTL_SECONDS: int = 300
+
+    # --- Deck/Card List Cache ---
+    # Rendered list pages, keyed by their ETag. Entries can't go stale, so the TTL only bounds memory.
+    LISTING_CACHE_SIZE: int = 2000
+    LISTING_CACHE_TTL_SECONDS: int = 600
+
+    # --- Spaced Repetition Scheduler ---
+    # After changing these, run `python -m app.manage reschedule` to apply them to existing cards.
+    # Decks can override both (Deck.scheduler_algorithm, Deck.scheduler_max_interval_days).
+    SCHEDULER_ALGORITHM: Literal["sm2", "leitner"] = "sm2"
+    SCHEDULER_MAX_INTERVAL_DAYS: int = 36500
+
+    # --- Telemetry ---
+    METRICS_ENABLED: bool = True  # Serve Prometheus metrics on /metrics
+    SLOW_REQUEST_LOG_MS: int = 0  # Print requests slower than this with their SQL (0 turns it off)
 
 @lru_cache()
 def get_settings():
     return Settings()
 
-# Create a single instance that the rest of our app can import
+# Create a single instance that the rest of our app can import.
+# It is built at import: the engine, the routers (DB_ASYNC) and the caches
+# are configured from it then, so DATABASE_URL must be set before importing the app.
 settings = get_settings()
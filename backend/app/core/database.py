@@ -1,19 +1,145 @@
 #this file is the database connection it asks how does my application connect and talk to the db
 # app/core/database.py
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from .config import settings
 
+# --- Engine Profiles ---
+def _resolve_profile(database_url: str) -> str:
+    if settings.DB_PROFILE != "auto":
+        return settings.DB_PROFILE
+    return "sqlite" if make_url(database_url).get_backend_name() == "sqlite" else "pooled"
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Runs on every new SQLite connection. WAL lets readers keep reading while a
+    review is being written, and busy_timeout makes concurrent writers wait for
+    the lock instead of failing immediately with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+def create_app_engine(database_url: str):
+    """
+    Builds the engine for the configured profile (see Settings.DB_PROFILE).
+    """
+    url = make_url(database_url)
+    pool_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+
+    if _resolve_profile(database_url) == "sqlite":
+        in_memory = url.database in (None, "", ":memory:")
+        new_engine = create_engine(
+            url,
+            # This argument is required for SQLite
+            connect_args={"check_same_thread": False},
+            # In-memory databases use a single shared connection, so pool sizing doesn't apply.
+            **({} if in_memory else pool_options)
+        )
+        event.listen(new_engine, "connect", _set_sqlite_pragmas)
+        return new_engine
+
+    return create_engine(
+        url,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,   # Transparently replace connections the server has dropped
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        **pool_options
+    )
+
+# --- Async Engine ---
+# Async drivers for each database backend, used when Settings.DB_ASYNC is on.
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+
+def create_app_async_engine(database_url: str):
+    """
+    Builds an async engine for the same database and profile as create_app_engine.
+    """
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases")
+    url = url.set(drivername=_ASYNC_DRIVERS[backend])
+    pool_options = {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+    }
+
+    if _resolve_profile(database_url) == "sqlite":
+        in_memory = url.database in (None, "", ":memory:")
+        # aiosqlite defaults to opening a new connection per checkout; pool them like the sync engine.
+        new_engine = create_async_engine(
+            url,
+            **({} if in_memory else {"poolclass": AsyncAdaptedQueuePool, **pool_options})
+        )
+        event.listen(new_engine.sync_engine, "connect", _set_sqlite_pragmas)
+        return new_engine
+
+    return create_async_engine(
+        url,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        **pool_options
+    )
+
 # The SQLAlchemy "engine" is the main connection point to the database.
-engine = create_engine(
-    settings.DATABASE_URL, 
-    # This argument is required for SQLite
-    connect_args={"check_same_thread": False} 
-)
+# The sync engine always exists: maintenance commands and background workers use it.
+engine = create_app_engine(settings.DATABASE_URL)
+async_engine = create_app_async_engine(settings.DATABASE_URL) if settings.DB_ASYNC else None
 
 # Each instance of a SessionLocal class will be a database session.
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The async equivalent. Objects stay loaded after commit, because lazy-loading
+# an expired attribute isn't possible in async code.
+AsyncSessionLocal = (
+    async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None else None
+)
+
 # This is a "base class" that all our database models will inherit from.
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+def init_db():
+    """
+    Adds the columns and indexes that newer versions of the models introduced
+    to tables that already exist (create_all on its own never touches an
+    existing table), then creates any missing tables. Migrating first means the
+    models' after_create hooks, which create_all runs, see every column.
+    The models must be imported before this is called.
+    """
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                if column.server_default is not None:
+                    ddl += f" DEFAULT {column.server_default.arg}"
+                conn.execute(text(ddl))
+            for index in table.indexes:
+                index.create(conn, checkfirst=True)
+
+    Base.metadata.create_all(bind=engine)
@@ -2,14 +2,34 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from . import security
 from ..models import user_model
-from .database import SessionLocal
+from ..schemas import user_schema
+from .cache import TTLCache
+from .config import settings
+from .database import AsyncSessionLocal, SessionLocal
 
 # This tells FastAPI where the client should go to get a token (/api/users/login in our case)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/users/login")
 
+# --- Authenticated User Cache ---
+# Resolved users, keyed by the token subject (the user's email). Users almost never
+# change, so a valid token normally costs zero database round trips.
+# Anything that changes or deletes a user must call invalidate_cached_user().
+principal_cache = TTLCache(
+    max_size=settings.AUTH_CACHE_SIZE,
+    ttl_seconds=settings.AUTH_CACHE_TTL_SECONDS,
+)
+
+def invalidate_cached_user(email: str):
+    """
+    Drops a user from the authenticated user cache.
+    """
+    principal_cache.delete(email)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -17,21 +37,81 @@ def get_db():
     finally:
         db.close()
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
+def _decode_token(token: str, credentials_exception: HTTPException):
+    """
+    Returns the (email, user id) claims of a valid token. The id is None for older tokens.
+    """
     try:
         payload = jwt.decode(token, security.SECRET_KEY, algorithms=[security.ALGORITHM])
         email: str = payload.get("sub")
+        user_id: int | None = payload.get("uid")
         if email is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
+    return email, user_id
+
+def _get_cached_user(email: str, user_id: int | None):
+    cached_user = principal_cache.get(email)
+    if cached_user is not None and (user_id is None or cached_user.id == user_id):
+        return cached_user
+    return None
+
+def _cache_user(email: str, user) -> user_schema.User:
+    # Cache a plain schema object rather than the ORM instance, which belongs to this request's session.
+    principal = user_schema.User.model_validate(user)
+    principal_cache.set(email, principal)
+    return principal
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> user_schema.User:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    email, user_id = _decode_token(token, credentials_exception)
+
+    cached_user = _get_cached_user(email, user_id)
+    if cached_user is not None:
+        return cached_user
+
+    # Newer tokens carry the user id, so we can look the user up by primary key.
+    if user_id is not None:
+        user = db.get(user_model.User, user_id)
+        if user is not None and user.email != email:
+            user = None
+    else:
+        user = db.query(user_model.User).filter(user_model.User.email == email).first()
+    if user is None:
+        raise credentials_exception
+    return _cache_user(email, user)
+
+# --- Async Dependencies (Settings.DB_ASYNC) ---
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> user_schema.User:
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    email, user_id = _decode_token(token, credentials_exception)
+
+    cached_user = _get_cached_user(email, user_id)
+    if cached_user is not None:
+        return cached_user
 
-    user = db.query(user_model.User).filter(user_model.User.email == email).first()
+    if user_id is not None:
+        user = await db.get(user_model.User, user_id)
+        if user is not None and user.email != email:
+            user = None
+    else:
+        user = await db.scalar(select(user_model.User).where(user_model.User.email == email))
     if user is None:
         raise credentials_exception
-    return user
\ No newline at end of file
+    return _cache_user(email, user)
@@ -0,0 +1,96 @@
+# app/core/pagination.py
+import base64
+import binascii
+import json
+from fastapi import HTTPException, status
+
+# --- Keyset (Cursor) Pagination ---
+# Pages are fetched with "WHERE id > last_seen_id ORDER BY id LIMIT n", which
+# walks the primary-key index directly. Unlike OFFSET, the database never has to
+# skip over earlier rows, so page 10,000 costs the same as page 1.
+# The cursor is opaque to clients: a base64-encoded JSON object.
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+def _encode(payload: dict) -> str:
+    data = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(data).decode().rstrip("=")
+
+def _decode(cursor: str) -> dict:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    payload = json.loads(base64.urlsafe_b64decode(padded))
+    if not isinstance(payload, dict):
+        raise ValueError
+    return payload
+
+def _invalid_cursor():
+    return HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def encode_cursor(last_id: int) -> str:
+    return _encode({"after_id": last_id})
+
+def decode_cursor(cursor: str | None) -> int:
+    """
+    Returns the id to continue after (0 for the first page).
+    """
+    if not cursor:
+        return 0
+    try:
+        after_id = _decode(cursor)["after_id"]
+        if not isinstance(after_id, int):
+            raise ValueError
+        return after_id
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise _invalid_cursor()
+
+# Ranked results (e.g. search) page on (rank, id) instead, lower ranks first.
+# Ranks are integers, so "same rank" is an exact comparison. The cursor also
+# carries the snapshot the first page was ranked in (see search_service), so
+# later pages rank the same set of cards.
+_RANKED_SNAPSHOT_FIELDS = ("min_id", "max_id", "truncated")
+
+def encode_ranked_cursor(rank: int, last_id: int, snapshot: dict) -> str:
+    return _encode({"after_rank": rank, "after_id": last_id, **snapshot})
+
+def decode_ranked_cursor(cursor: str | None) -> tuple[int, int, dict] | None:
+    """
+    Returns the (rank, id) to continue after and the snapshot, or None for the first page.
+    """
+    if not cursor:
+        return None
+    try:
+        payload = _decode(cursor)
+        rank, after_id = payload["after_rank"], payload["after_id"]
+        snapshot = {field: payload[field] for field in _RANKED_SNAPSHOT_FIELDS}
+        if not all(isinstance(value, int) for value in (rank, after_id, *snapshot.values())):
+            raise ValueError
+        return rank, after_id, snapshot
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        raise _invalid_cursor()
+
+def _build_page(rows, limit: int):
+    # We fetch one extra row to learn whether there is another page.
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].id)
+    return {"items": rows, "next_cursor": next_cursor}
+
+def paginate(query, id_column, limit: int, cursor: str | None):
+    """
+    Applies keyset pagination on `id_column` to a query and returns
+    {"items": [...], "next_cursor": str | None}.
+    """
+    after_id = decode_cursor(cursor)
+    rows = query.filter(id_column > after_id).order_by(id_column).limit(limit + 1).all()
+    return _build_page(rows, limit)
+
+async def paginate_async(db, statement, id_column, limit: int, cursor: str | None):
+    """
+    The AsyncSession version of paginate(), for a select() statement.
+    """
+    after_id = decode_cursor(cursor)
+    statement = statement.where(id_column > after_id).order_by(id_column).limit(limit + 1)
+    rows = list((await db.scalars(statement)).all())
+    return _build_page(rows, limit)
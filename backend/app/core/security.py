@@ -1,12 +1,25 @@
 # app/core/security.py
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from .config import settings
 
 # --- Configuration ---
-# This sets up our password hashing algorithm
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# This sets up our password hashing algorithm.
+# Pinning min/max rounds to the configured cost makes passlib flag any hash made
+# at a different cost as needing an update, so it gets re-hashed on login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 # These should be in your .env file for a real app
 SECRET_KEY = "your-super-secret-key-that-should-be-in-env"
@@ -17,13 +30,70 @@ ACCESS_TOKEN_EXPIRE_MINUTES = 30
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verifies a password and, if the stored hash uses an outdated cost,
+    also returns a fresh hash to replace it with (otherwise None).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+# --- Password Worker Pool ---
+# bcrypt is deliberately slow CPU work. Running it inline would tie up the shared
+# threadpool (and the GIL) for hundreds of milliseconds per login, slowing down
+# every other endpoint. Instead it runs in a small dedicated process pool.
+# At most PASSWORD_HASH_MAX_PENDING jobs may be in flight; beyond that we shed
+# load with a 503 rather than letting a login burst queue up without bound.
+_pool = None
+_pool_lock = threading.Lock()
+_pending_jobs = threading.BoundedSemaphore(settings.PASSWORD_HASH_MAX_PENDING)
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # "spawn" avoids forking a process that already runs server threads.
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _pool
+
+async def _run_in_password_pool(func, *args):
+    if not _pending_jobs.acquire(blocking=False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts in progress, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_pool(), func, *args)
+    finally:
+        _pending_jobs.release()
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    return await _run_in_password_pool(verify_and_update_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await _run_in_password_pool(get_password_hash, password)
+
+def shutdown_password_pool():
+    """
+    Stops the worker processes. Called on application shutdown.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
 # --- JWT Functions ---
 def create_access_token(data: dict):
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
-    return encoded_jwt
\ No newline at end of file
+    return encoded_jwt
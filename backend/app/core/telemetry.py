@@ -0,0 +1,215 @@
+# app/core/telemetry.py
+import time
+from contextvars import ContextVar
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.process_collector import ProcessCollector
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.responses import Response
+
+# --- Metrics ---
+# Everything is registered on the app's own registry and served by /metrics.
+# Metrics are per process: with several uvicorn workers, scrape each one.
+
+registry = CollectorRegistry()
+ProcessCollector(registry=registry)
+
+http_request_duration = Histogram(
+    "lexilearn_http_request_duration_seconds",
+    "Time to serve a request, by route template.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    registry=registry,
+)
+http_requests = Counter(
+    "lexilearn_http_requests",
+    "Requests served, by route template and status code.",
+    ["method", "route", "status"],
+    registry=registry,
+)
+db_queries_per_request = Histogram(
+    "lexilearn_db_queries_per_request",
+    "SQL statements executed while serving a request. A route whose count grows with the data is an N+1.",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+    registry=registry,
+)
+db_time_per_request = Histogram(
+    "lexilearn_db_time_per_request_seconds",
+    "Total time spent executing SQL while serving a request.",
+    ["method", "route"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    registry=registry,
+)
+ai_request_duration = Histogram(
+    "lexilearn_ai_request_duration_seconds",
+    "Model call latency, including time queued for a concurrency slot.",
+    ["operation", "outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0),
+    registry=registry,
+)
+ai_failures = Counter(
+    "lexilearn_ai_failures",
+    "Model calls that failed, by reason.",
+    ["operation", "reason"],
+    registry=registry,
+)
+
+answer_verdicts = Counter(
+    "lexilearn_answer_verdicts",
+    "Answers verified, by where the verdict came from: local, local_score (no API key), cache, ai or unverified.",
+    ["source", "verdict"],
+    registry=registry,
+)
+
+def record_ai_call(operation: str, outcome: str, seconds: float):
+    """
+    Records one model call. `outcome` is "ok", or the reason it failed.
+    """
+    ai_request_duration.labels(operation, outcome).observe(seconds)
+    if outcome != "ok":
+        ai_failures.labels(operation, outcome).inc()
+
+def record_answer_verdict(source: str, verdict: bool | None):
+    """
+    Records how one answer was judged, so the share escalated to the AI can be watched.
+    """
+    answer_verdicts.labels(source, "none" if verdict is None else str(verdict).lower()).inc()
+
+class CacheStatsCollector:
+    """
+    Reports the hit/miss counters and size of the in-process caches.
+    Anything with a TTLCache-style stats() method can be registered.
+    """
+
+    def __init__(self):
+        self._caches = {}
+
+    def add(self, name: str, cache):
+        self._caches[name] = cache
+
+    def collect(self):
+        hits = CounterMetricFamily("lexilearn_cache_hits", "Cache lookups that found a live entry.", labels=["cache"])
+        misses = CounterMetricFamily("lexilearn_cache_misses", "Cache lookups that found nothing.", labels=["cache"])
+        size = GaugeMetricFamily("lexilearn_cache_entries", "Entries currently cached.", labels=["cache"])
+        for name, cache in self._caches.items():
+            stats = cache.stats()
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            size.add_metric([name], stats["size"])
+        yield hits
+        yield misses
+        yield size
+
+cache_stats = CacheStatsCollector()
+registry.register(cache_stats)
+
+def metrics_response() -> Response:
+    """
+    Renders every metric in the Prometheus text format.
+    """
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+# --- SQL Accounting ---
+
+class RequestStats:
+    """
+    What one request did in the database. Statements are only kept when the
+    slow-request log is on.
+    """
+    MAX_STATEMENTS = 100
+
+    def __init__(self, capture_statements: bool):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.statements = [] if capture_statements else None
+
+    def add(self, statement: str, seconds: float):
+        self.queries += 1
+        self.sql_seconds += seconds
+        if self.statements is not None and len(self.statements) < self.MAX_STATEMENTS:
+            self.statements.append((seconds, statement))
+
+# Set by the middleware for the duration of a request. Sync routes run in the
+# threadpool with a copy of the context, so they see the same RequestStats.
+_current_request: ContextVar[RequestStats | None] = ContextVar("lexilearn_request_stats", default=None)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_request.get() is not None:
+        conn.info.setdefault("lexilearn_query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_request.get()
+    started = conn.info.get("lexilearn_query_started")
+    if stats is None or not started:
+        return
+    stats.add(statement, time.perf_counter() - started.pop())
+
+def instrument_sql():
+    """
+    Counts and times every SQL statement, on every engine (including the
+    sync engine behind the async one), against the current request.
+    Work outside a request (background workers, maintenance commands) isn't counted.
+    """
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+# --- Middleware ---
+
+class TelemetryMiddleware:
+    """
+    A plain ASGI middleware that times each request and records its SQL.
+
+    Routes are labelled by their template ("/api/decks/{deck_id}"), never the
+    raw path, so metric cardinality stays fixed. With `slow_request_ms` set,
+    requests slower than that are printed with the SQL they executed.
+    """
+
+    def __init__(self, app, slow_request_ms: float = 0):
+        self.app = app
+        self.slow_request_seconds = slow_request_ms / 1000
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(capture_statements=self.slow_request_seconds > 0)
+        token = _current_request.set(stats)
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _current_request.reset(token)
+            # The router stores the matched route in the scope.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            method = scope["method"]
+            http_request_duration.labels(method, route).observe(elapsed)
+            http_requests.labels(method, route, str(status_code)).inc()
+            db_queries_per_request.labels(method, route).observe(stats.queries)
+            db_time_per_request.labels(method, route).observe(stats.sql_seconds)
+            if self.slow_request_seconds and elapsed >= self.slow_request_seconds:
+                _log_slow_request(scope, status_code, elapsed, stats)
+
+def _log_slow_request(scope, status_code: int, elapsed: float, stats: RequestStats):
+    lines = [
+        f"Slow request: {scope['method']} {scope['path']} -> {status_code} in {elapsed * 1000:.0f} ms, "
+        f"{stats.queries} SQL statements in {stats.sql_seconds * 1000:.0f} ms"
+    ]
+    for seconds, statement in stats.statements:
+        lines.append(f"  [{seconds * 1000:7.1f} ms] {' '.join(statement.split())}")
+    if stats.queries > len(stats.statements):
+        lines.append(f"  ... {stats.queries - len(stats.statements)} more")
+    print("\n".join(lines))
@@ -1,22 +1,58 @@
-# 1. Third-party Imports
+# 1. Standard Library Imports
+from contextlib import asynccontextmanager
+
+# 2. Third-party Imports
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-# 2. Local Application Imports
-from .core.database import Base, engine
-# Import ALL your routers
-from .routers import deck_router, study_router, user_router, card_router 
-from .models import deck_model, card_model, user_model
+# 3. Local Application Imports
+from .core.config import settings
+from .core.database import async_engine, init_db
+from .core.ai_client import ai_client
+from .core.security import shutdown_password_pool
+from .core.deps import principal_cache
+from .core import telemetry
+from .services.hint_service import hint_worker
+from .services.review_log_service import review_log
+from .services.forecast_service import forecast_cache
+from .services.listing_service import listing_cache
+from .services.answer_cache import verification_cache
+# Import ALL your routers. DB_ASYNC swaps in the AsyncSession versions, which
+# serve the same paths and schemas.
+if settings.DB_ASYNC:
+    from .routers.aio import deck_router, study_router, user_router, card_router
+else:
+    from .routers import deck_router, study_router, user_router, card_router
+from .models import deck_model, card_model, card_lsh_model, user_model, review_log_model
 
-# --- Create Database Tables ---
-# This single line creates ALL tables that inherit from our Base class.
-Base.metadata.create_all(bind=engine)
+# --- Application Lifespan ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Create ALL tables that inherit from our Base class and bring tables from
+    # older versions of the app up to date. This runs at startup rather than at
+    # import, so importing the app never touches the database.
+    if settings.DB_INIT_ON_STARTUP:
+        init_db()
+    # Start the background queue that precomputes card hints.
+    await hint_worker.start()
+    # Start the write-behind buffer for the review log.
+    await review_log.start()
+    yield
+    await hint_worker.stop()
+    # Write out any buffered review history before the worker exits.
+    await review_log.stop()
+    # Close the shared AI connection pool when the worker shuts down.
+    await ai_client.aclose()
+    shutdown_password_pool()
+    if async_engine is not None:
+        await async_engine.dispose()
 
 # --- Initialize FastAPI App ---
 app = FastAPI(
     title="LexiLearn AI",
     description="An intelligent, AI-powered flashcard application with Spaced Repetition.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # --- Add Middleware ---
@@ -27,6 +63,14 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Added last so it wraps everything else, and its timings include CORS handling.
+if settings.METRICS_ENABLED:
+    telemetry.instrument_sql()
+    telemetry.cache_stats.add("auth", principal_cache)
+    telemetry.cache_stats.add("forecast", forecast_cache)
+    telemetry.cache_stats.add("listing", listing_cache)
+    telemetry.cache_stats.add("verification", verification_cache)
+    app.add_middleware(telemetry.TelemetryMiddleware, slow_request_ms=settings.SLOW_REQUEST_LOG_MS)
 
 # --- Include Routers ---
 # The order here doesn't matter, but it's good to keep them organized.
@@ -60,3 +104,12 @@ def read_root():
     """
     return {"message": "Welcome to the LexiLearn AI API!"}
 
+# --- Metrics Endpoint ---
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", tags=["Root"], include_in_schema=False)
+    def read_metrics():
+        """
+        Request, SQL, AI and cache metrics in the Prometheus text format.
+        """
+        return telemetry.metrics_response()
+
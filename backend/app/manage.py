@@ -0,0 +1,117 @@
+"""
+Maintenance commands. Run from the backend directory, e.g.:
+
+    python -m app.manage init-db
+    python -m app.manage backfill-hints
+    python -m app.manage backfill-hints --deck-id 3
+    python -m app.manage reschedule --deck-id 3
+    python -m app.manage reschedule --email you@example.com
+    python -m app.manage rebuild-search-index
+    python -m app.manage rebuild-duplicate-index
+    python -m app.manage claim-decks --email you@example.com
+"""
+# 1. Standard Library Imports
+import argparse
+import asyncio
+
+# 2. Local Application Imports
+from .core.database import SessionLocal, init_db
+from .core.ai_client import ai_client
+from .models import deck_model, card_model, card_lsh_model, user_model, review_log_model  # noqa: F401 (registers the tables)
+from .services import deck_service, duplicate_service, hint_service, scheduler, search_service
+
+async def _backfill_hints(args):
+    try:
+        stored = await hint_service.backfill_hints(deck_id=args.deck_id)
+    finally:
+        await ai_client.aclose()
+    print(f"Stored {stored} hints.")
+
+def _user_id(db, email: str) -> int:
+    user = db.query(user_model.User).filter(user_model.User.email == email).first()
+    if user is None:
+        raise SystemExit(f"No user with email {email}.")
+    return user.id
+
+def _reschedule(args):
+    db = SessionLocal()
+    try:
+        user_id = _user_id(db, args.email) if args.email else None
+        rescheduled = scheduler.reschedule_cards(db=db, deck_id=args.deck_id, user_id=user_id)
+    finally:
+        db.close()
+    print(f"Rescheduled {rescheduled} cards under their decks' scheduler settings "
+          f"(default: the '{scheduler.scheduler.name}' scheduler).")
+
+def _rebuild_search_index(args):
+    db = SessionLocal()
+    try:
+        indexed = search_service.rebuild_search_index(db=db)
+    finally:
+        db.close()
+    print(f"Rebuilt the search index over {indexed} cards.")
+
+def _rebuild_duplicate_index(args):
+    db = SessionLocal()
+    try:
+        fingerprinted = duplicate_service.rebuild_duplicate_index(db=db)
+    finally:
+        db.close()
+    print(f"Rebuilt the duplicate index over {fingerprinted} cards.")
+
+def _claim_decks(args):
+    db = SessionLocal()
+    try:
+        claimed = deck_service.claim_unowned_decks(db=db, user_id=_user_id(db, args.email))
+    finally:
+        db.close()
+    print(f"Gave {claimed} decks without an owner to {args.email}.")
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m app.manage")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    subcommands.add_parser(
+        "init-db", help="Create missing tables, columns and indexes (every command does this first)."
+    )
+
+    backfill = subcommands.add_parser("backfill-hints", help="Generate hints for cards that don't have one yet.")
+    backfill.add_argument("--deck-id", type=int, default=None, help="Only backfill this deck.")
+
+    reschedule = subcommands.add_parser(
+        "reschedule", help="Recompute card schedules under their decks' current scheduler settings."
+    )
+    reschedule.add_argument("--deck-id", type=int, default=None, help="Only reschedule this deck.")
+    reschedule.add_argument("--email", default=None, help="Only reschedule this user's decks.")
+
+    subcommands.add_parser(
+        "rebuild-search-index", help="Rebuild the card search index from the cards table."
+    )
+
+    subcommands.add_parser(
+        "rebuild-duplicate-index", help="Recompute every card's duplicate-detection fingerprint."
+    )
+
+    claim = subcommands.add_parser(
+        "claim-decks", help="Give decks created before decks had owners to a user."
+    )
+    claim.add_argument("--email", required=True, help="The user who should own them.")
+
+    args = parser.parse_args()
+    init_db()
+    if args.command == "init-db":
+        print("Database schema is up to date.")
+
+    if args.command == "backfill-hints":
+        asyncio.run(_backfill_hints(args))
+    elif args.command == "reschedule":
+        _reschedule(args)
+    elif args.command == "rebuild-search-index":
+        _rebuild_search_index(args)
+    elif args.command == "rebuild-duplicate-index":
+        _rebuild_duplicate_index(args)
+    elif args.command == "claim-decks":
+        _claim_decks(args)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+# app/models/card_lsh_model.py
+from sqlalchemy import BigInteger, Column, ForeignKey, Integer, SmallInteger
+from ..core.database import Base
+
+# The near-duplicate index: for every card, one row per MinHash band with the
+# bucket its question hashes to in that band (see duplicate_service). Cards whose
+# questions are similar land in the same bucket of at least one band with high
+# probability, so "which cards might be near-duplicates of this one?" is a
+# primary-key lookup per band instead of a comparison against every card.
+class CardLshBucket(Base):
+    __tablename__ = "card_lsh_buckets"
+
+    # The primary key doubles as the lookup index: (deck, band, bucket) -> cards.
+    deck_id = Column(Integer, ForeignKey("decks.id"), primary_key=True)
+    band = Column(SmallInteger, primary_key=True)
+    bucket = Column(BigInteger, primary_key=True)
+    # Indexed on its own too, so a card's rows can be dropped when it is edited or deleted.
+    card_id = Column(Integer, ForeignKey("cards.id"), primary_key=True, index=True)
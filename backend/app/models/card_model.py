@@ -1,5 +1,5 @@
 # app/models/card_model.py
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float
+from sqlalchemy import BigInteger, Column, Integer, String, ForeignKey, DateTime, Float, Index, event, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from ..core.database import Base
@@ -21,7 +21,72 @@ class Card(Base):
     #keeping the default gap as 1 day
     ease_factor = Column(Float, default=2.5) # A multiplier for how "easy" the card is
     #keepign the default ease factor as 2.5 
+    # When the most recent review was answered. Reviews answered at or before this
+    # time are treated as already applied, which makes batch resubmission idempotent.
+    last_reviewed_at = Column(DateTime, nullable=True)
+
+    # --- Precomputed AI Hint ---
+    # Generated in the background when the card is created or edited,
+    # so the hint endpoint is a single read. NULL until it has been generated.
+    hint = Column(String, nullable=True)
+
+    # --- Duplicate Detection ---
+    # A 64-bit hash of the normalized question (see duplicate_service), so exact
+    # duplicates within a deck are found through the (deck_id, question_hash) index.
+    # NULL for cards that haven't been fingerprinted yet.
+    question_hash = Column(BigInteger, nullable=True)
 
     # --- The Relationship to a Deck ---
-    deck_id = Column(Integer, ForeignKey("decks.id")) # foreign key is a link from one table to another in a db
-    deck = relationship("Deck", back_populates="cards") # Connects this card back to its Deck
\ No newline at end of file
+    deck_id = Column(Integer, ForeignKey("decks.id"), index=True) # foreign key is a link from one table to another in a db
+    deck = relationship("Deck", back_populates="cards") # Connects this card back to its Deck
+
+    # --- Indexes ---
+    # The study queue always asks "which cards in this deck are due, oldest first?",
+    # so a composite index lets the database answer with an index range scan
+    # instead of loading every card in the deck.
+    __table_args__ = (
+        Index("ix_cards_deck_id_next_review_date", "deck_id", "next_review_date"),
+        Index("ix_cards_deck_id_question_hash", "deck_id", "question_hash"),
+    )
+
+# --- Full-Text Search Index ---
+# Card search (see search_service) is answered from a full-text index rather than
+# a LIKE scan. On SQLite that is an FTS5 table keyed by the card id (its rowid),
+# which card_service keeps in step with the cards table. Its "deck" and "owner"
+# columns hold the deck id and the deck owner's user id as tokens, so scoping a
+# search to a user (always) and a deck (optionally) is answered inside the index too, and
+# 3- and 4-character prefixes are indexed as terms of their own, because without that
+# FTS5 answers a prefix query by merging the doclists of every word it covers.
+# On PostgreSQL it is a GIN index over a tsvector expression, which the database
+# maintains itself.
+CARDS_FTS_TABLE = "cards_fts"
+_CREATE_CARDS_FTS = (
+    f"CREATE VIRTUAL TABLE {CARDS_FTS_TABLE} USING fts5(question, answer, deck, owner, "
+    "prefix = '3 4', tokenize = 'unicode61 remove_diacritics 2')"
+)
+SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('simple', question), 'A') || setweight(to_tsvector('simple', answer), 'B')"
+)
+
+@event.listens_for(Base.metadata, "after_create")
+def _create_search_index(target, connection, **kw):
+    # Runs on every create_all (so on every init_db, after existing tables have been
+    # migrated), and only does anything if the index is missing or was created with
+    # a different definition, in which case it's rebuilt from the cards table.
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        current = connection.execute(
+            text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"),
+            {"name": CARDS_FTS_TABLE},
+        ).scalar()
+        if current != _CREATE_CARDS_FTS:
+            if current is not None:
+                connection.execute(text(f"DROP TABLE {CARDS_FTS_TABLE}"))
+            connection.execute(text(_CREATE_CARDS_FTS))
+            connection.execute(text(
+                f"INSERT INTO {CARDS_FTS_TABLE} (rowid, question, answer, deck, owner) "
+                "SELECT cards.id, cards.question, cards.answer, cards.deck_id, decks.user_id "
+                "FROM cards JOIN decks ON decks.id = cards.deck_id"
+            ))
+    elif dialect == "postgresql":
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS ix_cards_search ON cards USING GIN (({SEARCH_VECTOR_SQL}))"))
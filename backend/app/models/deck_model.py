@@ -1,25 +1,50 @@
-from sqlalchemy import Column, Integer, String
-from sqlalchemy.orm import relationship
-from sqlalchemy.ext.hybrid import hybrid_property # <-- Import the hybrid_property tool
+from sqlalchemy import Column, ForeignKey, Index, Integer, String, func, select
+from sqlalchemy.orm import relationship, column_property
 from ..core.database import Base
+from .card_model import Card
 
 class Deck(Base):
     __tablename__ = "decks"
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
+    # The user who owns the deck. Every deck, card and study query filters on it,
+    # in the same statement that finds the deck or card, so another user's deck
+    # looks exactly like one that doesn't exist. NULL for decks created before
+    # decks had owners (see `python -m app.manage claim-decks`).
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    # Bumped whenever the deck's card list changes; drives the list's ETag (see listing_service).
+    cards_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # Bumped whenever its cards' due dates move (reviews, rescheduling); with
+    # cards_version it keys the deck's cached forecast (see forecast_service).
+    schedule_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # The deck's own scheduler settings; NULL uses SCHEDULER_ALGORITHM or
+    # SCHEDULER_MAX_INTERVAL_DAYS. Reviews use them as soon as they change;
+    # rescheduling the deck applies them to its existing cards.
+    scheduler_algorithm = Column(String, nullable=True)
+    scheduler_max_interval_days = Column(Integer, nullable=True)
     
     # This relationship links this deck to its many Cards.
     # The "cascade" option is a professional best practice: if a deck is deleted,
     # all of its associated cards will be automatically deleted too.
     cards = relationship("Card", back_populates="deck", cascade="all, delete-orphan")
 
-    # --- THIS IS THE CRUCIAL UPDATE ---
-    @hybrid_property
-    def card_count(self):
-        """
-        This property calculates the number of cards in the deck on the fly.
-        Because it's a property, Pydantic can read it just like a database column.
-        """
-        return len(self.cards)
+    # --- Card Count ---
+    # The count is loaded as a correlated subquery inside the same SELECT that
+    # loads the deck, so listing N decks is still a single query and no Card
+    # rows are ever hydrated just to be counted. The subquery is answered from
+    # the (deck_id, next_review_date) index on the cards table.
+    # Pydantic can read it just like any other database column.
+    card_count = column_property(
+        select(func.count(Card.id))
+        .where(Card.deck_id == id)
+        .correlate_except(Card)
+        .scalar_subquery()
+    )
 
+    # --- Indexes ---
+    # A user's deck list is "this user's decks in id order", so (user_id, id) answers
+    # each page with an index range scan that only touches that user's decks.
+    __table_args__ = (
+        Index("ix_decks_user_id_id", "user_id", "id"),
+    )
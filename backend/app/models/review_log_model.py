@@ -0,0 +1,25 @@
+# app/models/review_log_model.py
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer
+from datetime import datetime
+from ..core.database import Base
+
+# An append-only history of every review, for analytics, scheduler tuning and audit.
+# Rows are written in batches by review_log_service.review_log, never updated.
+class ReviewLog(Base):
+    __tablename__ = "review_log"
+
+    id = Column(Integer, primary_key=True)
+    # History outlives the card and user, so these are nulled rather than cascaded.
+    card_id = Column(Integer, ForeignKey("cards.id", ondelete="SET NULL"), nullable=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+
+    was_correct = Column(Boolean, nullable=False)
+    latency_ms = Column(Integer, nullable=True)  # How long the user took to answer, if the client reported it
+    previous_interval = Column(Integer, nullable=True)
+    new_interval = Column(Integer, nullable=False)
+    reviewed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    # Per-card history is read in time order.
+    __table_args__ = (
+        Index("ix_review_log_card_id_reviewed_at", "card_id", "reviewed_at"),
+    )
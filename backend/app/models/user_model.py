@@ -7,4 +7,6 @@ class User(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
-    hashed_password = Column(String, nullable=False)
\ No newline at end of file
+    hashed_password = Column(String, nullable=False)
+    # Bumped whenever the user's deck list changes; drives the list's ETag (see listing_service).
+    decks_version = Column(Integer, nullable=False, default=0, server_default="0")
\ No newline at end of file
@@ -0,0 +1,131 @@
+# Async (AsyncSession) version of app/routers/card_router.py, used when Settings.DB_ASYNC is on.
+
+# 1. Third-party Imports
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Header, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# 2. Local Application Imports
+from ...services.aio import card_service, search_service
+from ...schemas import card_schema, user_schema
+from ...core.deps import get_async_db, get_current_user_async
+from ...core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+# Bulk import is CPU-bound file parsing, so it keeps its sync endpoint in both modes.
+from ..card_router import import_cards_endpoint
+
+# --- Router Initialization ---
+router = APIRouter()
+
+# --- API Endpoints ---
+# All endpoints are protected and require a user to be logged in.
+
+@router.post("/decks/{deck_id}/cards", response_model=card_schema.CardCreated, status_code=201)
+async def create_card_endpoint(
+    deck_id: int,
+    card: card_schema.CardCreate,
+    allow_duplicate: bool = Query(False, description="Add the card even if the deck already has its question."),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to create a new card within a specific deck.
+    Answers 409 if the deck already has a card with the same question, and lists
+    cards with similar questions in similar_card_ids.
+    """
+    return await card_service.create_card(
+        db=db, deck_id=deck_id, user_id=current_user.id, card=card, allow_duplicate=allow_duplicate
+    )
+
+@router.get("/decks/{deck_id}/cards", response_model=card_schema.CardPage, responses={304: {"description": "The list hasn't changed since the ETag sent in If-None-Match."}})
+async def get_cards_in_deck_endpoint(
+    deck_id: int,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="The next_cursor from the previous page."),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to retrieve a page of the cards that belong to a specific deck.
+    Send the page's ETag back in If-None-Match to get a 304 when nothing changed.
+    """
+    return await card_service.get_cards_in_deck_response(
+        db=db, deck_id=deck_id, user_id=current_user.id, limit=limit, cursor=cursor, if_none_match=if_none_match
+    )
+
+router.add_api_route(
+    "/decks/{deck_id}/cards/import",
+    import_cards_endpoint,
+    methods=["POST"],
+    response_model=card_schema.CardImportResponse,
+)
+
+@router.get("/decks/{deck_id}/export", response_class=StreamingResponse)
+async def export_cards_endpoint(
+    deck_id: int,
+    format: Literal["csv", "jsonl"] = Query("csv"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to download all of a deck's cards, with their schedules, as CSV or JSONL.
+    The file can be imported back with /decks/{deck_id}/cards/import.
+    """
+    return await card_service.export_cards_response(
+        db=db, deck_id=deck_id, user_id=current_user.id, file_format=format
+    )
+
+@router.get("/decks/{deck_id}/duplicates", response_model=card_schema.DuplicateReport)
+async def get_duplicates_endpoint(
+    deck_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to list the groups of cards in a deck that have the same question
+    (ignoring case, punctuation and spacing) or nearly the same question.
+    """
+    return await card_service.get_duplicates_report(db=db, deck_id=deck_id, user_id=current_user.id)
+
+@router.get("/cards/search", response_model=card_schema.SearchPage)
+async def search_cards_endpoint(
+    q: str = Query(..., min_length=1, max_length=200),
+    deck_id: int | None = Query(None, description="Only search this deck."),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="The next_cursor from the previous page."),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to search card questions and answers, best match first, optionally within one deck.
+    Every word must appear in the card; the last one may be the start of a word.
+    """
+    return await search_service.search_cards(
+        db=db, q=q, user_id=current_user.id, deck_id=deck_id, limit=limit, cursor=cursor
+    )
+
+@router.patch("/cards/{card_id}", response_model=card_schema.Card)
+async def update_card_endpoint(
+    card_id: int,
+    card_update: card_schema.CardUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to update an existing card's question or answer.
+    """
+    return await card_service.update_card(db=db, card_id=card_id, user_id=current_user.id, card_update=card_update)
+
+@router.delete("/cards/{card_id}", status_code=204)
+async def delete_card_endpoint(
+    card_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to delete a card.
+    """
+    await card_service.delete_card(db=db, card_id=card_id, user_id=current_user.id)
+    return None
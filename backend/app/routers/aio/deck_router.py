@@ -0,0 +1,118 @@
+# Async (AsyncSession) version of app/routers/deck_router.py, used when Settings.DB_ASYNC is on.
+
+# 1. Third-party Imports
+from fastapi import APIRouter, Depends, Header, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# 2. Local Application Imports
+from ...services.aio import deck_service, forecast_service
+from ...services.forecast_service import DEFAULT_FORECAST_DAYS, MAX_FORECAST_DAYS
+from ...schemas import deck_schema, user_schema
+from ...core.deps import get_async_db, get_current_user_async
+from ...core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+# Rescheduling is CPU-bound array work, so it keeps its sync endpoint in both modes.
+from ..deck_router import reschedule_deck_endpoint, reschedule_user_decks_endpoint
+
+# --- Router Initialization ---
+router = APIRouter()
+
+# --- API Endpoints ---
+# All endpoints below require a valid JWT token.
+
+@router.post("/", response_model=deck_schema.Deck, status_code=201)
+async def create_deck_endpoint(
+    deck: deck_schema.DeckCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to create a new deck for the currently logged-in user.
+    """
+    return await deck_service.create_deck(db=db, deck=deck, user_id=current_user.id)
+
+@router.get("/", response_model=deck_schema.DeckPage, responses={304: {"description": "The list hasn't changed since the ETag sent in If-None-Match."}})
+async def get_all_decks_endpoint(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="The next_cursor from the previous page."),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to retrieve a page of the decks owned by the currently logged-in user.
+    Send the page's ETag back in If-None-Match to get a 304 when nothing changed.
+    """
+    return await deck_service.get_all_decks_response(
+        db=db, user_id=current_user.id, limit=limit, cursor=cursor, if_none_match=if_none_match
+    )
+
+@router.get("/forecast", response_model=deck_schema.AllDecksForecast)
+async def get_all_decks_forecast_endpoint(
+    days: int = Query(DEFAULT_FORECAST_DAYS, ge=1, le=MAX_FORECAST_DAYS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to get how many cards fall due on each of the next `days` days, in total and per deck.
+    """
+    return await forecast_service.get_all_decks_forecast(db=db, user_id=current_user.id, days=days)
+
+@router.get("/{deck_id}", response_model=deck_schema.Deck)
+async def get_deck_by_id_endpoint(
+    deck_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to retrieve a single deck by its unique ID.
+    """
+    return await deck_service.get_deck_by_id(db=db, deck_id=deck_id, user_id=current_user.id)
+
+@router.get("/{deck_id}/forecast", response_model=deck_schema.DeckForecast)
+async def get_deck_forecast_endpoint(
+    deck_id: int,
+    days: int = Query(DEFAULT_FORECAST_DAYS, ge=1, le=MAX_FORECAST_DAYS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to get how many of a deck's cards fall due on each of the next `days` days.
+    """
+    return await forecast_service.get_deck_forecast(db=db, deck_id=deck_id, user_id=current_user.id, days=days)
+
+@router.patch("/{deck_id}", response_model=deck_schema.Deck)
+async def update_deck_endpoint(
+    deck_id: int,
+    deck_update: deck_schema.DeckUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to update a deck's properties.
+    """
+    return await deck_service.update_deck(db=db, deck_id=deck_id, user_id=current_user.id, deck_update=deck_update)
+
+router.add_api_route(
+    "/reschedule",
+    reschedule_user_decks_endpoint,
+    methods=["POST"],
+    response_model=deck_schema.DeckRescheduleResponse,
+)
+router.add_api_route(
+    "/{deck_id}/reschedule",
+    reschedule_deck_endpoint,
+    methods=["POST"],
+    response_model=deck_schema.DeckRescheduleResponse,
+)
+
+@router.delete("/{deck_id}", status_code=204)
+async def delete_deck_endpoint(
+    deck_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to delete a deck.
+    """
+    await deck_service.delete_deck(db=db, deck_id=deck_id, user_id=current_user.id)
+    return None
@@ -0,0 +1,80 @@
+# Async (AsyncSession) version of app/routers/study_router.py, used when Settings.DB_ASYNC is on.
+
+# 1. Third-party Imports
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+# 2. Local Application Imports
+from ...services.aio import study_service
+from ...schemas import card_schema, user_schema
+from ...core.deps import get_async_db, get_current_user_async
+
+# --- Router Initialization ---
+router = APIRouter()
+
+# --- API Endpoints ---
+# All endpoints below require a valid JWT token.
+
+@router.get("/decks/{deck_id}/study", response_model=card_schema.Card | None)
+async def get_next_card_endpoint(
+    deck_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to get the next, most urgent card to study for a given deck.
+    """
+    return await study_service.get_next_card_to_study(db=db, deck_id=deck_id, user_id=current_user.id)
+
+@router.get("/decks/{deck_id}/study/batch", response_model=List[card_schema.Card])
+async def get_next_cards_batch_endpoint(
+    deck_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to prefetch the next `limit` most urgent cards for a deck, in priority order.
+    """
+    return await study_service.get_next_cards_to_study(db=db, deck_id=deck_id, user_id=current_user.id, limit=limit)
+
+@router.patch("/cards/{card_id}/review", response_model=card_schema.CardReviewResponse)
+async def review_card_endpoint(
+    card_id: int,
+    review_data: card_schema.CardReviewRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to review a card; answers 503 if its answer couldn't be verified.
+    """
+    return await study_service.review_card(
+        db=db,
+        card_id=card_id,
+        user_answer=review_data.user_answer,
+        user_id=current_user.id,
+        latency_ms=review_data.latency_ms
+    )
+
+@router.post("/reviews/batch", response_model=card_schema.ReviewBatchResponse)
+async def review_batch_endpoint(
+    batch: card_schema.ReviewBatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to submit an ordered queue of reviews at once, e.g. after studying offline.
+    """
+    return await study_service.review_batch(db=db, reviews=batch.reviews, user_id=current_user.id)
+
+@router.get("/cards/{card_id}/hint", response_model=card_schema.HintResponse)
+async def get_hint_endpoint(
+    card_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: user_schema.User = Depends(get_current_user_async)
+):
+    """
+    Endpoint to generate and retrieve a hint for a card using AI.
+    """
+    return await study_service.get_hint_for_card(db=db, card_id=card_id, user_id=current_user.id)
@@ -0,0 +1,37 @@
+# Async (AsyncSession) version of app/routers/user_router.py, used when Settings.DB_ASYNC is on.
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...services.aio import user_service
+from ...schemas import user_schema
+from ...core.deps import get_async_db
+
+router = APIRouter()
+
+@router.post("/signup", response_model=user_schema.User, status_code=status.HTTP_201_CREATED)
+async def signup_user(user: user_schema.UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """
+    Endpoint for new user registration.
+    """
+    return await user_service.create_user(db=db, user=user)
+
+@router.post("/login", response_model=user_schema.Token)
+async def login_for_access_token(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Endpoint for user login. Returns a JWT token.
+    """
+    user = await user_service.authenticate_user(
+        db, email=form_data.username, password=form_data.password
+    )
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
@@ -1,11 +1,13 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import Literal
 
 # Import all necessary modules
-from ..services import card_service
+from ..services import card_service, search_service
 from ..schemas import card_schema, user_schema
 from ..core.deps import get_db, get_current_user
+from ..core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 # --- Router Initialization ---
 # This creates a new router. We will need to include this in main.py later.
@@ -14,28 +16,112 @@ router = APIRouter()
 # --- API Endpoints ---
 # All endpoints are protected and require a user to be logged in.
 
-@router.post("/decks/{deck_id}/cards", response_model=card_schema.Card, status_code=201)
+@router.post("/decks/{deck_id}/cards", response_model=card_schema.CardCreated, status_code=201)
 def create_card_endpoint(
     deck_id: int,
     card: card_schema.CardCreate, 
+    allow_duplicate: bool = Query(False, description="Add the card even if the deck already has its question."),
     db: Session = Depends(get_db),
     current_user: user_schema.User = Depends(get_current_user)
 ):
     """
     Endpoint to create a new card within a specific deck.
+    Answers 409 if the deck already has a card with the same question, and lists
+    cards with similar questions in similar_card_ids.
     """
-    return card_service.create_card(db=db, deck_id=deck_id, card=card)
+    return card_service.create_card(
+        db=db, deck_id=deck_id, user_id=current_user.id, card=card, allow_duplicate=allow_duplicate
+    )
 
-@router.get("/decks/{deck_id}/cards", response_model=List[card_schema.Card])
+@router.get("/decks/{deck_id}/cards", response_model=card_schema.CardPage, responses={304: {"description": "The list hasn't changed since the ETag sent in If-None-Match."}})
 def get_cards_in_deck_endpoint(
     deck_id: int, 
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="The next_cursor from the previous page."),
+    if_none_match: str | None = Header(None),
     db: Session = Depends(get_db),
     current_user: user_schema.User = Depends(get_current_user)
 ):
     """
-    Endpoint to retrieve all cards that belong to a specific deck.
+    Endpoint to retrieve a page of the cards that belong to a specific deck.
+    Send the page's ETag back in If-None-Match to get a 304 when nothing changed.
     """
-    return card_service.get_cards_in_deck(db=db, deck_id=deck_id)
+    return card_service.get_cards_in_deck_response(
+        db=db, deck_id=deck_id, user_id=current_user.id, limit=limit, cursor=cursor, if_none_match=if_none_match
+    )
+
+@router.post("/decks/{deck_id}/cards/import", response_model=card_schema.CardImportResponse)
+def import_cards_endpoint(
+    deck_id: int,
+    file: UploadFile = File(...),
+    format: Literal["csv", "jsonl"] | None = Query(None, description="Defaults to the file extension."),
+    allow_duplicates: bool = Query(False, description="Import rows whose question the deck already has."),
+    db: Session = Depends(get_db),
+    current_user: user_schema.User = Depends(get_current_user)
+):
+    """
+    Endpoint to bulk-import cards into a deck from a CSV (with 'question' and 'answer'
+    header columns) or JSONL file. Files written by /decks/{deck_id}/export also carry
+    each card's hint and schedule, which are imported too. Rows whose question is
+    already in the deck, or earlier in the file, are skipped as duplicates.
+    Returns how many rows were imported and which failed.
+    """
+    file_format = format
+    if file_format is None:
+        extension = (file.filename or "").rsplit(".", 1)[-1].lower()
+        file_format = {"csv": "csv", "jsonl": "jsonl", "ndjson": "jsonl"}.get(extension)
+    if file_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Could not tell the file format; pass ?format=csv or ?format=jsonl",
+        )
+    # The upload is spooled to disk by FastAPI, so this reads it as a stream.
+    return card_service.import_cards(
+        db=db, deck_id=deck_id, user_id=current_user.id, file=file.file, file_format=file_format,
+        allow_duplicates=allow_duplicates
+    )
+
+@router.get("/decks/{deck_id}/export", response_class=StreamingResponse)
+def export_cards_endpoint(
+    deck_id: int,
+    format: Literal["csv", "jsonl"] = Query("csv"),
+    db: Session = Depends(get_db),
+    current_user: user_schema.User = Depends(get_current_user)
+):
+    """
+    Endpoint to download all of a deck's cards, with their schedules, as CSV or JSONL.
+    The file can be imported back with /decks/{deck_id}/cards/import.
+    """
+    return card_service.export_cards_response(db=db, deck_id=deck_id, user_id=current_user.id, file_format=format)
+
+@router.get("/decks/{deck_id}/duplicates", response_model=card_schema.DuplicateReport)
+def get_duplicates_endpoint(
+    deck_id: int,
+    db: Session = Depends(get_db),
+    current_user: user_schema.User = Depends(get_current_user)
+):
+    """
+    Endpoint to list the groups of cards in a deck that have the same question
+    (ignoring case, punctuation and spacing) or nearly the same question.
+    """
+    return card_service.get_duplicates_report(db=db, deck_id=deck_id, user_id=current_user.id)
+
+@router.get("/cards/search", response_model=card_schema.SearchPage)
+def search_cards_endpoint(
+    q: str = Query(..., min_length=1, max_length=200),
+    deck_id: int | None = Query(None, description="Only search this deck."),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="The next_cursor from the previous page."),
+    db: Session = Depends(get_db),
+    current_user: user_schema.User = Depends(get_current_user)
+):
+    """
+    Endpoint to search card questions and answers, best match first, optionally within one deck.
+    Every word must appear in the card; the last one may be the start of a word.
+    """
+    return search_service.search_cards(
+        db=db, q=q, user_id=current_user.id, deck_id=deck_id, limit=limit, cursor=cursor
+    )
 
 @router.patch("/cards/{card_id}", response_model=card_schema.Card)
 def update_card_endpoint(
@@ -48,7 +134,7 @@ def update_card_endpoint(
     Endpoint to update an existing card's question or answer.
     (Note: Ensure CardUpdate schema exists in card_schema.py)
     """
-    return card_service.update_card(db=db, card_id=card_id, card_update=card_update)
+    return card_service.update_card(db=db, card_id=card_id, user_id=current_user.id, card_update=card_update)
 
 @router.delete("/cards/{card_id}", status_code=204)
 def delete_card_endpoint(
@@ -59,5 +145,5 @@ def delete_card_endpoint(
     """
     Endpoint to delete a card.
     """
-    card_service.delete_card(db=db, card_id=card_id)
+    card_service.delete_card(db=db, card_id=card_id, user_id=current_user.id)
     return None
@@ -1,12 +1,12 @@
 # 1. Third-party Imports
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query
 from sqlalchemy.orm import Session
-from typing import List
 
 # 2. Local Application Imports
-from ..services import deck_service
+from ..services import deck_service, forecast_service
 from ..schemas import deck_schema, user_schema # <-- Import user_schema
 from ..core.deps import get_db, get_current_user # <-- Import the security dependency
+from ..core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 # --- Router Initialization ---
 router = APIRouter()
@@ -23,19 +23,35 @@ def create_deck_endpoint(
     """
     Endpoint to create a new deck for the currently logged-in user.
     """
-    # We will later update the service to associate this deck with the current_user.id
-    return deck_service.create_deck(db=db, deck=deck)
+    return deck_service.create_deck(db=db, deck=deck, user_id=current_user.id)
 
-@router.get("/", response_model=List[deck_schema.Deck])
+@router.get("/", response_model=deck_schema.DeckPage, responses={304: {"description": "The list hasn't changed since the ETag sent in If-None-Match."}})
 def get_all_decks_endpoint(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="The next_cursor from the previous page."),
+    if_none_match: str | None = Header(None),
     db: Session = Depends(get_db),
     current_user: user_schema.User = Depends(get_current_user) # <-- LOCK
 ):
     """
-    Endpoint to retrieve a list of all decks owned by the currently logged-in user.
+    Endpoint to retrieve a page of the decks owned by the currently logged-in user.
+    Send the page's ETag back in If-None-Match to get a 304 when nothing changed.
     """
-    # We will later update the service to only get decks for this user.
-    return deck_service.get_all_decks(db=db)
+    return deck_service.get_all_decks_response(
+        db=db, user_id=current_user.id, limit=limit, cursor=cursor, if_none_match=if_none_match
+    )
+
+@router.get("/forecast", response_model=deck_schema.AllDecksForecast)
+def get_all_decks_forecast_endpoint(
+    days: int = Query(forecast_service.DEFAULT_FORECAST_DAYS, ge=1, le=forecast_service.MAX_FORECAST_DAYS),
+    db: Session = Depends(get_db),
+    current_user: user_schema.User = Depends(get_current_user) # <-- LOCK
+):
+    """
+    Endpoint to get how many of the user's cards fall due on each of the next `days` days,
+    in total and per deck, with a single query. Meant for the dashboard.
+    """
+    return forecast_service.get_all_decks_forecast(db=db, user_id=current_user.id, days=days)
 
 @router.get("/{deck_id}", response_model=deck_schema.Deck)
 def get_deck_by_id_endpoint(
@@ -45,9 +61,21 @@ def get_deck_by_id_endpoint(
 ):
     """
     Endpoint to retrieve a single deck by its unique ID.
+    Decks that belong to other users are reported as not found.
+    """
+    return deck_service.get_deck_by_id(db=db, deck_id=deck_id, user_id=current_user.id)
+
+@router.get("/{deck_id}/forecast", response_model=deck_schema.DeckForecast)
+def get_deck_forecast_endpoint(
+    deck_id: int,
+    days: int = Query(forecast_service.DEFAULT_FORECAST_DAYS, ge=1, le=forecast_service.MAX_FORECAST_DAYS),
+    db: Session = Depends(get_db),
+    current_user: user_schema.User = Depends(get_current_user) # <-- LOCK
+):
+    """
+    Endpoint to get how many of a deck's cards fall due on each of the next `days` days.
     """
-    # We will later add logic to ensure this deck belongs to the current_user.
-    return deck_service.get_deck_by_id(db=db, deck_id=deck_id)
+    return forecast_service.get_deck_forecast(db=db, deck_id=deck_id, user_id=current_user.id, days=days)
 
 @router.patch("/{deck_id}", response_model=deck_schema.Deck)
 def update_deck_endpoint(
@@ -57,9 +85,31 @@ def update_deck_endpoint(
     current_user: user_schema.User = Depends(get_current_user) # <-- LOCK
 ):
     """
-    Endpoint to update a deck's properties.
+    Endpoint to update a deck's properties, including its own scheduler settings.
+    """
+    return deck_service.update_deck(db=db, deck_id=deck_id, user_id=current_user.id, deck_update=deck_update)
+
+@router.post("/reschedule", response_model=deck_schema.DeckRescheduleResponse)
+def reschedule_user_decks_endpoint(
+    db: Session = Depends(get_db),
+    current_user: user_schema.User = Depends(get_current_user) # <-- LOCK
+):
+    """
+    Endpoint to recompute the schedule of every card in all of the user's decks.
+    """
+    return deck_service.reschedule_user_decks(db=db, user_id=current_user.id)
+
+@router.post("/{deck_id}/reschedule", response_model=deck_schema.DeckRescheduleResponse)
+def reschedule_deck_endpoint(
+    deck_id: int,
+    db: Session = Depends(get_db),
+    current_user: user_schema.User = Depends(get_current_user) # <-- LOCK
+):
+    """
+    Endpoint to recompute every card's interval, ease factor and due date in a deck
+    under the deck's scheduler settings, e.g. after they were changed with PATCH.
     """
-    return deck_service.update_deck(db=db, deck_id=deck_id, deck_update=deck_update)
+    return deck_service.reschedule_deck(db=db, deck_id=deck_id, user_id=current_user.id)
 
 @router.delete("/{deck_id}", status_code=204)
 def delete_deck_endpoint(
@@ -70,6 +120,6 @@ def delete_deck_endpoint(
     """
     Endpoint to delete a deck.
     """
-    deck_service.delete_deck(db=db, deck_id=deck_id)
+    deck_service.delete_deck(db=db, deck_id=deck_id, user_id=current_user.id)
     return None
 
@@ -1,6 +1,7 @@
 # 1. Third-party Imports
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
+from typing import List
 
 # 2. Local Application Imports
 from ..services import study_service
@@ -24,31 +25,64 @@ def get_next_card_endpoint(
     Endpoint to get the next, most urgent card to study for a given deck.
     This is protected and requires a user to be logged in.
     """
-    # We will later add logic to ensure the user has access to this deck.
-    card = study_service.get_next_card_to_study(db=db, deck_id=deck_id)
+    card = study_service.get_next_card_to_study(db=db, deck_id=deck_id, user_id=current_user.id)
     if not card:
         return None
     return card
+
+@router.get("/decks/{deck_id}/study/batch", response_model=List[card_schema.Card])
+def get_next_cards_batch_endpoint(
+    deck_id: int,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: user_schema.User = Depends(get_current_user) # <-- LOCK
+):
+    """
+    Endpoint to prefetch the next `limit` most urgent cards for a deck, in priority order.
+    The client works through this queue locally and only calls again when it runs low.
+    """
+    return study_service.get_next_cards_to_study(db=db, deck_id=deck_id, user_id=current_user.id, limit=limit)
+
 @router.patch("/cards/{card_id}/review", response_model=card_schema.CardReviewResponse)
-def review_card_endpoint(
+async def review_card_endpoint(
     card_id: int, 
     review_data: card_schema.CardReviewRequest, 
     db: Session = Depends(get_db),
     current_user: user_schema.User = Depends(get_current_user) # <-- LOCK
 ):
     """
-    Endpoint to review a card using the AI verification service.
+    Endpoint to review a card. Clear-cut answers are judged locally and the rest
+    by the AI verification service; if the AI is needed but can't be reached,
+    it answers 503 and leaves the card unchanged.
     This is protected and requires a user to be logged in.
+    It is async so that waiting on the AI doesn't hold a worker thread.
     """
     # The router's only job is to pass the data to the service layer.
-    return study_service.review_card(
+    return await study_service.review_card(
         db=db, 
         card_id=card_id, 
-        user_answer=review_data.user_answer
+        user_answer=review_data.user_answer,
+        user_id=current_user.id,
+        latency_ms=review_data.latency_ms
     )
 
+@router.post("/reviews/batch", response_model=card_schema.ReviewBatchResponse)
+async def review_batch_endpoint(
+    batch: card_schema.ReviewBatchRequest,
+    db: Session = Depends(get_db),
+    current_user: user_schema.User = Depends(get_current_user) # <-- LOCK
+):
+    """
+    Endpoint to submit an ordered queue of reviews at once, e.g. after studying offline.
+    Reports each review's result in request order. Safe to retry: reviews that
+    were already applied are reported as duplicates and not applied again. Reviews
+    answered before the card's latest review are reported as stale, and reviews
+    whose answer couldn't be verified as unverified.
+    """
+    return await study_service.review_batch(db=db, reviews=batch.reviews, user_id=current_user.id)
+
 @router.get("/cards/{card_id}/hint", response_model=card_schema.HintResponse)
-def get_hint_endpoint(
+async def get_hint_endpoint(
     card_id: int, 
     db: Session = Depends(get_db),
     current_user: user_schema.User = Depends(get_current_user) # <-- LOCK
@@ -58,5 +92,5 @@ def get_hint_endpoint(
     This is protected and requires a user to be logged in.
     """
     # Calls the corresponding service function to do the actual work.
-    return study_service.get_hint_for_card(db=db, card_id=card_id)
+    return await study_service.get_hint_for_card(db=db, card_id=card_id, user_id=current_user.id)
 
@@ -9,14 +9,14 @@ from ..core.deps import get_db
 router = APIRouter()
 
 @router.post("/signup", response_model=user_schema.User, status_code=status.HTTP_201_CREATED)
-def signup_user(user: user_schema.UserCreate, db: Session = Depends(get_db)):
+async def signup_user(user: user_schema.UserCreate, db: Session = Depends(get_db)):
     """
     Endpoint for new user registration.
     """
-    return user_service.create_user(db=db, user=user)
+    return await user_service.create_user(db=db, user=user)
 
 @router.post("/login", response_model=user_schema.Token)
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(), 
     db: Session = Depends(get_db)
 ):
@@ -24,7 +24,7 @@ def login_for_access_token(
     Endpoint for user login. Returns a JWT token.
     FastAPI's OAuth2PasswordRequestForm expects form data, not JSON.
     """
-    user = user_service.authenticate_user(
+    user = await user_service.authenticate_user(
         db, email=form_data.username, password=form_data.password
     )
     if not user:
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 
 # --- Schema for CREATING a card ---
 class CardCreate(BaseModel):
@@ -20,9 +21,26 @@ class Card(CardCreate):
     class Config:
         from_attributes = True
         
+# --- Schema returned when a card is CREATED ---
+class CardCreated(Card):
+    # Cards in the deck whose questions are near-duplicates of this one, most similar first.
+    similar_card_ids: List[int] = []
+
+# --- Schema for a PAGE of cards ---
+# Pass next_cursor back as ?cursor=... to get the following page; it is None on the last page.
+class CardPage(BaseModel):
+    items: List[Card]
+    next_cursor: Optional[str] = None
+
+# Search pages also say whether the query matched too many cards to rank them all,
+# in which case only the most recently added matches were ranked.
+class SearchPage(CardPage):
+    truncated: bool = False
+
 # --- Schemas for the Study Session ---
 class CardReviewRequest(BaseModel):
     user_answer: str
+    latency_ms: Optional[int] = Field(None, ge=0)  # How long the user took to answer, for the review log
 
 class CardReviewResponse(BaseModel):
     was_correct: bool
@@ -31,3 +49,56 @@ class CardReviewResponse(BaseModel):
 class HintResponse(BaseModel):
     hint: str
 
+# --- Schemas for Batch Review Submission ---
+REVIEW_BATCH_MAX_SIZE = 500
+
+class ReviewBatchItem(BaseModel):
+    card_id: int
+    user_answer: str
+    answered_at: datetime  # When the user answered, e.g. while offline
+    latency_ms: Optional[int] = Field(None, ge=0)
+
+class ReviewBatchRequest(BaseModel):
+    # Applied in list order, so send each card's reviews oldest first.
+    reviews: List[ReviewBatchItem] = Field(min_length=1, max_length=REVIEW_BATCH_MAX_SIZE)
+
+class ReviewBatchItemResult(BaseModel):
+    card_id: int
+    answered_at: datetime
+    # "duplicate": this review was already applied.
+    # "stale": the card was reviewed after this answer was given, so it isn't applied.
+    # "unverified": the answer couldn't be checked right now; the card is unchanged, resubmit it later.
+    status: Literal["applied", "duplicate", "stale", "not_found", "unverified"]
+    was_correct: Optional[bool] = None      # Only set for applied reviews
+    correct_answer: Optional[str] = None    # None for cards that don't exist
+
+class ReviewBatchResponse(BaseModel):
+    results: List[ReviewBatchItemResult]  # Same order as the request
+
+# --- Schemas for Bulk Import ---
+# An imported row may carry the scheduling fields a deck export writes, so an
+# exported deck imports back with its schedule; rows without them start fresh.
+class CardImportRow(CardCreate):
+    hint: Optional[str] = None
+    interval: int = Field(1, ge=0)
+    ease_factor: float = Field(2.5, gt=0)
+    next_review_date: datetime = Field(default_factory=datetime.utcnow)
+    last_reviewed_at: Optional[datetime] = None
+
+class CardImportError(BaseModel):
+    line: int   # Line in the uploaded file where the bad row ends
+    error: str
+
+class CardImportResponse(BaseModel):
+    imported: int
+    failed: int
+    errors: List[CardImportError]  # Capped, so huge broken files don't blow up the response
+
+# --- Schemas for the Duplicates Report ---
+class DuplicateGroup(BaseModel):
+    card_ids: List[int]
+
+class DuplicateReport(BaseModel):
+    exact: List[DuplicateGroup]  # Same question, ignoring case, punctuation and spacing
+    near: List[DuplicateGroup]   # Similar questions, e.g. differing by a typo or a word
+    unfingerprinted: List[int] = []  # Cards left out until `python -m app.manage rebuild-duplicate-index` runs
@@ -1,5 +1,6 @@
-from pydantic import BaseModel
-from typing import Optional
+from datetime import date
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
 
 # --- Schema for CREATING a deck ---
 # The user only needs to provide a name.
@@ -10,6 +11,10 @@ class DeckCreate(BaseModel):
 # When updating, the name is optional.
 class DeckUpdate(BaseModel):
     name: Optional[str] = None
+    # The deck's scheduler settings; null goes back to the server-wide ones.
+    # Reschedule the deck afterwards to apply them to the cards it already has.
+    scheduler_algorithm: Optional[Literal["sm2", "leitner"]] = None
+    scheduler_max_interval_days: Optional[int] = Field(default=None, ge=1)
 
 # --- Schema for READING a deck ---
 # This is the full representation of a deck that our API will send back.
@@ -17,8 +22,32 @@ class Deck(BaseModel):
     id: int
     name: str
     card_count: int # <-- This is the required update
+    scheduler_algorithm: Optional[str] = None           # None: the server-wide SCHEDULER_ALGORITHM
+    scheduler_max_interval_days: Optional[int] = None   # None: the server-wide SCHEDULER_MAX_INTERVAL_DAYS
 
     class Config:
         # This allows Pydantic to read data directly from SQLAlchemy model objects.
         from_attributes = True
 
+# --- Schema for a PAGE of decks ---
+# Pass next_cursor back as ?cursor=... to get the following page; it is None on the last page.
+class DeckPage(BaseModel):
+    items: List[Deck]
+    next_cursor: Optional[str] = None
+
+# --- Schema for the result of rescheduling a deck ---
+class DeckRescheduleResponse(BaseModel):
+    rescheduled: int  # Number of cards whose schedule was recomputed
+
+# --- Schemas for the Due-Count Forecast ---
+class ForecastDay(BaseModel):
+    date: date
+    due: int  # Cards due that day; today's count includes overdue cards
+
+class DeckForecast(BaseModel):
+    deck_id: int
+    days: List[ForecastDay]
+
+class AllDecksForecast(BaseModel):
+    days: List[ForecastDay]     # Totals across all decks
+    decks: List[DeckForecast]   # Only decks with cards due in the window
@@ -24,4 +24,4 @@ class User(BaseModel):
 # --- Schema for the JWT token response ---
 class Token(BaseModel):
     access_token: str
-    token_type: str
\ No newline at end of file
+    token_type: str
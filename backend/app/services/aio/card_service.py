@@ -0,0 +1,194 @@
+# Async (AsyncSession) version of app/services/card_service.py, used when Settings.DB_ASYNC is on.
+# Bulk import stays on the sync path: it is file parsing, not a hot request path.
+
+# 1. Third-party Imports
+from typing import AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+
+# 2. Local Application Imports
+from ...models import card_model, deck_model
+from ...schemas import card_schema
+from ...core.database import AsyncSessionLocal
+from ...core.pagination import paginate_async
+from ..answer_cache import verification_cache
+from ..hint_service import hint_worker
+from ..listing_service import card_change_statements, card_list_version_statement, listing_cache
+from .. import duplicate_service, search_service
+from .duplicate_service import check_question, report_duplicates
+from ..card_service import (
+    EXPORT_MEDIA_TYPES, duplicate_question, encode_export_header, encode_export_rows, export_headers,
+    export_statement, owned_card_statement,
+)
+
+async def _get_deck_or_404(db: AsyncSession, deck_id: int, user_id: int):
+    deck = await db.scalar(select(deck_model.Deck).where(
+        deck_model.Deck.id == deck_id, deck_model.Deck.user_id == user_id
+    ))
+    if not deck:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deck not found")
+    return deck
+
+async def _get_card_or_404(db: AsyncSession, card_id: int, user_id: int):
+    card = await db.scalar(owned_card_statement(card_id, user_id))
+    if not card:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
+    return card
+
+# --- READ Operations ---
+
+async def get_cards_in_deck(db: AsyncSession, deck_id: int, user_id: int, limit: int, cursor: str | None = None):
+    """
+    Logic to retrieve one page of the cards that belong to one of the user's decks, in id order.
+    """
+    statement = select(card_model.Card).join(card_model.Card.deck).where(
+        card_model.Card.deck_id == deck_id, deck_model.Deck.user_id == user_id
+    )
+    return await paginate_async(db, statement, card_model.Card.id, limit, cursor)
+
+async def get_cards_in_deck_response(
+    db: AsyncSession, deck_id: int, user_id: int, limit: int, cursor: str | None, if_none_match: str | None
+):
+    """
+    get_cards_in_deck() as a conditional GET; see the sync service.
+    """
+    version = await db.scalar(card_list_version_statement(deck_id, user_id))
+    if version is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deck not found")
+    etag = listing_cache.etag("cards", deck_id, version, limit, cursor)
+    response = listing_cache.cached_response(etag, if_none_match)
+    if response is None:
+        page = card_schema.CardPage.model_validate(await get_cards_in_deck(db, deck_id, user_id, limit, cursor))
+        response = listing_cache.store_response(etag, page.model_dump_json())
+    return response
+
+# --- CREATE Operations ---
+
+async def create_card(
+    db: AsyncSession, deck_id: int, user_id: int, card: card_schema.CardCreate, allow_duplicate: bool = False
+):
+    """
+    Logic to create a new card and associate it with a specific deck.
+    An exact duplicate of a question already in the deck is refused unless
+    allow_duplicate is set; near-duplicates are allowed, and reported back.
+    """
+    await _get_deck_or_404(db, deck_id, user_id)
+
+    fingerprint = duplicate_service.fingerprint(card.question)
+    duplicate_id, similar_card_ids = await check_question(db, deck_id, fingerprint)
+    if duplicate_id is not None and not allow_duplicate:
+        raise duplicate_question(duplicate_id)
+
+    db_card = card_model.Card(
+        question=card.question, answer=card.answer, deck_id=deck_id, question_hash=fingerprint.question_hash
+    )
+    db.add(db_card)
+    # Flush to get the card's id, which is its key in the search and duplicate indexes.
+    await db.flush()
+    for statement, params in (
+        search_service.index_card_statements(db_card, user_id)
+        + duplicate_service.index_card_statements(db_card.id, deck_id, fingerprint)
+    ):
+        await db.execute(statement, params)
+    for statement in card_change_statements(deck_id, user_id):
+        await db.execute(statement)
+    await db.commit()
+    await db.refresh(db_card)
+
+    # Precompute the hint in the background so the hint endpoint never waits on the AI.
+    hint_worker.enqueue(db_card.id)
+    return {**card_schema.Card.model_validate(db_card).model_dump(), "similar_card_ids": similar_card_ids}
+
+# --- EXPORT Operations ---
+
+async def _iter_export(deck_id: int, file_format: str) -> AsyncIterator[str]:
+    # The response is streamed after the request's session has been closed, so the
+    # export reads through a session of its own, in a single read transaction.
+    async with AsyncSessionLocal() as db:
+        yield encode_export_header(file_format)
+        result = await db.stream(export_statement(deck_id))
+        async for rows in result.partitions():
+            yield encode_export_rows(rows, file_format)
+
+async def export_cards_response(db: AsyncSession, deck_id: int, user_id: int, file_format: str):
+    """
+    Logic to export all of a deck's cards, with their schedules, as a CSV or
+    JSONL download, streamed batch by batch while it is read from the database.
+    """
+    await _get_deck_or_404(db, deck_id, user_id)
+    return StreamingResponse(
+        _iter_export(deck_id, file_format),
+        media_type=EXPORT_MEDIA_TYPES[file_format],
+        headers=export_headers(deck_id, file_format),
+    )
+
+# --- DUPLICATES Report ---
+
+async def get_duplicates_report(db: AsyncSession, deck_id: int, user_id: int):
+    """
+    Logic to find the groups of exact and near-duplicate cards in one of the user's decks.
+    """
+    await _get_deck_or_404(db, deck_id, user_id)
+    return await report_duplicates(db, deck_id)
+
+# --- UPDATE Operations ---
+
+async def update_card(db: AsyncSession, card_id: int, user_id: int, card_update: card_schema.CardUpdate):
+    """
+    Logic to update an existing card's question or answer.
+    """
+    db_card = await _get_card_or_404(db, card_id, user_id)
+
+    update_data = card_update.model_dump(exclude_unset=True)
+    answer_changed = "answer" in update_data and update_data["answer"] != db_card.answer
+    question_changed = "question" in update_data and update_data["question"] != db_card.question
+    for key, value in update_data.items():
+        setattr(db_card, key, value)
+
+    # The stored hint was written for the old text, so clear it and regenerate.
+    if question_changed or answer_changed:
+        db_card.hint = None
+        for statement, params in search_service.index_card_statements(db_card, user_id, replace=True):
+            await db.execute(statement, params)
+    if question_changed:
+        fingerprint = duplicate_service.fingerprint(db_card.question)
+        db_card.question_hash = fingerprint.question_hash
+        for statement, params in duplicate_service.index_card_statements(
+            card_id, db_card.deck_id, fingerprint, replace=True
+        ):
+            await db.execute(statement, params)
+    if update_data:
+        for statement in card_change_statements(db_card.deck_id, user_id, count_changed=False):
+            await db.execute(statement)
+
+    await db.commit()
+    await db.refresh(db_card)
+
+    # Cached verdicts were judged against the old answer, so drop them.
+    if answer_changed:
+        verification_cache.invalidate_card(card_id)
+    if question_changed or answer_changed:
+        hint_worker.enqueue(card_id)
+    return db_card
+
+# --- DELETE Operations ---
+
+async def delete_card(db: AsyncSession, card_id: int, user_id: int):
+    """
+    Logic to delete a card from the database.
+    """
+    db_card = await _get_card_or_404(db, card_id, user_id)
+    deck_id = db_card.deck_id
+    for statement, params in (
+        search_service.unindex_card_statements(card_id) + duplicate_service.unindex_card_statements(card_id)
+    ):
+        await db.execute(statement, params)
+    await db.delete(db_card)
+    for statement in card_change_statements(deck_id, user_id):
+        await db.execute(statement)
+    await db.commit()
+    verification_cache.invalidate_card(card_id)
+    return {"detail": "Card deleted successfully"}
@@ -0,0 +1,95 @@
+# Async (AsyncSession) version of app/services/deck_service.py, used when Settings.DB_ASYNC is on.
+
+# 1. Third-party Imports
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+
+# 2. Local Application Imports
+from ...models import deck_model
+from ...schemas import deck_schema
+from ...core.pagination import paginate_async
+from ..listing_service import bump_deck_lists_statement, deck_list_version_statement, listing_cache
+from .. import duplicate_service, search_service
+
+# --- READ Operations ---
+
+async def get_all_decks(db: AsyncSession, user_id: int, limit: int, cursor: str | None = None):
+    """
+    Logic to retrieve one page of the user's decks, in id order.
+    """
+    statement = select(deck_model.Deck).where(deck_model.Deck.user_id == user_id)
+    return await paginate_async(db, statement, deck_model.Deck.id, limit, cursor)
+
+async def get_all_decks_response(
+    db: AsyncSession, user_id: int, limit: int, cursor: str | None, if_none_match: str | None
+):
+    """
+    get_all_decks() as a conditional GET; see the sync service.
+    """
+    version = await db.scalar(deck_list_version_statement(user_id))
+    etag = listing_cache.etag("decks", user_id, version, limit, cursor)
+    response = listing_cache.cached_response(etag, if_none_match)
+    if response is None:
+        page = deck_schema.DeckPage.model_validate(await get_all_decks(db, user_id, limit, cursor))
+        response = listing_cache.store_response(etag, page.model_dump_json())
+    return response
+
+async def get_deck_by_id(db: AsyncSession, deck_id: int, user_id: int):
+    """
+    Logic to retrieve a single deck by its ID, if the user owns it.
+    """
+    deck = await db.scalar(select(deck_model.Deck).where(
+        deck_model.Deck.id == deck_id, deck_model.Deck.user_id == user_id
+    ))
+    if not deck:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deck not found")
+    return deck
+
+# --- CREATE Operations ---
+
+async def create_deck(db: AsyncSession, deck: deck_schema.DeckCreate, user_id: int):
+    """
+    Logic to create a new deck, owned by the given user, in the database.
+    """
+    db_deck = deck_model.Deck(name=deck.name, user_id=user_id)
+    db.add(db_deck)
+    await db.execute(bump_deck_lists_statement(user_id))
+    await db.commit()
+    # Refresh to get the new ID and the (zero) card count from the database.
+    await db.refresh(db_deck)
+    return db_deck
+
+# --- UPDATE Operations ---
+
+async def update_deck(db: AsyncSession, deck_id: int, user_id: int, deck_update: deck_schema.DeckUpdate):
+    """
+    Logic to update an existing deck in the database.
+    """
+    db_deck = await get_deck_by_id(db=db, deck_id=deck_id, user_id=user_id)
+
+    update_data = deck_update.model_dump(exclude_unset=True)
+    for key, value in update_data.items():
+        setattr(db_deck, key, value)
+    if update_data:
+        await db.execute(bump_deck_lists_statement(user_id))
+
+    await db.commit()
+    await db.refresh(db_deck)
+    return db_deck
+
+# --- DELETE Operations ---
+
+async def delete_deck(db: AsyncSession, deck_id: int, user_id: int):
+    """
+    Logic to delete a deck (and, through the cascade, its cards) from the database.
+    """
+    db_deck = await get_deck_by_id(db=db, deck_id=deck_id, user_id=user_id)
+    for statement, params in (
+        search_service.unindex_deck_statements(deck_id) + duplicate_service.unindex_deck_statements(deck_id)
+    ):
+        await db.execute(statement, params)
+    await db.delete(db_deck)
+    await db.execute(bump_deck_lists_statement(user_id))
+    await db.commit()
+    return {"detail": "Deck deleted successfully"}
@@ -0,0 +1,40 @@
+# Async (AsyncSession) version of app/services/duplicate_service.py, used when Settings.DB_ASYNC is on.
+
+# 1. Third-party Imports
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# 2. Local Application Imports
+from ..duplicate_service import (
+    QUESTIONS_BATCH_SIZE, Fingerprint, build_exact_groups, build_near_groups, candidate_pairs,
+    candidates_statement, exact_duplicate_statement, exact_groups_statement, questions_statement,
+    shared_buckets_statement, similar_card_ids, unfingerprinted_ids_statement,
+)
+
+async def check_question(db: AsyncSession, deck_id: int, card_fingerprint: Fingerprint) -> tuple:
+    """
+    Returns (id of an exact duplicate or None, ids of near-duplicates) for a
+    question about to be added to a deck.
+    """
+    exact_id = await db.scalar(exact_duplicate_statement(deck_id, card_fingerprint.question_hash))
+    candidates = (await db.execute(candidates_statement(deck_id, card_fingerprint))).all()
+    return exact_id, similar_card_ids(card_fingerprint, candidates)
+
+async def report_duplicates(db: AsyncSession, deck_id: int) -> dict:
+    """
+    Logic to find the groups of exact and near-duplicate cards in a deck, without writing.
+    """
+    exact = build_exact_groups((await db.execute(exact_groups_statement(deck_id))).all())
+    later_copies = {card_id for group in exact for card_id in group[1:]}
+    pairs = candidate_pairs((await db.execute(shared_buckets_statement(deck_id))).all(), later_copies)
+
+    card_ids = sorted({card_id for pair in pairs for card_id in pair})
+    questions = {}
+    for start in range(0, len(card_ids), QUESTIONS_BATCH_SIZE):
+        batch = card_ids[start:start + QUESTIONS_BATCH_SIZE]
+        questions.update((await db.execute(questions_statement(batch))).all())
+    near = build_near_groups(pairs, questions)
+    return {
+        "exact": [{"card_ids": group} for group in exact],
+        "near": [{"card_ids": group} for group in near],
+        "unfingerprinted": (await db.scalars(unfingerprinted_ids_statement(deck_id))).all(),
+    }
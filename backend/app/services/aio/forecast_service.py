@@ -0,0 +1,53 @@
+# Async (AsyncSession) version of app/services/forecast_service.py, used when Settings.DB_ASYNC is on.
+# The queries, response shaping and cache are shared with the sync service.
+
+# 1. Standard Library Imports
+from datetime import datetime
+
+# 2. Third-party Imports
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# 3. Local Application Imports
+from ..forecast_service import (
+    build_forecast,
+    combine_forecasts,
+    deck_not_found,
+    empty_forecast,
+    forecast_cache,
+    forecast_statement,
+    forecast_version_statement,
+)
+
+async def get_deck_forecast(db: AsyncSession, deck_id: int, user_id: int, days: int):
+    """
+    Logic to count a deck's due cards for each of the next `days` days (today first).
+    """
+    today = datetime.utcnow().date()
+    version = (await db.execute(forecast_version_statement(user_id, deck_id))).first()
+    if version is None:
+        raise deck_not_found()
+    key = forecast_cache.key(user_id, deck_id, days, today, tuple(version))
+    cached = forecast_cache.get(key)
+    if cached is not None:
+        return cached
+
+    forecasts = build_forecast(await db.execute(forecast_statement(user_id, deck_id, days, today)), days, today)
+    forecast = {"deck_id": deck_id, "days": forecasts.get(deck_id, empty_forecast(days, today))}
+    forecast_cache.set(key, forecast)
+    return forecast
+
+async def get_all_decks_forecast(db: AsyncSession, user_id: int, days: int):
+    """
+    Logic to forecast every one of the user's decks at once with a single query, for the dashboard.
+    """
+    today = datetime.utcnow().date()
+    version = (await db.execute(forecast_version_statement(user_id, None))).first()
+    key = forecast_cache.key(user_id, None, days, today, tuple(version or ()))
+    cached = forecast_cache.get(key)
+    if cached is not None:
+        return cached
+
+    forecasts = build_forecast(await db.execute(forecast_statement(user_id, None, days, today)), days, today)
+    forecast = combine_forecasts(forecasts, days, today)
+    forecast_cache.set(key, forecast)
+    return forecast
@@ -0,0 +1,19 @@
+# Async (AsyncSession) version of app/services/search_service.py, used when Settings.DB_ASYNC is on.
+# The query and index maintenance statements are shared with the sync service.
+
+# 1. Third-party Imports
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# 2. Local Application Imports
+from ..search_service import build_search_page, search_statement
+
+async def search_cards(
+    db: AsyncSession, q: str, user_id: int, deck_id: int | None, limit: int, cursor: str | None = None
+):
+    """
+    Logic to search the questions and answers of the user's cards, optionally within one deck.
+    """
+    statement = search_statement(q, user_id, deck_id, limit, cursor)
+    if statement is None:
+        return {"items": [], "next_cursor": None, "truncated": False}
+    return build_search_page((await db.execute(statement)).all(), limit)
@@ -0,0 +1,136 @@
+# Async (AsyncSession) version of app/services/study_service.py, used when Settings.DB_ASYNC is on.
+# The query building, answer verification and scheduling are shared with the sync service.
+
+# 1. Third-party Imports
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+
+# 2. Local Application Imports
+from ...core.ai_client import AIClientError
+from .. import hint_service
+from ..review_log_service import review_log
+from ..forecast_service import bump_schedule_statement
+from ..card_service import owned_card_statement
+from ..study_service import (
+    after_review_batch,
+    answer_unverified,
+    card_to_save_statement,
+    due_cards_statement,
+    logged_reviews,
+    logged_reviews_statement,
+    plan_review_batch,
+    REVIEW_SAVE_ATTEMPTS,
+    review_batch_cards_statement,
+    review_batch_bump_statement,
+    review_batch_conflict,
+    review_batch_update_statement,
+    review_conflict,
+    review_update,
+    verify_answer,
+    verify_review_batch,
+)
+
+# --- Spaced Repetition Logic ---
+
+async def get_next_card_to_study(db: AsyncSession, deck_id: int, user_id: int):
+    """
+    Finds the most urgent card to review with an indexed ORDER BY ... LIMIT 1.
+    """
+    return (await db.scalars(due_cards_statement(deck_id, user_id).limit(1))).first()
+
+async def get_next_cards_to_study(db: AsyncSession, deck_id: int, user_id: int, limit: int):
+    """
+    Returns up to `limit` due cards in the same priority order as get_next_card_to_study.
+    """
+    return (await db.scalars(due_cards_statement(deck_id, user_id).limit(limit))).all()
+
+async def review_card(db: AsyncSession, card_id: int, user_answer: str, user_id: int, latency_ms: int | None = None):
+    """
+    Updates a card's review schedule after verifying the answer.
+    """
+    card = await db.scalar(owned_card_statement(card_id, user_id))
+    if not card:
+        raise HTTPException(status_code=404, detail="Card not found")
+
+    # End the read transaction so no pooled connection is held while we wait on the AI.
+    await db.commit()
+
+    was_correct = await verify_answer(card_id, card.answer, user_answer)
+    if was_correct is None:
+        raise answer_unverified()
+
+    for _ in range(REVIEW_SAVE_ATTEMPTS):
+        # The session doesn't expire the card on commit, so re-read its schedule.
+        card = await db.scalar(card_to_save_statement(card_id, user_id))
+        if not card:
+            raise HTTPException(status_code=404, detail="Card not found")
+        update_row = review_update(card, was_correct)
+        if (await db.execute(review_batch_update_statement(), update_row)).rowcount == 1:
+            break
+        await db.rollback()
+    else:
+        raise review_conflict()
+    await db.execute(bump_schedule_statement({card.deck_id}))
+    await db.commit()
+    review_log.record(
+        card_id, user_id, was_correct, card.interval, update_row["interval"], update_row["last_reviewed_at"], latency_ms
+    )
+
+    return {"was_correct": was_correct, "correct_answer": card.answer}
+
+async def _apply_review_batch_updates(db: AsyncSession, updates: list) -> bool:
+    statement = review_batch_update_statement()
+    if db.bind.dialect.supports_sane_multi_rowcount:
+        return (await db.execute(statement, updates)).rowcount == len(updates)
+    for row in updates:
+        if (await db.execute(statement, row)).rowcount != 1:
+            return False
+    return True
+
+async def review_batch(db: AsyncSession, reviews, user_id: int):
+    """
+    Applies an ordered batch of reviews in a single transaction with one bulk UPDATE.
+    """
+    card_ids = {review.card_id for review in reviews}
+    cards = {row.id: row for row in await db.execute(review_batch_cards_statement(card_ids, user_id))}
+    # Release the connection while we wait on the AI.
+    await db.commit()
+
+    verdicts = await verify_review_batch(reviews, cards)
+
+    for _ in range(REVIEW_SAVE_ATTEMPTS):
+        cards = {row.id: row for row in await db.execute(review_batch_cards_statement(card_ids, user_id))}
+        statement = logged_reviews_statement(reviews, cards)
+        applied_before = logged_reviews(await db.execute(statement), card_ids) if statement is not None else set()
+        results, updates, logged = plan_review_batch(reviews, cards, verdicts, applied_before)
+        if not updates or await _apply_review_batch_updates(db, updates):
+            if updates:
+                await db.execute(review_batch_bump_statement(cards, updates))
+            await db.commit()
+            after_review_batch(logged, user_id)
+            return {"results": results}
+        await db.rollback()
+    raise review_batch_conflict()
+
+async def get_hint_for_card(db: AsyncSession, card_id: int, user_id: int):
+    """
+    Returns the card's precomputed hint, generating and saving it first if it isn't ready yet.
+    """
+    card = await db.scalar(owned_card_statement(card_id, user_id))
+    if not card:
+        raise HTTPException(status_code=404, detail="Card not found")
+    if card.hint:
+        return {"hint": card.hint}
+
+    # Release the connection before waiting on the AI.
+    await db.commit()
+
+    try:
+        hint = await hint_service.generate_hint(card.question, card.answer)
+    except AIClientError as e:
+        print(f"Gemini API hint generation failed: {e}")
+        raise HTTPException(status_code=500, detail="Failed to generate hint")
+
+    await hint_service.store_hint_async(db, card_id, card.question, card.answer, hint)
+    await db.commit()
+    return {"hint": hint}
@@ -0,0 +1,61 @@
+# Async (AsyncSession) version of app/services/user_service.py, used when Settings.DB_ASYNC is on.
+
+# 1. Third-party Imports
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException, status
+
+# 2. Local Application Imports
+from ...models import user_model
+from ...schemas import user_schema
+from ...core import security
+from ...core.deps import invalidate_cached_user
+
+async def _get_user_by_email(db: AsyncSession, email: str):
+    return await db.scalar(select(user_model.User).where(user_model.User.email == email))
+
+async def create_user(db: AsyncSession, user: user_schema.UserCreate):
+    """
+    Creates a new user in the database after hashing their password.
+    """
+    if await _get_user_by_email(db, user.email):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
+    # Release the connection while we wait for the hash.
+    await db.commit()
+
+    hashed_password = await security.get_password_hash_async(user.password)
+
+    db_user = user_model.User(email=user.email, hashed_password=hashed_password)
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def authenticate_user(db: AsyncSession, email: str, password: str):
+    """
+    Authenticates a user by checking their email and password.
+    Returns a JWT token if successful, otherwise returns False.
+    Hashes made with an outdated bcrypt cost are replaced on success.
+    """
+    user = await _get_user_by_email(db, email)
+    if not user:
+        return False
+    # Release the connection while we wait for bcrypt.
+    await db.commit()
+
+    is_valid, new_hash = await security.verify_and_update_password_async(password, user.hashed_password)
+    if not is_valid:
+        return False
+    if new_hash:
+        user.hashed_password = new_hash
+        await db.commit()
+        invalidate_cached_user(email)
+
+    access_token = security.create_access_token(
+        # "sub" is a standard JWT claim for "subject"; "uid" lets us skip the email lookup.
+        data={"sub": user.email, "uid": user.id}
+    )
+    return {"access_token": access_token, "token_type": "bearer"}
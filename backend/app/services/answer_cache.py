@@ -0,0 +1,95 @@
+# 1. Standard Library Imports
+import hashlib
+import re
+
+# 2. Local Application Imports
+from ..core.cache import TTLCache
+from ..core.config import settings
+
+# --- Answer Normalization ---
+_NON_ALPHANUMERIC = re.compile(r"[\W_]+")
+
+def normalize_answer(answer: str) -> str:
+    """
+    Lower-cases an answer and collapses punctuation and whitespace,
+    so "  The Eiffel-Tower. " and "the eiffel tower" compare equal.
+    """
+    return _NON_ALPHANUMERIC.sub(" ", answer.casefold()).strip()
+
+# Dropped outright rather than turned into a space, so "U.S.A." and "don't" close up.
+# A dot between digits is kept: "3.14" is not "314".
+_JOINING_MARKS = re.compile(r"['’]|(?<!\d)\.|\.(?!\d)")
+_WORD = re.compile(r"\d+(?:\.\d+)*|[^\W_]+")
+
+def _match_form(answer: str) -> str:
+    return " ".join(_WORD.findall(_JOINING_MARKS.sub("", answer.casefold())))
+
+def answers_match(correct_answer: str, user_answer: str) -> bool:
+    """
+    The local fast path: True when the user's answer is the stored answer
+    up to case, punctuation and runs of whitespace (e.g. "U.S.A." vs "usa").
+    Word breaks still count, so "10 0" is not "100".
+    Such answers are obviously correct and never need the AI.
+    """
+    correct = _match_form(correct_answer)
+    return correct != "" and _match_form(user_answer) == correct
+
+def _answer_hash(answer: str) -> str:
+    return hashlib.sha1(answer.encode("utf-8")).hexdigest()
+
+# --- Verdict Cache ---
+class VerificationCache(TTLCache):
+    """
+    A TTLCache of AI verdicts that can also drop every verdict for one card.
+
+    Entries are keyed by (card_id, normalized user answer, hash of the stored answer).
+    Because the stored answer is part of the key, a verdict can never be served for
+    an answer that has since been edited, even by another worker that missed the
+    explicit invalidation. invalidate_card() frees a card's entries right away.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        super().__init__(max_size=max_size, ttl_seconds=ttl_seconds)
+        self._keys_by_card = {}  # card_id -> set of keys, for invalidation
+
+    @staticmethod
+    def _make_key(card_id: int, correct_answer: str, user_answer: str):
+        return (card_id, normalize_answer(user_answer), _answer_hash(correct_answer))
+
+    def get(self, card_id: int, correct_answer: str, user_answer: str) -> bool | None:
+        """
+        Returns the cached verdict, or None if there is no live entry.
+        """
+        return super().get(self._make_key(card_id, correct_answer, user_answer))
+
+    def set(self, card_id: int, correct_answer: str, user_answer: str, verdict: bool):
+        super().set(self._make_key(card_id, correct_answer, user_answer), verdict)
+
+    def invalidate_card(self, card_id: int):
+        """
+        Drops every cached verdict for a card. Called when its answer changes or it is deleted.
+        """
+        with self._lock:
+            for key in list(self._keys_by_card.get(card_id, ())):
+                self._delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_card.clear()
+
+    def _stored(self, key):
+        self._keys_by_card.setdefault(key[0], set()).add(key)
+
+    def _dropped(self, key):
+        card_keys = self._keys_by_card.get(key[0])
+        if card_keys is not None:
+            card_keys.discard(key)
+            if not card_keys:
+                del self._keys_by_card[key[0]]
+
+# Create a single instance that the rest of our app can import
+verification_cache = VerificationCache(
+    max_size=settings.VERIFICATION_CACHE_SIZE,
+    ttl_seconds=settings.VERIFICATION_CACHE_TTL_SECONDS,
+)
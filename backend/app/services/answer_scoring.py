@@ -0,0 +1,453 @@
+# 1. Standard Library Imports
+import re
+import unicodedata
+from datetime import date
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from functools import lru_cache
+from typing import NamedTuple
+
+# 2. Local Application Imports
+from ..core.config import settings
+from .answer_cache import answers_match
+
+# --- Local Answer Scoring ---
+# Decides the clear cases of answer verification without the AI, in
+# microseconds, and leaves the rest to it. score_answer() returns a verdict
+# only when one of these rules is confident:
+#   1. Match: the answers are equal up to case, spacing and punctuation.
+#   2. Non-answer: "", "idk", "no idea"... is wrong.
+#   3. Numbers, dates and labels: "1945" vs "1944", "8 May 1945" vs "9 May 1945",
+#      or "World War I" vs "World War II", is wrong; "3" vs "three", or "8 May
+#      1945" vs "1945-05-08", is the same value. Labels are single letters and
+#      roman numerals ("Vitamin A", "Henry VIII"), which only ever match exactly.
+#      A number one side may have rounded ("3.14" for "3.14159") goes to the AI.
+#   4. Similarity: a typo ("mitocondria") or the answer plus filler ("it's the
+#      mitochondria") is right, as long as the words come in the same order:
+#      "the Sun orbits the Earth" for "the Earth orbits the Sun" goes to the AI.
+#      Only the items of a list may be reordered ("pepper and salt"). A word
+#      with one letter swapped for another ("adsorption" for "absorption") may
+#      be a different word, so it goes to the AI too. A wholly different answer
+#      is wrong only below ANSWER_REJECT_SIMILARITY, which is off by default:
+#      text alone can't tell a synonym ("canine" for "dog") from a wrong answer
+#      ("London" for "Paris").
+# Negations and hedges ("not Paris", "Paris or Lyon") are never decided locally.
+# The thresholds are settings; benchmarks/bench_answer_scoring.py measures them
+# against a labeled set of answers.
+
+class AnswerScore(NamedTuple):
+    verdict: bool | None    # None when only the AI can tell
+    score: float            # How close the answers are, 0-1
+    reason: str             # The rule that decided, or why none could
+
+# --- Edit Distance ---
+
+def edit_distance(a: str, b: str) -> int:
+    """
+    Levenshtein distance with the bit-parallel algorithm of Myers and Hyyrö:
+    one pass over `a` with a handful of integer operations per character, the
+    columns of the usual table packed into the bits of a Python int.
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if not b:
+        return len(a)
+    masks = {}
+    for i, char in enumerate(b):
+        masks[char] = masks.get(char, 0) | (1 << i)
+    full = (1 << len(b)) - 1
+    last = 1 << (len(b) - 1)
+    positive, negative, distance = full, 0, len(b)
+    for char in a:
+        equal = masks.get(char, 0)
+        vertical = equal | negative
+        horizontal = (((equal & positive) + positive) ^ positive) | equal
+        horizontal_positive = negative | ~(horizontal | positive)
+        horizontal_negative = positive & horizontal
+        if horizontal_positive & last:
+            distance += 1
+        elif horizontal_negative & last:
+            distance -= 1
+        horizontal_positive = (horizontal_positive << 1) | 1
+        horizontal_negative <<= 1
+        positive = (horizontal_negative | ~(vertical | horizontal_positive)) & full
+        negative = horizontal_positive & vertical & full
+    return distance
+
+def similarity(a: str, b: str) -> float:
+    """1 - edit distance / length of the longer string: 1.0 for equal strings."""
+    longest = max(len(a), len(b))
+    return 1.0 - edit_distance(a, b) / longest if longest else 1.0
+
+# --- Parsing ---
+
+_MONTH = r"(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+_MONTHS = {name: number for number, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+_ISO_DATE = re.compile(r"\b(\d{4})-(\d{1,2})-(\d{1,2})\b")
+_NUMERIC_DATE = re.compile(r"\b(\d{1,2})[/.](\d{1,2})[/.](\d{4})\b")
+_FRACTION = re.compile(r"(?<![\w./])(\d+)\s*/\s*(\d+)(?![\w./])")
+_PERCENT = re.compile(r"(?<![\w.])(\d+(?:\.\d+)?)\s*%")
+_DAY_MONTH_YEAR = re.compile(rf"\b(\d{{1,2}})(?:st|nd|rd|th)?(?:\s+of)?\s+{_MONTH}\b\.?,?\s+(\d{{4}})\b")
+_MONTH_DAY_YEAR = re.compile(rf"\b{_MONTH}\b\.?\s+(\d{{1,2}})(?:st|nd|rd|th)?,?\s+(\d{{4}})\b")
+_MONTH_YEAR = re.compile(rf"\b{_MONTH}\b\.?,?\s+(\d{{4}})\b")
+# 1,000 / 3.14 / -5 / 5th / 3e8 / 3 x 10^8, but not the 2 in "h2o".
+_NUMBER = re.compile(
+    r"(?<![\w.])(-?(?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?)"
+    r"(?:\s*[x×*]\s*10\s*\^\s*(-?\d+)|e(-?\d+)(?![a-z]))?(?:st|nd|rd|th)?(?!\d)"
+)
+_SUPERSCRIPTS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹⁻", "0123456789-")
+_POWER_OF_TEN = re.compile(r"10([⁰¹²³⁴⁵⁶⁷⁸⁹⁻]+)")
+_CONTRACTIONS = [(re.compile(r"\bcan['’]t\b"), "can not"), (re.compile(r"\bwon['’]t\b"), "will not"),
+                 (re.compile(r"n['’]t\b"), " not"), (re.compile(r"['’][st]\b"), "")]
+# "I" is a label ("World War I") except as the speaker of a filler phrase ("I think", "I'm sure").
+_FILLER_I = re.compile(
+    r"\bi(?:['’](?:m|d|ve|ll)\b|(?=\s+(?:think|believe|guess|suppose|reckon|am|would|know|remember)\b))"
+)
+# A single letter, or a roman numeral up to 39.
+_LABEL = re.compile(r"[^\W\d_]|(?=[ivx])x{0,3}(?:ix|iv|v?i{0,3})")
+_WORD = re.compile(r"\w+")
+# Stands in for a number or date once it's read, so a letter after one is known to be a unit ("100 °C").
+# The private-use character after it says which value it was (not a digit,
+# which a later pattern would read as a number), to keep values in order.
+_VALUE_MARK = "\x00"
+_VALUE_INDEX = 0xE000
+_TOKEN = re.compile(r"\x00[\ue000-\uf8ff]|\w+")
+# Splits a list into its items: "red, green and blue", but not "1,000" or "May 8, 1945".
+_LIST_SEPARATOR = re.compile(r",(?!\s*\d)|;|&|\band\b")
+
+_SMALL_NUMBERS = {name: number for number, name in enumerate(
+    "zero one two three four five six seven eight nine ten eleven twelve thirteen fourteen "
+    "fifteen sixteen seventeen eighteen nineteen".split()
+)}
+_TENS = {name: 10 * number for number, name in enumerate(
+    "twenty thirty forty fifty sixty seventy eighty ninety".split(), start=2
+)}
+_SCALES = {"thousand": 10**3, "million": 10**6, "billion": 10**9}
+_NUMBER_WORDS = {*_SMALL_NUMBERS, *_TENS, *_SCALES, "hundred"}
+
+_STOP_WORDS = frozenset(
+    "an the of to in on at by for with from as am is are was were be been it its this that these those "
+    "and think answer".split()
+)
+_NEGATIONS = frozenset("not no never neither nor none nothing".split())
+_HEDGES = frozenset("or either maybe perhaps probably possibly".split())
+_NON_ANSWERS = frozenset([
+    "", "idk", "dunno", "pass", "skip", "no idea", "not sure", "i am not sure", "i m not sure",
+    "do not know", "i do not know", "dont know", "i dont know", "no clue", "i have no idea",
+])
+
+class _Parsed(NamedTuple):
+    words: tuple            # Content words in order, without stop words, numbers, dates or labels
+    sequence: tuple         # Content words and values ("#text") in the order given
+    values: frozenset       # Numbers, dates and labels, as (kind, canonical text) pairs
+    unreadable: bool        # Holds a number or date that can't be read for sure
+    negated: bool
+    hedged: bool
+    non_answer: bool
+
+    @property
+    def tokens(self) -> frozenset:
+        # Values are tokens too, marked with "#" so they only ever match exactly.
+        return frozenset(self.words) | {f"#{text}" for _, text in self.values}
+
+    @property
+    def text(self) -> str:
+        return " ".join([*self.words, *sorted(f"#{text}" for _, text in self.values)])
+
+def _fold(answer: str) -> str:
+    # Case is ignored but accents are not: "schön" and "schon" are different words.
+    # "10⁸" is read as 10^8 before NFKC would turn it into "108".
+    answer = _POWER_OF_TEN.sub(lambda m: "10^" + m.group(1).translate(_SUPERSCRIPTS), answer.casefold())
+    answer = unicodedata.normalize("NFKC", answer)
+    for pattern, replacement in _CONTRACTIONS:
+        answer = pattern.sub(replacement, answer)
+    return answer
+
+def _date_value(year: int, month: int, day: int):
+    try:
+        return ("date", date(year, month, day).isoformat())
+    except ValueError:
+        return None
+
+def _numeric_date(match):
+    first, second, year = (int(group) for group in match.groups())
+    # 05/08/1945 is 5 August or May 8 depending on the reader; only read it when it can't be both.
+    if first > 12 or first == second:
+        return _date_value(year, second, first)
+    if second > 12:
+        return _date_value(year, first, second)
+    return None
+
+def _number_value(value: Decimal) -> tuple:
+    # Canonical text, so that "1,000", "1000.0" and "1e3" are one value.
+    return ("number", format(value.normalize(), "f"))
+
+def _number(match):
+    try:
+        value = Decimal(match.group(1).replace(",", ""))
+    except InvalidOperation:
+        return None
+    exponent = match.group(2) or match.group(3)
+    if exponent:
+        value = value.scaleb(int(exponent))
+    return _number_value(value)
+
+def _fraction(match):
+    numerator, denominator = int(match.group(1)), int(match.group(2))
+    return _number_value(Decimal(numerator) / denominator) if denominator else None
+
+_VALUE_PATTERNS = [
+    (_ISO_DATE, lambda m: _date_value(int(m.group(1)), int(m.group(2)), int(m.group(3)))),
+    (_NUMERIC_DATE, _numeric_date),
+    (_FRACTION, _fraction),
+    (_PERCENT, lambda m: ("percent", format(Decimal(m.group(1)).normalize(), "f"))),
+    (_DAY_MONTH_YEAR, lambda m: _date_value(int(m.group(3)), _MONTHS[m.group(2)[:3]], int(m.group(1)))),
+    (_MONTH_DAY_YEAR, lambda m: _date_value(int(m.group(3)), _MONTHS[m.group(1)[:3]], int(m.group(2)))),
+    (_MONTH_YEAR, lambda m: ("month", f"{int(m.group(2)):04d}-{_MONTHS[m.group(1)[:3]]:02d}")),
+    (_NUMBER, _number),
+]
+
+def _is_article(words: list, position: int) -> bool:
+    # "a" before a word, at the start or after a stop word ("it's a cat"), is the
+    # article; elsewhere it's a label ("Vitamin A", "class A felony", "A").
+    return (
+        words[position] == "a" and position + 1 < len(words)
+        and (position == 0 or words[position - 1] in _STOP_WORDS)
+    )
+
+def _number_words_value(words: list) -> int | None:
+    """
+    Reads a run of number words ("one hundred and five", "twenty one"), or
+    returns None for runs that aren't one cardinal number ("nineteen forty five").
+    """
+    total, current, previous = 0, 0, None
+    for word in words:
+        if word == "and":
+            if previous not in ("hundred", "scale"):
+                return None
+            continue
+        if word in _SMALL_NUMBERS:
+            number = _SMALL_NUMBERS[word]
+            if previous in ("small", "teen") or (previous == "tens" and number >= 10):
+                return None
+            current += number
+            previous = "teen" if number >= 10 else "small"
+        elif word in _TENS:
+            if previous in ("small", "teen", "tens"):
+                return None
+            current += _TENS[word]
+            previous = "tens"
+        elif word == "hundred":
+            if previous not in ("small", "teen") or current >= 100:
+                return None
+            current *= 100
+            previous = "hundred"
+        else:
+            if previous in (None, "scale"):
+                return None
+            total += current * _SCALES[word]
+            current, previous = 0, "scale"
+    return None if previous is None else total + current
+
+@lru_cache(maxsize=4096)
+def _parse(answer: str) -> _Parsed:
+    text = _fold(answer)
+    non_answer = " ".join(_WORD.findall(text)) in _NON_ANSWERS
+    values, found, unreadable = set(), [], False
+
+    def take(convert):
+        def replace(match):
+            nonlocal unreadable
+            value = convert(match)
+            if value is None:
+                unreadable = True
+            else:
+                values.add(value)
+            found.append(value)
+            return f" {_VALUE_MARK}{chr(_VALUE_INDEX + len(found) - 1)} "
+        return replace
+
+    for pattern, convert in _VALUE_PATTERNS:
+        text = pattern.sub(take(convert), text)
+
+    all_words = _TOKEN.findall(_FILLER_I.sub(" ", text))
+    words, sequence, run, after_value = [], [], [], False
+    for position, word in enumerate(all_words + [None]):
+        if word in _NUMBER_WORDS or (word == "and" and run):
+            run.append(word)
+            continue
+        if run:
+            trailing_and = run[-1] == "and"
+            number = _number_words_value(run[:-1] if trailing_and else run)
+            if number is None:
+                unreadable = True
+            else:
+                value = _number_value(Decimal(number))
+                values.add(value)
+                sequence.append(f"#{value[1]}")
+            run, after_value = [], True
+        if word is not None and word[0] == _VALUE_MARK:
+            value = found[ord(word[1]) - _VALUE_INDEX]
+            if value is not None:
+                sequence.append(f"#{value[1]}")
+            after_value = True
+            continue
+        unit, after_value = after_value, False
+        if word is None or word in _STOP_WORDS or _is_article(all_words, position):
+            continue
+        if _LABEL.fullmatch(word) and not unit:
+            values.add(("label", word))
+            sequence.append(f"#{word}")
+        else:
+            words.append(word)
+            sequence.append(word)
+
+    word_set = set(all_words)
+    return _Parsed(
+        words=tuple(words),
+        sequence=tuple(sequence),
+        values=frozenset(values),
+        unreadable=unreadable,
+        negated=not word_set.isdisjoint(_NEGATIONS),
+        hedged=not word_set.isdisjoint(_HEDGES),
+        non_answer=non_answer,
+    )
+
+# --- Scoring ---
+
+def _same_token(token: str, other: str, threshold: float) -> bool:
+    if token == other:
+        return True
+    if token[0] == "#" or other[0] == "#":
+        return False
+    # Typo tolerance: a word matches one that differs by a few letters.
+    return (
+        min(len(token), len(other)) >= threshold * max(len(token), len(other))
+        and similarity(token, other) >= threshold
+    )
+
+def _matches(token: str, others: frozenset, threshold: float) -> bool:
+    return token in others or any(_same_token(token, other, threshold) for other in others)
+
+def _in_sequence(correct: tuple, user: tuple, threshold: float) -> bool:
+    # Whether the correct tokens appear in the user's in the same order, with
+    # anything in between. Taking the earliest match each time is enough.
+    position = 0
+    for token in correct:
+        while position < len(user) and not _same_token(token, user[position], threshold):
+            position += 1
+        if position == len(user):
+            return False
+        position += 1
+    return True
+
+def _list_items(answer: str) -> list:
+    items = (_parse(part).sequence for part in _LIST_SEPARATOR.split(_fold(answer)))
+    return [item for item in items if item]
+
+def _in_order(correct_answer: str, user_answer: str, threshold: float) -> bool:
+    """
+    Whether the user's answer says the correct one in the same order. The items
+    of a list may come in any order, but the words within each item may not.
+    """
+    correct, user = _parse(correct_answer).sequence, _parse(user_answer).sequence
+    if len(user) < 2 or _in_sequence(correct, user, threshold):
+        return True
+    # A word misspelled past the per-word typo tolerance ("eifel") has no place
+    # to check, so whole-text similarity decides alone.
+    if not all(_matches(token, frozenset(user), threshold) for token in correct):
+        return True
+    correct_items, user_items = _list_items(correct_answer), _list_items(user_answer)
+    if len(correct_items) < 2 or len(correct_items) != len(user_items):
+        return False
+    for item in correct_items:
+        match = next((other for other in user_items if _in_sequence(item, other, threshold)), None)
+        if match is None:
+            return False
+        user_items.remove(match)
+    return True
+
+def _one_letter_off(correct_words: tuple, user_words: tuple) -> bool:
+    # "adsorption" for "absorption": a word with one letter swapped for another
+    # is as often a different word as a typo.
+    return any(
+        word not in user_words
+        and any(len(other) == len(word) and sum(a != b for a, b in zip(word, other)) == 1 for other in user_words)
+        for word in correct_words
+    )
+
+def _overlap(correct: frozenset, user: frozenset, threshold: float) -> tuple:
+    """(share of the correct answer's tokens the user has, share of the user's tokens that are in it)."""
+    if not correct or not user:
+        return 0.0, 0.0
+    recall = sum(_matches(token, user, threshold) for token in correct) / len(correct)
+    precision = sum(_matches(token, correct, threshold) for token in user) / len(user)
+    return recall, precision
+
+def _rounds_to(values: frozenset, others: frozenset) -> bool:
+    # "3.14" for "3.14159", or "300,000" for "299,792": one number may be the other
+    # rounded, which only the AI should judge. Trailing zeros count as rounding.
+    numbers = [Decimal(text).normalize() for kind, text in values if kind == "number"]
+    other_numbers = [Decimal(text).normalize() for kind, text in others if kind == "number"]
+    for a in numbers:
+        for b in other_numbers:
+            coarse, fine = (a, b) if a.as_tuple().exponent > b.as_tuple().exponent else (b, a)
+            if coarse.as_tuple().exponent == fine.as_tuple().exponent:
+                continue
+            if fine.quantize(Decimal(1).scaleb(coarse.as_tuple().exponent), rounding=ROUND_HALF_UP) == coarse:
+                return True
+    return False
+
+def score_answer(correct_answer: str, user_answer: str) -> AnswerScore:
+    """
+    Scores a user's answer against the stored answer with the rules above.
+    verdict is True or False when the answer is clearly right or wrong, and None
+    when it should go to the AI; score says how close the two answers are.
+    """
+    if answers_match(correct_answer, user_answer):
+        return AnswerScore(True, 1.0, "match")
+    correct, user = _parse(correct_answer), _parse(user_answer)
+    if user.non_answer and not correct.non_answer:
+        return AnswerScore(False, 0.0, "non_answer")
+
+    accept_similarity = settings.ANSWER_ACCEPT_SIMILARITY
+    text_similarity = similarity(correct.text, user.text)
+    recall, precision = _overlap(correct.tokens, user.tokens, accept_similarity)
+    score = max(text_similarity, 2 * recall * precision / (recall + precision) if recall + precision else 0.0)
+
+    if correct.unreadable or user.unreadable:
+        return AnswerScore(None, score, "unreadable_number")
+    if correct.negated != user.negated:
+        return AnswerScore(None, score, "negation")
+    if user.hedged and not correct.hedged:
+        return AnswerScore(None, score, "hedge")
+
+    missing = correct.values - user.values
+    if missing:
+        if _rounds_to(missing, user.values):
+            return AnswerScore(None, score, "rounding")
+        # Everything but the number, date or label matches, so that is what's wrong.
+        words_recall = _overlap(frozenset(correct.words), frozenset(user.words), accept_similarity)[0]
+        missing_kinds = {value[0] for value in missing}
+        if (words_recall == 1.0 or not correct.words) and missing_kinds <= {value[0] for value in user.values}:
+            return AnswerScore(False, score, "value_mismatch")
+        return AnswerScore(None, score, "value_mismatch")
+    if user.values - correct.values:
+        return AnswerScore(None, score, "extra_values")
+    if correct.values and not correct.words:
+        # The answer is a number or date and the user gave exactly that ("eight planets" for "8"),
+        # unless it's a few of them in another order ("1945 to 1939" for "1939 to 1945").
+        if not _in_order(correct_answer, user_answer, accept_similarity):
+            return AnswerScore(None, score, "order")
+        return AnswerScore(True, score, "number_match")
+
+    if text_similarity >= accept_similarity or (recall == 1.0 and precision >= settings.ANSWER_ACCEPT_PRECISION):
+        if not _in_order(correct_answer, user_answer, accept_similarity):
+            return AnswerScore(None, score, "order")
+        if _one_letter_off(correct.words, user.words):
+            return AnswerScore(None, score, "one_letter_off")
+        return AnswerScore(True, score, "similar" if text_similarity >= accept_similarity else "overlap")
+    if recall == 0.0 and score < settings.ANSWER_REJECT_SIMILARITY:
+        return AnswerScore(False, score, "unrelated")
+    return AnswerScore(None, score, "unsure")
@@ -1,76 +1,408 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import BinaryIO, Iterator, Tuple
+
+from sqlalchemy import insert, select
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
 
 # Import the models and schemas needed for card operations
 from ..models import card_model, deck_model
 from ..schemas import card_schema
+from ..core.database import SessionLocal
+from ..core.pagination import paginate
+from .answer_cache import verification_cache
+from .hint_service import hint_worker
+from .listing_service import card_change_statements, card_list_version_statement, listing_cache
+from . import duplicate_service, search_service
+
+# --- Ownership ---
+# A card belongs to whoever owns its deck. Lookups join to the deck and filter on
+# its owner in the same statement, so there is no separate permission query, and
+# another user's card looks exactly like one that doesn't exist.
+
+def owned_card_statement(card_id: int, user_id: int):
+    """
+    The select() for a card, if it is in one of the user's decks.
+    Shared with the async card service and the study services.
+    """
+    return select(card_model.Card).join(card_model.Card.deck).where(
+        card_model.Card.id == card_id, deck_model.Deck.user_id == user_id
+    )
+
+def _get_owned_deck(db: Session, deck_id: int, user_id: int):
+    db_deck = db.query(deck_model.Deck).filter(
+        deck_model.Deck.id == deck_id, deck_model.Deck.user_id == user_id
+    ).first()
+    if not db_deck:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deck not found")
+    return db_deck
+
+def _get_owned_card(db: Session, card_id: int, user_id: int):
+    db_card = db.scalars(owned_card_statement(card_id, user_id)).first()
+    if not db_card:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
+    return db_card
 
 # --- READ Operations ---
 
-def get_cards_in_deck(db: Session, deck_id: int):
+def get_cards_in_deck(db: Session, deck_id: int, user_id: int, limit: int, cursor: str | None = None):
+    """
+    Logic to retrieve one page of the cards that belong to one of the user's decks, in id order.
+    A deck the user doesn't own comes back empty; get_cards_in_deck_response() turns that into a 404.
+    """
+    query = db.query(card_model.Card).join(card_model.Card.deck).filter(
+        card_model.Card.deck_id == deck_id, deck_model.Deck.user_id == user_id
+    )
+    return paginate(query, card_model.Card.id, limit, cursor)
+
+def get_cards_in_deck_response(
+    db: Session, deck_id: int, user_id: int, limit: int, cursor: str | None, if_none_match: str | None
+):
     """
-    Logic to retrieve all cards that belong to a specific deck.
+    get_cards_in_deck() as a conditional GET: a 304 when the client's copy is current,
+    and a cached body when only this worker's copy is. Either way it costs one
+    primary-key lookup of the deck's card list version (which also 404s a deck
+    that is missing or someone else's).
     """
-    # First, ensure the deck itself exists to avoid errors.
-    deck = db.query(deck_model.Deck).filter(deck_model.Deck.id == deck_id).first()
-    if not deck:
+    version = db.scalar(card_list_version_statement(deck_id, user_id))
+    if version is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deck not found")
-    
-    # Query for all cards where the foreign key 'deck_id' matches.
-    return db.query(card_model.Card).filter(card_model.Card.deck_id == deck_id).all()
+    etag = listing_cache.etag("cards", deck_id, version, limit, cursor)
+    response = listing_cache.cached_response(etag, if_none_match)
+    if response is None:
+        page = card_schema.CardPage.model_validate(get_cards_in_deck(db, deck_id, user_id, limit, cursor))
+        response = listing_cache.store_response(etag, page.model_dump_json())
+    return response
 
 # --- CREATE Operations ---
 
-def create_card(db: Session, deck_id: int, card: card_schema.CardCreate):
+def duplicate_question(card_id: int):
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"This deck already has a card with this question (card {card_id}). "
+               "Pass allow_duplicate=true to add it anyway.",
+    )
+
+def create_card(db: Session, deck_id: int, user_id: int, card: card_schema.CardCreate, allow_duplicate: bool = False):
     """
     Logic to create a new card and associate it with a specific deck.
+    An exact duplicate of a question already in the deck is refused unless
+    allow_duplicate is set; near-duplicates are allowed, and reported back.
     """
-    # Ensure the parent deck exists before creating a card in it.
-    db_deck = db.query(deck_model.Deck).filter(deck_model.Deck.id == deck_id).first()
-    if not db_deck:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deck not found")
-        
+    # Ensure the parent deck exists, and is the user's, before creating a card in it.
+    _get_owned_deck(db, deck_id, user_id)
+
+    fingerprint = duplicate_service.fingerprint(card.question)
+    duplicate_id, similar_card_ids = duplicate_service.check_question(db, deck_id, fingerprint)
+    if duplicate_id is not None and not allow_duplicate:
+        raise duplicate_question(duplicate_id)
+
     # Create the new card model instance, passing the deck_id to link them.
     db_card = card_model.Card(
         question=card.question,
         answer=card.answer,
-        deck_id=deck_id
+        deck_id=deck_id,
+        question_hash=fingerprint.question_hash
     )
     
     db.add(db_card)
+    # Flush to get the card's id, which is its key in the search and duplicate indexes.
+    db.flush()
+    for statement, params in (
+        search_service.index_card_statements(db_card, user_id)
+        + duplicate_service.index_card_statements(db_card.id, deck_id, fingerprint)
+    ):
+        db.execute(statement, params)
+    for statement in card_change_statements(deck_id, user_id):
+        db.execute(statement)
     db.commit()
     db.refresh(db_card)
-    return db_card
+
+    # Precompute the hint in the background so the hint endpoint never waits on the AI.
+    hint_worker.enqueue(db_card.id)
+    return {**card_schema.Card.model_validate(db_card).model_dump(), "similar_card_ids": similar_card_ids}
+
+# --- BULK IMPORT Operations ---
+
+IMPORT_BATCH_SIZE = 1000      # Rows per multi-row INSERT (and per transaction)
+IMPORT_MAX_REPORTED_ERRORS = 100
+
+def _iter_csv_rows(text_file) -> Iterator[Tuple[int, dict | None, str | None]]:
+    """
+    Yields (line, row, error) for each record of a CSV file with a header row
+    containing 'question' and 'answer' columns, and optionally the scheduling
+    columns of an export (empty cells are left to their defaults).
+    Quoted multi-line fields are supported.
+    """
+    reader = csv.DictReader(text_file)
+    fieldnames = [name.strip().lower() for name in (reader.fieldnames or [])]
+    if "question" not in fieldnames or "answer" not in fieldnames:
+        yield 1, None, "CSV header must contain 'question' and 'answer' columns"
+        return
+    reader.fieldnames = fieldnames
+    for row in reader:
+        record = {"question": row.get("question"), "answer": row.get("answer")}
+        record.update({name: row[name] for name in EXPORT_SCHEDULE_FIELDS if row.get(name)})
+        yield reader.line_num, record, None
+
+def _iter_jsonl_rows(text_file) -> Iterator[Tuple[int, dict | None, str | None]]:
+    """
+    Yields (line, row, error) for each non-blank line of a JSONL file,
+    where every line is an object with 'question' and 'answer' keys and
+    optionally the scheduling keys of an export (nulls are left to their defaults).
+    """
+    for line_number, line in enumerate(text_file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, None, f"Invalid JSON: {e.msg}"
+            continue
+        if not isinstance(row, dict):
+            yield line_number, None, "Each line must be a JSON object"
+            continue
+        yield line_number, {key: value for key, value in row.items() if value is not None}, None
+
+def import_cards(
+    db: Session, deck_id: int, user_id: int, file: BinaryIO, file_format: str, allow_duplicates: bool = False
+):
+    """
+    Logic to bulk-import cards from a CSV or JSONL file into a deck,
+    such as one written by export_cards_response().
+
+    The file is read row by row and inserted with multi-row INSERTs,
+    one transaction per IMPORT_BATCH_SIZE rows, so memory use stays constant
+    however large the file is. Bad rows are skipped and reported, and so are
+    rows whose question is already in the deck or earlier in the file, unless
+    allow_duplicates is set.
+    Hints for imported cards are generated on first request, or ahead of time
+    with `python -m app.manage backfill-hints`.
+    """
+    _get_owned_deck(db, deck_id, user_id)
+    # Release the read transaction; each batch below runs in its own.
+    db.commit()
+
+    iter_rows = {"csv": _iter_csv_rows, "jsonl": _iter_jsonl_rows}[file_format]
+    # newline="" lets the csv module handle line endings inside quoted fields.
+    text_file = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+
+    imported = 0
+    failed = 0
+    errors = []
+    batch = []          # (line, row, fingerprint)
+    batch_lines = {}    # Question hash -> line, for the rows in the batch
+
+    def record_error(line: int, error: str):
+        nonlocal failed
+        failed += 1
+        if len(errors) < IMPORT_MAX_REPORTED_ERRORS:
+            errors.append({"line": line, "error": error})
+
+    def flush_batch():
+        nonlocal imported
+        if batch and not allow_duplicates:
+            # Earlier batches are committed by now, so this also catches repeats across batches.
+            existing = dict(db.execute(duplicate_service.existing_hashes_statement(deck_id, list(batch_lines))).all())
+            for line, _, fingerprint in batch:
+                if fingerprint.question_hash in existing:
+                    record_error(line, f"Duplicate of card {existing[fingerprint.question_hash]}")
+            batch[:] = [entry for entry in batch if entry[2].question_hash not in existing]
+        batch_lines.clear()
+        if batch:
+            # The new ids come back in batch order, to index the cards for search and duplicates.
+            card_ids = db.scalars(
+                insert(card_model.Card).returning(card_model.Card.id, sort_by_parameter_order=True),
+                [row for _, row, _ in batch]
+            ).all()
+            rows = [{"id": card_id, "user_id": user_id, **row} for card_id, (_, row, _) in zip(card_ids, batch)]
+            fingerprints = [(card_id, deck_id, fingerprint) for card_id, (_, _, fingerprint) in zip(card_ids, batch)]
+            for statement, params in (
+                search_service.index_cards_statements(rows) + duplicate_service.index_cards_statements(fingerprints)
+            ):
+                db.execute(statement, params)
+            for statement in card_change_statements(deck_id, user_id):
+                db.execute(statement)
+            db.commit()
+            imported += len(batch)
+            batch.clear()
+
+    try:
+        for line, row, error in iter_rows(text_file):
+            if error:
+                record_error(line, error)
+                continue
+            try:
+                card = card_schema.CardImportRow.model_validate(row)
+            except ValidationError as e:
+                first_error = e.errors()[0]
+                record_error(line, f"{first_error['loc'][0]}: {first_error['msg']}")
+                continue
+            if not card.question.strip() or not card.answer.strip():
+                record_error(line, "Question and answer must not be empty")
+                continue
+
+            fingerprint = duplicate_service.fingerprint(card.question)
+            if not allow_duplicates:
+                if fingerprint.question_hash in batch_lines:
+                    record_error(line, f"Duplicate of line {batch_lines[fingerprint.question_hash]}")
+                    continue
+                batch_lines[fingerprint.question_hash] = line
+            batch.append((
+                line, {**card.model_dump(), "deck_id": deck_id, "question_hash": fingerprint.question_hash}, fingerprint
+            ))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                flush_batch()
+    except (UnicodeDecodeError, csv.Error) as e:
+        # The rest of the file can't be read reliably; keep what was parsed so far.
+        record_error(0, f"Could not read the rest of the file: {e}")
+    finally:
+        # Don't let the wrapper close the underlying upload file.
+        text_file.detach()
+
+    flush_batch()
+    return {"imported": imported, "failed": failed, "errors": errors}
+
+# --- EXPORT Operations ---
+
+EXPORT_BATCH_SIZE = 1000      # Rows fetched from the database, and written to the response, at a time
+# Everything an import needs to recreate a card with its schedule. Ids are left
+# out: an imported card always gets a new id in the deck it's imported into.
+EXPORT_SCHEDULE_FIELDS = ("hint", "interval", "ease_factor", "next_review_date", "last_reviewed_at")
+EXPORT_FIELDS = ("question", "answer") + EXPORT_SCHEDULE_FIELDS
+EXPORT_MEDIA_TYPES = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson"}
+
+def export_statement(deck_id: int):
+    """
+    Builds the select() for a deck's cards in id order, as plain rows of
+    EXPORT_FIELDS rather than Card objects. yield_per makes the database hand
+    them over EXPORT_BATCH_SIZE at a time (a server-side cursor where the
+    driver has one), so only one batch is ever in memory.
+    Shared with the async card service.
+    """
+    columns = [getattr(card_model.Card, field) for field in EXPORT_FIELDS]
+    return select(*columns).where(card_model.Card.deck_id == deck_id).order_by(
+        card_model.Card.id
+    ).execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+def _export_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def encode_export_header(file_format: str) -> str:
+    return ",".join(EXPORT_FIELDS) + "\r\n" if file_format == "csv" else ""
+
+def encode_export_rows(rows, file_format: str) -> str:
+    """
+    One chunk of the export body: a batch of rows as CSV records or JSON lines.
+    NULLs are written as empty CSV cells or JSON nulls, which import reads as "not set".
+    """
+    if file_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(
+            ["" if value is None else _export_value(value) for value in row] for row in rows
+        )
+        return buffer.getvalue()
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, map(_export_value, row))), ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+def export_headers(deck_id: int, file_format: str) -> dict:
+    return {"Content-Disposition": f'attachment; filename="deck-{deck_id}.{file_format}"'}
+
+def _iter_export(deck_id: int, file_format: str) -> Iterator[str]:
+    # The response is streamed after the request's session has been closed, so the
+    # export reads through a session of its own, in a single read transaction.
+    with SessionLocal() as db:
+        yield encode_export_header(file_format)
+        for rows in db.execute(export_statement(deck_id)).partitions():
+            yield encode_export_rows(rows, file_format)
+
+def export_cards_response(db: Session, deck_id: int, user_id: int, file_format: str):
+    """
+    Logic to export all of a deck's cards, with their schedules, as a CSV or
+    JSONL download that import_cards() reads back. The body is streamed batch by
+    batch while it is read from the database, so memory use stays flat however
+    large the deck is.
+    """
+    _get_owned_deck(db, deck_id, user_id)
+    return StreamingResponse(
+        _iter_export(deck_id, file_format),
+        media_type=EXPORT_MEDIA_TYPES[file_format],
+        headers=export_headers(deck_id, file_format),
+    )
+
+# --- DUPLICATES Report ---
+
+def get_duplicates_report(db: Session, deck_id: int, user_id: int):
+    """
+    Logic to find the groups of exact and near-duplicate cards in one of the user's decks.
+    """
+    _get_owned_deck(db, deck_id, user_id)
+    return duplicate_service.report_duplicates(db, deck_id)
 
 # --- UPDATE Operations ---
 
-def update_card(db: Session, card_id: int, card_update: card_schema.CardUpdate):
+def update_card(db: Session, card_id: int, user_id: int, card_update: card_schema.CardUpdate):
     """
     Logic to update an existing card's question or answer.
     """
-    db_card = db.query(card_model.Card).filter(card_model.Card.id == card_id).first()
-    if not db_card:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
-        
+    db_card = _get_owned_card(db, card_id, user_id)
+
     update_data = card_update.model_dump(exclude_unset=True)
+    answer_changed = "answer" in update_data and update_data["answer"] != db_card.answer
+    question_changed = "question" in update_data and update_data["question"] != db_card.question
     for key, value in update_data.items():
         setattr(db_card, key, value)
+
+    # The stored hint was written for the old text, so clear it and regenerate.
+    if question_changed or answer_changed:
+        db_card.hint = None
+        for statement, params in search_service.index_card_statements(db_card, user_id, replace=True):
+            db.execute(statement, params)
+    if question_changed:
+        fingerprint = duplicate_service.fingerprint(db_card.question)
+        db_card.question_hash = fingerprint.question_hash
+        for statement, params in duplicate_service.index_card_statements(
+            card_id, db_card.deck_id, fingerprint, replace=True
+        ):
+            db.execute(statement, params)
+    if update_data:
+        for statement in card_change_statements(db_card.deck_id, user_id, count_changed=False):
+            db.execute(statement)
         
     db.commit()
     db.refresh(db_card)
+
+    # Cached verdicts were judged against the old answer, so drop them.
+    if answer_changed:
+        verification_cache.invalidate_card(card_id)
+    if question_changed or answer_changed:
+        hint_worker.enqueue(card_id)
     return db_card
 
 # --- DELETE Operations ---
 
-def delete_card(db: Session, card_id: int):
+def delete_card(db: Session, card_id: int, user_id: int):
     """
     Logic to delete a card from the database.
     """
-    db_card = db.query(card_model.Card).filter(card_model.Card.id == card_id).first()
-    if not db_card:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Card not found")
-        
+    db_card = _get_owned_card(db, card_id, user_id)
+
+    deck_id = db_card.deck_id
+    for statement, params in (
+        search_service.unindex_card_statements(card_id) + duplicate_service.unindex_card_statements(card_id)
+    ):
+        db.execute(statement, params)
     db.delete(db_card)
+    for statement in card_change_statements(deck_id, user_id):
+        db.execute(statement)
     db.commit()
+    verification_cache.invalidate_card(card_id)
     
     return {"detail": "Card deleted successfully"}
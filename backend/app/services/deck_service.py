@@ -1,39 +1,63 @@
 # 1. Third-party Imports
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 # 2. Local Application Imports
 from ..models import deck_model
 from ..schemas import deck_schema
+from ..core.pagination import paginate
+from . import scheduler
+from .listing_service import bump_deck_lists_statement, deck_list_version_statement, listing_cache
+from . import duplicate_service, search_service
 
 # --- READ Operations ---
 
-def get_all_decks(db: Session):
+def get_all_decks(db: Session, user_id: int, limit: int, cursor: str | None = None):
     """
-    Logic to retrieve all decks from the database.
+    Logic to retrieve one page of the user's decks, in id order.
+    The (user_id, id) index serves each page, so other users' decks are never read.
     """
-    return db.query(deck_model.Deck).all()
+    query = db.query(deck_model.Deck).filter(deck_model.Deck.user_id == user_id)
+    return paginate(query, deck_model.Deck.id, limit, cursor)
 
-def get_deck_by_id(db: Session, deck_id: int):
+def get_all_decks_response(db: Session, user_id: int, limit: int, cursor: str | None, if_none_match: str | None):
     """
-    Logic to retrieve a single deck by its ID.
+    get_all_decks() as a conditional GET: a 304 when the client's copy is current,
+    and a cached body when only this worker's copy is. Either way it costs one
+    primary-key lookup of the user's deck list version.
     """
-    deck = db.query(deck_model.Deck).filter(deck_model.Deck.id == deck_id).first()
+    version = db.scalar(deck_list_version_statement(user_id))
+    etag = listing_cache.etag("decks", user_id, version, limit, cursor)
+    response = listing_cache.cached_response(etag, if_none_match)
+    if response is None:
+        page = deck_schema.DeckPage.model_validate(get_all_decks(db, user_id, limit, cursor))
+        response = listing_cache.store_response(etag, page.model_dump_json())
+    return response
+
+def get_deck_by_id(db: Session, deck_id: int, user_id: int):
+    """
+    Logic to retrieve a single deck by its ID, if the user owns it.
+    """
+    deck = db.query(deck_model.Deck).filter(
+        deck_model.Deck.id == deck_id, deck_model.Deck.user_id == user_id
+    ).first()
     if not deck:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deck not found")
     return deck
 
 # --- CREATE Operations ---
 
-def create_deck(db: Session, deck: deck_schema.DeckCreate):
+def create_deck(db: Session, deck: deck_schema.DeckCreate, user_id: int):
     """
-    Logic to create a new deck in the database.
+    Logic to create a new deck, owned by the given user, in the database.
     """
     # 1. Create a database model instance from the API schema data.
-    db_deck = deck_model.Deck(name=deck.name)
+    db_deck = deck_model.Deck(name=deck.name, user_id=user_id)
     
     # 2. Add the new model instance to the database session (staging area).
     db.add(db_deck)
+    db.execute(bump_deck_lists_statement(user_id))
     
     # 3. Commit the transaction to save it permanently to the database.
     db.commit()
@@ -45,11 +69,11 @@ def create_deck(db: Session, deck: deck_schema.DeckCreate):
 
 # --- UPDATE Operations ---
 
-def update_deck(db: Session, deck_id: int, deck_update: deck_schema.DeckUpdate):
+def update_deck(db: Session, deck_id: int, user_id: int, deck_update: deck_schema.DeckUpdate):
     """
     Logic to update an existing deck in the database.
     """
-    db_deck = get_deck_by_id(db=db, deck_id=deck_id) # Reuse our get_deck_by_id function
+    db_deck = get_deck_by_id(db=db, deck_id=deck_id, user_id=user_id) # Reuse our get_deck_by_id function
     
     # Get the data from the Pydantic schema, excluding any fields that were not sent.
     update_data = deck_update.model_dump(exclude_unset=True)
@@ -57,22 +81,61 @@ def update_deck(db: Session, deck_id: int, deck_update: deck_schema.DeckUpdate):
     # Loop through the provided data and update the database model.
     for key, value in update_data.items():
         setattr(db_deck, key, value)
+    if update_data:
+        db.execute(bump_deck_lists_statement(user_id))
         
     db.commit()
     db.refresh(db_deck)
     return db_deck
 
+def reschedule_deck(db: Session, deck_id: int, user_id: int):
+    """
+    Logic to recompute the schedule of every card in a deck under the deck's scheduler settings.
+    """
+    get_deck_by_id(db=db, deck_id=deck_id, user_id=user_id) # 404 if the user has no such deck
+    return {"rescheduled": scheduler.reschedule_cards(db=db, deck_id=deck_id)}
+
+def reschedule_user_decks(db: Session, user_id: int):
+    """
+    Logic to recompute the schedule of every card in all of the user's decks, each under its deck's settings.
+    """
+    return {"rescheduled": scheduler.reschedule_cards(db=db, user_id=user_id)}
+
 # --- DELETE Operations ---
 
-def delete_deck(db: Session, deck_id: int):
+def delete_deck(db: Session, deck_id: int, user_id: int):
     """
     Logic to delete a deck from the database.
     """
-    db_deck = get_deck_by_id(db=db, deck_id=deck_id) # Reuse our get_deck_by_id function
-        
+    db_deck = get_deck_by_id(db=db, deck_id=deck_id, user_id=user_id) # Reuse our get_deck_by_id function
+
+    # Drop the cards from the search index while they can still be found by deck.
+    for statement, params in (
+        search_service.unindex_deck_statements(deck_id) + duplicate_service.unindex_deck_statements(deck_id)
+    ):
+        db.execute(statement, params)
     db.delete(db_deck)
+    db.execute(bump_deck_lists_statement(user_id))
     db.commit()
     
     # For a DELETE operation, we don't return the object. 
     # We can return a success message or nothing.
     return {"detail": "Deck deleted successfully"}
+
+# --- Ownership ---
+
+def claim_unowned_decks(db: Session, user_id: int) -> int:
+    """
+    Gives every deck without an owner (decks created before decks had owners) to
+    the user, and returns how many it claimed. The search index files cards under
+    their deck's owner, so it is rebuilt afterwards.
+    """
+    claimed = db.execute(
+        update(deck_model.Deck).where(deck_model.Deck.user_id.is_(None)).values(user_id=user_id)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if claimed:
+        db.execute(bump_deck_lists_statement(user_id))
+        db.commit()
+        search_service.rebuild_search_index(db=db)
+    return claimed
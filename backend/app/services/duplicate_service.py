@@ -0,0 +1,342 @@
+# 1. Standard Library Imports
+import hashlib
+import re
+import zlib
+from typing import NamedTuple
+
+# 2. Third-party Imports
+import numpy as np
+from sqlalchemy import and_, delete, func, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+# 3. Local Application Imports
+from ..models import card_model
+from ..models.card_lsh_model import CardLshBucket
+
+# --- Fingerprints ---
+# Questions are compared after normalize_question(), which ignores case,
+# punctuation and spacing. Two cards in a deck are exact duplicates when their
+# normalized questions are equal (found through Card.question_hash), and
+# near-duplicates when the Jaccard similarity of their questions' character
+# shingles (every SHINGLE_SIZE-character substring) is at least
+# NEAR_DUPLICATE_THRESHOLD, which tolerates typos, small edits and reworded endings.
+
+SHINGLE_SIZE = 3
+NEAR_DUPLICATE_THRESHOLD = 0.8
+SIMILAR_CARDS_LIMIT = 10        # Near-duplicates reported for a new card
+MAX_CANDIDATES = 200            # Candidates checked for a new card, so a crowded bucket can't slow creation down
+
+# MinHash/LSH: every question gets LSH_BANDS * LSH_ROWS MinHash values, and each
+# band of LSH_ROWS values is hashed to one bucket (a CardLshBucket row). Two
+# questions with similarity s share a bucket in at least one band with
+# probability 1 - (1 - s**LSH_ROWS) ** LSH_BANDS: 99.8% at s = 0.8, 61% at 0.6
+# and 8% at 0.4. Sharing a bucket only makes two cards candidates; their
+# similarity is then computed exactly, so a false candidate costs time, never a
+# wrong answer. Unrelated questions still share common shingles (the "what is
+# the" of most cards), so bands are kept long enough that they rarely collide.
+LSH_BANDS = 20
+LSH_ROWS = 6
+
+_PRIME = (1 << 31) - 1
+
+def _constants(label: str, count: int, modulus: int) -> np.ndarray:
+    # Derived from a hash rather than a random generator, so fingerprints stored
+    # in the database stay valid across processes, restarts and NumPy versions.
+    return np.array([
+        int.from_bytes(hashlib.blake2b(f"{label}{i}".encode(), digest_size=8).digest(), "big") % (modulus - 1) + 1
+        for i in range(count)
+    ], dtype=np.uint64)
+
+# MinHash value i of a shingle id x is (a_i * x + b_i) mod _PRIME; every product fits in 64 bits.
+_HASH_A = _constants("a", LSH_BANDS * LSH_ROWS, _PRIME)
+_HASH_B = _constants("b", LSH_BANDS * LSH_ROWS, _PRIME)
+# A band's values are combined into its bucket with a dot product that wraps around at 2**64.
+_BAND_WEIGHTS = _constants("w", LSH_ROWS, 1 << 63)
+
+class Fingerprint(NamedTuple):
+    question_hash: int      # Signed 64-bit, to fit a BIGINT column
+    shingles: frozenset
+    buckets: list           # One bucket per band
+
+def normalize_question(question: str) -> str:
+    return " ".join(re.findall(r"\w+", question.casefold()))
+
+def _shingles(normalized: str) -> frozenset:
+    if len(normalized) <= SHINGLE_SIZE:
+        return frozenset([normalized])
+    return frozenset(normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1))
+
+def shingles(question: str) -> frozenset:
+    return _shingles(normalize_question(question))
+
+def fingerprint(question: str) -> Fingerprint:
+    normalized = normalize_question(question)
+    question_hash = int.from_bytes(
+        hashlib.blake2b(normalized.encode(), digest_size=8).digest(), "big", signed=True
+    )
+    question_shingles = _shingles(normalized)
+    ids = np.fromiter(
+        (zlib.crc32(shingle.encode()) % _PRIME for shingle in question_shingles),
+        dtype=np.uint64, count=len(question_shingles),
+    )
+    signature = ((_HASH_A[:, None] * ids[None, :] + _HASH_B[:, None]) % _PRIME).min(axis=1)
+    buckets = (signature.reshape(LSH_BANDS, LSH_ROWS) * _BAND_WEIGHTS).sum(axis=1).view(np.int64)
+    return Fingerprint(question_hash, question_shingles, buckets.tolist())
+
+def similarity(a: frozenset, b: frozenset) -> float:
+    return len(a & b) / len(a | b)
+
+# --- Index Maintenance ---
+# Card writes set Card.question_hash themselves and execute the statements below
+# in the same transaction, like the search index statements in search_service.
+
+# Inserts go through the table rather than the mapped class: the rows are plain
+# dicts, and the ORM's bulk-insert bookkeeping cost more than the hashing did.
+_BUCKETS_INSERT = insert(CardLshBucket.__table__)
+
+def _bucket_rows(card_id: int, deck_id: int, card_fingerprint: Fingerprint) -> list:
+    return [
+        {"deck_id": deck_id, "band": band, "bucket": bucket, "card_id": card_id}
+        for band, bucket in enumerate(card_fingerprint.buckets)
+    ]
+
+def index_card_statements(card_id: int, deck_id: int, card_fingerprint: Fingerprint, replace: bool = False) -> list:
+    """
+    (statement, params) pairs that add a new card to the near-duplicate index,
+    or re-index an edited one with replace=True.
+    """
+    statements = unindex_card_statements(card_id) if replace else []
+    statements.append((_BUCKETS_INSERT, _bucket_rows(card_id, deck_id, card_fingerprint)))
+    return statements
+
+def index_cards_statements(cards: list) -> list:
+    """
+    The same for a batch of new cards, given as (card id, deck id, fingerprint) tuples.
+    """
+    rows = [row for card in cards for row in _bucket_rows(*card)]
+    return [(_BUCKETS_INSERT, rows)] if rows else []
+
+def unindex_card_statements(card_id: int) -> list:
+    return [(delete(CardLshBucket).where(CardLshBucket.card_id == card_id), None)]
+
+def unindex_deck_statements(deck_id: int) -> list:
+    return [(delete(CardLshBucket).where(CardLshBucket.deck_id == deck_id), None)]
+
+FINGERPRINT_BATCH_SIZE = 1000
+
+def unfingerprinted_cards_statement(deck_id: int | None):
+    # Served by the (deck_id, question_hash) index when a deck is given.
+    statement = select(card_model.Card.id, card_model.Card.deck_id, card_model.Card.question).where(
+        card_model.Card.question_hash.is_(None)
+    )
+    if deck_id is not None:
+        statement = statement.where(card_model.Card.deck_id == deck_id)
+    return statement.order_by(card_model.Card.id).limit(FINGERPRINT_BATCH_SIZE)
+
+def unfingerprinted_ids_statement(deck_id: int):
+    # Also served by the (deck_id, question_hash) index.
+    return select(card_model.Card.id).where(
+        card_model.Card.deck_id == deck_id, card_model.Card.question_hash.is_(None)
+    ).order_by(card_model.Card.id)
+
+def fingerprint_statements(rows) -> list:
+    """
+    The writes that fingerprint a batch of (id, deck_id, question) rows:
+    their question hashes, by primary key, and their bucket rows.
+    """
+    fingerprints = [(row.id, row.deck_id, fingerprint(row.question)) for row in rows]
+    hashes = [{"id": card_id, "question_hash": fp.question_hash} for card_id, _, fp in fingerprints]
+    return [(update(card_model.Card), hashes)] + index_cards_statements(fingerprints)
+
+def fingerprint_cards(db: Session, deck_id: int | None = None) -> int:
+    """
+    Fingerprints the cards (of one deck, or all) that aren't in the duplicate
+    index yet, such as cards created before it existed, and returns how many.
+    One transaction per FINGERPRINT_BATCH_SIZE cards.
+    """
+    fingerprinted = 0
+    while rows := db.execute(unfingerprinted_cards_statement(deck_id)).all():
+        for statement, params in fingerprint_statements(rows):
+            db.execute(statement, params)
+        db.commit()
+        fingerprinted += len(rows)
+    return fingerprinted
+
+def rebuild_duplicate_index(db: Session) -> int:
+    """
+    Recomputes every card's fingerprint, e.g. after changing the normalization
+    or the LSH parameters, and returns how many cards it covers.
+    """
+    db.execute(delete(CardLshBucket))
+    db.execute(update(card_model.Card).values(question_hash=None))
+    db.commit()
+    return fingerprint_cards(db)
+
+# --- Checks ---
+
+def exact_duplicate_statement(deck_id: int, question_hash: int):
+    return select(func.min(card_model.Card.id)).where(
+        card_model.Card.deck_id == deck_id, card_model.Card.question_hash == question_hash
+    )
+
+def existing_hashes_statement(deck_id: int, question_hashes: list):
+    """(question_hash, first card id) for the hashes that already exist in the deck."""
+    return select(card_model.Card.question_hash, func.min(card_model.Card.id)).where(
+        card_model.Card.deck_id == deck_id, card_model.Card.question_hash.in_(question_hashes)
+    ).group_by(card_model.Card.question_hash)
+
+def candidates_statement(deck_id: int, card_fingerprint: Fingerprint):
+    """
+    The (id, question) of cards in the deck that share a bucket with the
+    fingerprint in at least one band: one primary-key lookup per band.
+    """
+    # Each term repeats the deck, so each is a primary-key seek of its own (rather
+    # than one scan of the deck's rows filtered by the whole OR).
+    candidate_ids = select(CardLshBucket.card_id).where(or_(*(
+        and_(CardLshBucket.deck_id == deck_id, CardLshBucket.band == band, CardLshBucket.bucket == bucket)
+        for band, bucket in enumerate(card_fingerprint.buckets)
+    )))
+    return select(card_model.Card.id, card_model.Card.question).where(
+        card_model.Card.id.in_(candidate_ids)
+    ).limit(MAX_CANDIDATES)
+
+def similar_card_ids(card_fingerprint: Fingerprint, candidates) -> list:
+    """
+    The ids of the candidate (id, question) rows that are near-duplicates of the
+    fingerprinted question, most similar first.
+    """
+    scored = []
+    for row in candidates:
+        score = similarity(card_fingerprint.shingles, shingles(row.question))
+        if score >= NEAR_DUPLICATE_THRESHOLD:
+            scored.append((-score, row.id))
+    return [card_id for _, card_id in sorted(scored)[:SIMILAR_CARDS_LIMIT]]
+
+def check_question(db: Session, deck_id: int, card_fingerprint: Fingerprint) -> tuple:
+    """
+    Returns (id of an exact duplicate or None, ids of near-duplicates) for a
+    question about to be added to a deck.
+    """
+    exact_id = db.scalar(exact_duplicate_statement(deck_id, card_fingerprint.question_hash))
+    candidates = db.execute(candidates_statement(deck_id, card_fingerprint)).all()
+    return exact_id, similar_card_ids(card_fingerprint, candidates)
+
+# --- Deck Report ---
+# Both halves read only the duplicate index: exact duplicates are a GROUP BY over
+# the (deck_id, question_hash) index, and near-duplicate candidates are the cards
+# that share an LSH bucket, so the work grows with the number of cards (times
+# LSH_BANDS) rather than with the number of pairs of cards.
+
+PAIRWISE_BUCKET_MAX = 16    # Larger buckets compare each card with the bucket's first card only
+QUESTIONS_BATCH_SIZE = 1000
+
+def exact_groups_statement(deck_id: int):
+    duplicated = select(card_model.Card.question_hash).where(
+        card_model.Card.deck_id == deck_id, card_model.Card.question_hash.is_not(None)
+    ).group_by(card_model.Card.question_hash).having(func.count() > 1)
+    return select(card_model.Card.question_hash, card_model.Card.id).where(
+        card_model.Card.deck_id == deck_id, card_model.Card.question_hash.in_(duplicated)
+    ).order_by(card_model.Card.question_hash, card_model.Card.id)
+
+def shared_buckets_statement(deck_id: int):
+    """(band, bucket, card_id) for every bucket of the deck that holds more than one card."""
+    shared = select(CardLshBucket.band, CardLshBucket.bucket).where(
+        CardLshBucket.deck_id == deck_id
+    ).group_by(CardLshBucket.band, CardLshBucket.bucket).having(func.count() > 1).subquery()
+    return select(CardLshBucket.band, CardLshBucket.bucket, CardLshBucket.card_id).join(
+        shared, and_(CardLshBucket.band == shared.c.band, CardLshBucket.bucket == shared.c.bucket)
+    ).where(CardLshBucket.deck_id == deck_id).order_by(
+        CardLshBucket.band, CardLshBucket.bucket, CardLshBucket.card_id
+    )
+
+def questions_statement(card_ids: list):
+    return select(card_model.Card.id, card_model.Card.question).where(card_model.Card.id.in_(card_ids))
+
+def build_exact_groups(rows) -> list:
+    """Groups (question_hash, id) rows, ordered by hash, into lists of card ids."""
+    groups = {}
+    for row in rows:
+        groups.setdefault(row.question_hash, []).append(row.id)
+    return sorted(groups.values())
+
+def candidate_pairs(bucket_rows, skip: set) -> set:
+    """
+    Pairs of card ids that share a bucket, from (band, bucket, card_id) rows in
+    bucket order. Cards in `skip` (the later copies of exact duplicates) are
+    left out, since their first copy stands in for them.
+    """
+    pairs = set()
+
+    def add_bucket(members):
+        if len(members) <= PAIRWISE_BUCKET_MAX:
+            pairs.update((a, b) for i, a in enumerate(members) for b in members[i + 1:])
+        else:
+            pairs.update((members[0], other) for other in members[1:])
+
+    current, members = None, []
+    for row in bucket_rows:
+        if row.card_id in skip:
+            continue
+        if (row.band, row.bucket) != current:
+            add_bucket(members)
+            current, members = (row.band, row.bucket), []
+        members.append(row.card_id)
+    add_bucket(members)
+    return pairs
+
+def build_near_groups(pairs: set, questions: dict) -> list:
+    """
+    Checks each candidate pair's similarity and joins the pairs that pass into
+    groups (connected components), as sorted lists of card ids.
+    """
+    shingle_sets = {}
+    parent = {}
+
+    def shingles_of(card_id):
+        if card_id not in shingle_sets:
+            shingle_sets[card_id] = shingles(questions[card_id])
+        return shingle_sets[card_id]
+
+    def root(card_id):
+        while parent[card_id] != card_id:
+            parent[card_id] = parent[parent[card_id]]
+            card_id = parent[card_id]
+        return card_id
+
+    for a, b in pairs:
+        if a not in questions or b not in questions:
+            continue  # Deleted since the buckets were read
+        a_shingles, b_shingles = shingles_of(a), shingles_of(b)
+        # Similarity can't exceed the ratio of the two set sizes, which is cheap to check first.
+        if min(len(a_shingles), len(b_shingles)) < NEAR_DUPLICATE_THRESHOLD * max(len(a_shingles), len(b_shingles)):
+            continue
+        if similarity(a_shingles, b_shingles) >= NEAR_DUPLICATE_THRESHOLD:
+            root_a, root_b = root(parent.setdefault(a, a)), root(parent.setdefault(b, b))
+            parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    groups = {}
+    for card_id in parent:
+        groups.setdefault(root(card_id), []).append(card_id)
+    return sorted(sorted(group) for group in groups.values())
+
+def report_duplicates(db: Session, deck_id: int) -> dict:
+    """
+    Logic to find the groups of exact and near-duplicate cards in a deck.
+    Read-only: cards that aren't fingerprinted yet (created before duplicate
+    detection existed) can't be grouped and are listed instead, until
+    `python -m app.manage rebuild-duplicate-index` fingerprints them.
+    """
+    exact = build_exact_groups(db.execute(exact_groups_statement(deck_id)).all())
+    later_copies = {card_id for group in exact for card_id in group[1:]}
+    pairs = candidate_pairs(db.execute(shared_buckets_statement(deck_id)), later_copies)
+
+    card_ids = sorted({card_id for pair in pairs for card_id in pair})
+    questions = {}
+    for start in range(0, len(card_ids), QUESTIONS_BATCH_SIZE):
+        questions.update(db.execute(questions_statement(card_ids[start:start + QUESTIONS_BATCH_SIZE])).all())
+    near = build_near_groups(pairs, questions)
+    return {
+        "exact": [{"card_ids": group} for group in exact],
+        "near": [{"card_ids": group} for group in near],
+        "unfingerprinted": db.scalars(unfingerprinted_ids_statement(deck_id)).all(),
+    }
@@ -0,0 +1,201 @@
+# 1. Standard Library Imports
+from datetime import date, datetime, time, timedelta
+
+# 2. Third-party Imports
+from sqlalchemy import Date, func, select, update
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import FunctionElement
+from fastapi import HTTPException, status
+
+# 3. Local Application Imports
+from ..models import card_model, deck_model, user_model
+from ..core.cache import TTLCache
+from ..core.config import settings
+
+# --- Day Bucketing ---
+
+class due_day(FunctionElement):
+    """
+    The calendar day (UTC) of a DateTime column, as a SQL expression.
+    """
+    type = Date()
+    inherit_cache = True
+
+@compiles(due_day)
+def _compile_due_day(element, compiler, **kw):
+    return f"CAST({compiler.process(element.clauses, **kw)} AS DATE)"
+
+@compiles(due_day, "sqlite")
+def _compile_due_day_sqlite(element, compiler, **kw):
+    # SQLite has no DATE type; CAST would turn the stored text into a number.
+    return f"DATE({compiler.process(element.clauses, **kw)})"
+
+# --- Cache ---
+
+class ForecastCache:
+    """
+    Caches computed forecasts under a version read from the database (see
+    forecast_version_statement), so every worker, and the manage commands, agree
+    on when a forecast is stale: any write that moves a due date bumps a counter
+    in the same transaction, which moves the key, whatever `days` the old entries
+    were computed for. Unreachable entries age out of the LRU.
+    Read the version before querying, so a write that lands mid-query isn't cached
+    under the new version.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._cache = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    @staticmethod
+    def key(user_id: int, deck_id: int | None, days: int, today: date, version):
+        return (user_id, deck_id, days, today, version)
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def set(self, key, forecast):
+        self._cache.set(key, forecast)
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+# Create a single instance that the rest of our app can import
+forecast_cache = ForecastCache(
+    max_size=settings.FORECAST_CACHE_SIZE,
+    ttl_seconds=settings.FORECAST_CACHE_TTL_SECONDS,
+)
+
+# --- Forecast Versions ---
+# A deck's forecast changes when cards are added or removed, which bumps
+# decks.cards_version (see listing_service), or when due dates move, which bumps
+# decks.schedule_version: reviews and rescheduling. The all-decks forecast also
+# changes when the user's set of decks does, which bumps users.decks_version.
+# Within one decks_version the deck counters only grow, so their sum is a version
+# for all of the user's decks.
+
+def forecast_version_statement(user_id: int, deck_id: int | None):
+    """
+    The version to key a forecast on. For one deck it is also the ownership check:
+    None for a deck that doesn't exist or isn't the user's.
+    """
+    decks = deck_model.Deck
+    if deck_id is not None:
+        return select(decks.cards_version, decks.schedule_version).where(
+            decks.id == deck_id, decks.user_id == user_id
+        )
+    deck_versions = select(
+        func.coalesce(func.sum(decks.cards_version + decks.schedule_version), 0)
+    ).where(decks.user_id == user_id).scalar_subquery()
+    return select(user_model.User.decks_version, deck_versions).where(user_model.User.id == user_id)
+
+def bump_schedule_statement(deck_ids=None, user_id: int | None = None):
+    """
+    Bumps schedule_version on the given decks, on all of a user's decks, or on
+    every deck if neither is given. Run it in the same transaction as the write.
+    """
+    statement = update(deck_model.Deck).values(schedule_version=deck_model.Deck.schedule_version + 1)
+    if deck_ids is not None:
+        statement = statement.where(deck_model.Deck.id.in_(sorted(deck_ids)))
+    if user_id is not None:
+        statement = statement.where(deck_model.Deck.user_id == user_id)
+    return statement.execution_options(synchronize_session=False)
+
+# --- Forecast Queries ---
+
+DEFAULT_FORECAST_DAYS = 7
+MAX_FORECAST_DAYS = 365
+
+def forecast_statement(user_id: int, deck_id: int | None, days: int, today: date):
+    """
+    One GROUP BY over the cards table: how many cards fall due on each day before
+    the end of the window, per deck, for one of the user's decks or all of them.
+    Overdue cards are included and folded into today by build_forecast().
+    The user's decks come from the (user_id, id) index on decks, and each deck's
+    cards from a range scan of the (deck_id, next_review_date) index, so other
+    users' cards are never read.
+    """
+    window_end = datetime.combine(today + timedelta(days=days), time.min)
+    day = due_day(card_model.Card.next_review_date)
+    owned_decks = select(deck_model.Deck.id).where(deck_model.Deck.user_id == user_id)
+    if deck_id is not None:
+        owned_decks = owned_decks.where(deck_model.Deck.id == deck_id)
+    statement = select(
+        card_model.Card.deck_id, day.label("day"), func.count().label("due")
+    ).where(
+        card_model.Card.deck_id.in_(owned_decks),
+        card_model.Card.next_review_date < window_end,
+    )
+    return statement.group_by(card_model.Card.deck_id, day)
+
+def build_forecast(rows, days: int, today: date) -> dict:
+    """
+    Turns (deck_id, day, due) rows into {deck_id: [{"date", "due"}, ...]} with one entry per day.
+    """
+    counts = {}
+    for deck_id, day, due in rows:
+        if isinstance(day, str):
+            day = date.fromisoformat(day)
+        offset = max((day - today).days, 0)  # Overdue cards are due today
+        deck_counts = counts.setdefault(deck_id, [0] * days)
+        deck_counts[offset] += due
+    return {
+        deck_id: [
+            {"date": today + timedelta(days=offset), "due": due}
+            for offset, due in enumerate(deck_counts)
+        ]
+        for deck_id, deck_counts in counts.items()
+    }
+
+def empty_forecast(days: int, today: date) -> list:
+    return [{"date": today + timedelta(days=offset), "due": 0} for offset in range(days)]
+
+def combine_forecasts(forecasts: dict, days: int, today: date) -> dict:
+    """
+    Shapes the all-decks response: the day-by-day totals plus each deck's forecast.
+    """
+    totals = empty_forecast(days, today)
+    for deck_days in forecasts.values():
+        for total, deck_day in zip(totals, deck_days):
+            total["due"] += deck_day["due"]
+    return {
+        "days": totals,
+        "decks": [{"deck_id": deck_id, "days": deck_days} for deck_id, deck_days in sorted(forecasts.items())],
+    }
+
+def deck_not_found():
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Deck not found")
+
+def get_deck_forecast(db: Session, deck_id: int, user_id: int, days: int):
+    """
+    Logic to count a deck's due cards for each of the next `days` days (today first).
+    """
+    today = datetime.utcnow().date()
+    version = db.execute(forecast_version_statement(user_id, deck_id)).first()
+    if version is None:
+        raise deck_not_found()
+    key = forecast_cache.key(user_id, deck_id, days, today, tuple(version))
+    cached = forecast_cache.get(key)
+    if cached is not None:
+        return cached
+
+    forecasts = build_forecast(db.execute(forecast_statement(user_id, deck_id, days, today)), days, today)
+    forecast = {"deck_id": deck_id, "days": forecasts.get(deck_id, empty_forecast(days, today))}
+    forecast_cache.set(key, forecast)
+    return forecast
+
+def get_all_decks_forecast(db: Session, user_id: int, days: int):
+    """
+    Logic to forecast every one of the user's decks at once with a single query, for the dashboard.
+    """
+    today = datetime.utcnow().date()
+    version = db.execute(forecast_version_statement(user_id, None)).first()
+    key = forecast_cache.key(user_id, None, days, today, tuple(version or ()))
+    cached = forecast_cache.get(key)
+    if cached is not None:
+        return cached
+
+    forecasts = build_forecast(db.execute(forecast_statement(user_id, None, days, today)), days, today)
+    forecast = combine_forecasts(forecasts, days, today)
+    forecast_cache.set(key, forecast)
+    return forecast
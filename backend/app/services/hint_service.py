@@ -0,0 +1,188 @@
+# 1. Standard Library Imports
+import asyncio
+
+# 2. Third-party Imports
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+# 3. Local Application Imports
+from ..models import card_model
+from ..core.ai_client import ai_client, AIClientError
+from ..core.config import settings
+from ..core.database import SessionLocal
+
+# --- Hint Generation ---
+
+async def generate_hint(question: str, answer: str) -> str:
+    """
+    Asks the Gemini API for a short hint. Raises AIClientError on failure.
+    """
+    prompt = f"""
+    The question is: '{question}'.
+    The answer is: '{answer}'.
+    Generate a single, short, one-sentence hint for the user that guides them
+    towards the answer without giving it away completely.
+    """
+    response_text = await ai_client.generate_content(prompt, operation="hint")
+    return response_text.strip()
+
+def _store_hint_statement(card_id: int, question: str, answer: str, hint: str):
+    # Only matches if the card still has the question and answer the hint was generated from.
+    return update(card_model.Card).where(
+        card_model.Card.id == card_id,
+        card_model.Card.question == question,
+        card_model.Card.answer == answer
+    ).values(hint=hint)
+
+def store_hint(db: Session, card_id: int, question: str, answer: str, hint: str) -> bool:
+    """
+    Saves a hint, but only if the card still has the question and answer the
+    hint was generated from. An edit made while the AI was thinking wins.
+    Returns True if the hint was stored. The caller commits.
+    """
+    return db.execute(_store_hint_statement(card_id, question, answer, hint)).rowcount == 1
+
+async def store_hint_async(db: AsyncSession, card_id: int, question: str, answer: str, hint: str) -> bool:
+    """
+    The AsyncSession version of store_hint().
+    """
+    return (await db.execute(_store_hint_statement(card_id, question, answer, hint))).rowcount == 1
+
+def _load_card_without_hint(card_id: int):
+    db = SessionLocal()
+    try:
+        card = db.query(card_model.Card).filter(card_model.Card.id == card_id).first()
+        if not card or card.hint:
+            return None
+        return card.question, card.answer
+    finally:
+        db.close()
+
+def _save_hint(card_id: int, question: str, answer: str, hint: str):
+    db = SessionLocal()
+    try:
+        store_hint(db, card_id, question, answer, hint)
+        db.commit()
+    finally:
+        db.close()
+
+async def generate_and_store_hint(card_id: int):
+    """
+    Generates and persists the hint for one card, using its own sessions.
+    The blocking database calls run in a thread: on the event loop, a write
+    waiting on SQLite's busy_timeout would stall every other request, including
+    the async-session writer holding the lock.
+    """
+    card = await asyncio.to_thread(_load_card_without_hint, card_id)
+    if card is None:
+        return
+    question, answer = card
+
+    hint = await generate_hint(question, answer)
+    await asyncio.to_thread(_save_hint, card_id, question, answer, hint)
+
+# --- Background Worker ---
+
+class HintWorker:
+    """
+    An in-process background queue that precomputes hints.
+
+    card_service enqueues card ids from the threadpool when cards are created or
+    edited; a few worker tasks on the event loop generate and store the hints.
+    Cards that are missed (the worker was not running, no API key is set, or the
+    queue already held `max_queued` cards) are picked up by the `backfill-hints`
+    command or generated on first request.
+    """
+
+    def __init__(self, concurrency: int = 2, max_queued: int = 1000):
+        self.concurrency = concurrency
+        self.max_queued = max_queued
+        self._loop = None
+        self._queue = None
+        self._tasks = []
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queued)
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._loop = None
+
+    def enqueue(self, card_id: int):
+        """
+        Schedules hint generation for a card. Safe to call from any thread;
+        does nothing if the worker isn't running or the AI is disabled.
+        """
+        if self._loop is None or self._loop.is_closed() or not ai_client.enabled:
+            return
+        self._loop.call_soon_threadsafe(self._put, card_id)
+
+    def _put(self, card_id: int):
+        try:
+            self._queue.put_nowait(card_id)
+        except asyncio.QueueFull:
+            pass  # Left for `backfill-hints`; holding every id would grow without bound while the AI is slow
+
+    async def _run(self):
+        while True:
+            card_id = await self._queue.get()
+            try:
+                await generate_and_store_hint(card_id)
+            except AIClientError as e:
+                print(f"Background hint generation failed for card {card_id}: {e}")
+            except Exception as e:
+                print(f"Unexpected error while generating hint for card {card_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+# Create a single instance that the rest of our app can import
+hint_worker = HintWorker(max_queued=settings.HINT_QUEUE_MAX_SIZE)
+
+# --- Backfill ---
+
+async def backfill_hints(deck_id: int | None = None, batch_size: int = 50) -> int:
+    """
+    Generates hints for every card that doesn't have one yet (optionally only in one deck).
+    Cards are read in id order, one batch at a time, and each batch is generated
+    concurrently (bounded by the AI client's concurrency cap).
+    Returns the number of hints stored.
+    """
+    db = SessionLocal()
+    stored = 0
+    last_id = 0
+    try:
+        while True:
+            query = db.query(
+                card_model.Card.id, card_model.Card.question, card_model.Card.answer
+            ).filter(
+                card_model.Card.hint.is_(None),
+                card_model.Card.id > last_id
+            )
+            if deck_id is not None:
+                query = query.filter(card_model.Card.deck_id == deck_id)
+            rows = query.order_by(card_model.Card.id).limit(batch_size).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            db.commit()
+
+            results = await asyncio.gather(
+                *(generate_hint(row.question, row.answer) for row in rows),
+                return_exceptions=True
+            )
+            for row, result in zip(rows, results):
+                if isinstance(result, Exception):
+                    print(f"Hint generation failed for card {row.id}: {result}")
+                    continue
+                if store_hint(db, row.id, row.question, row.answer, result):
+                    stored += 1
+            db.commit()
+    finally:
+        db.close()
+    return stored
@@ -0,0 +1,117 @@
+# 1. Standard Library Imports
+import hashlib
+
+# 2. Third-party Imports
+from sqlalchemy import select, update
+from fastapi import Response, status
+
+# 3. Local Application Imports
+from ..models import deck_model, user_model
+from ..core.cache import TTLCache
+from ..core.config import settings
+
+# --- List Versions ---
+# Two counters stored in the database, so every worker sees the same values:
+#   users.decks_version   bumped whenever the user's deck list would render differently
+#                         (a deck is created, renamed or deleted, or its card count changes)
+#   decks.cards_version   bumped whenever the deck's card list would render differently
+#                         (a card is created, edited, imported or deleted)
+# Bump them with the statements below in the same transaction as the write.
+# Reviews, hints and rescheduling change fields neither list shows, so they don't bump
+# either (reviews and rescheduling bump decks.schedule_version, see forecast_service).
+
+def deck_list_version_statement(user_id: int):
+    return select(user_model.User.decks_version).where(user_model.User.id == user_id)
+
+def card_list_version_statement(deck_id: int, user_id: int):
+    # Also the ownership check: None for a deck that doesn't exist or isn't the user's.
+    return select(deck_model.Deck.cards_version).where(
+        deck_model.Deck.id == deck_id, deck_model.Deck.user_id == user_id
+    )
+
+def bump_deck_lists_statement(user_id: int):
+    return update(user_model.User).where(user_model.User.id == user_id).values(
+        decks_version=user_model.User.decks_version + 1
+    ).execution_options(synchronize_session=False)
+
+def bump_card_list_statement(deck_id: int):
+    return update(deck_model.Deck).where(deck_model.Deck.id == deck_id).values(
+        cards_version=deck_model.Deck.cards_version + 1
+    ).execution_options(synchronize_session=False)
+
+def card_change_statements(deck_id: int, user_id: int, count_changed: bool = True) -> list:
+    """
+    The bumps for a write to a deck's cards: its card list, plus its owner's deck
+    list when cards were added or removed (deck lists show card counts).
+    """
+    statements = [bump_card_list_statement(deck_id)]
+    if count_changed:
+        statements.append(bump_deck_lists_statement(user_id))
+    return statements
+
+# --- Conditional Responses ---
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    The If-None-Match comparison: weak, and any of a comma-separated list (or "*") matches.
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+class ListingCache:
+    """
+    Serves list endpoints as conditional GETs.
+
+    The ETag is a hash of the list's version and the request parameters, so it
+    changes exactly when the rendered page can. A matching If-None-Match gets a
+    bodiless 304. Otherwise the rendered JSON body is kept in an in-process LRU
+    keyed by the ETag, so a client without a cached copy still skips the list
+    query and serialization while nothing has changed. Stale bodies are never
+    served, because a write moves the version and with it the key; they just
+    age out.
+
+    Read the version before the list: a write that lands in between can then
+    only make a cached body newer than its version, never older.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self._bodies = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+
+    @staticmethod
+    def etag(kind: str, scope_id: int, version: int, *params) -> str:
+        digest = hashlib.sha1(repr((kind, scope_id, version) + params).encode("utf-8")).hexdigest()
+        return f'"{digest[:20]}"'
+
+    @staticmethod
+    def _headers(etag: str) -> dict:
+        # "no-cache" lets the browser keep the page but makes it revalidate every time.
+        return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    def cached_response(self, etag: str, if_none_match: str | None) -> Response | None:
+        """
+        A 304 or a cached 200 for this ETag, or None if the page has to be rendered.
+        """
+        if etag_matches(if_none_match, etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self._headers(etag))
+        body = self._bodies.get(etag)
+        if body is None:
+            return None
+        return Response(content=body, media_type="application/json", headers=self._headers(etag))
+
+    def store_response(self, etag: str, body: str | bytes) -> Response:
+        """
+        Caches a freshly rendered page and returns it.
+        """
+        self._bodies.set(etag, body)
+        return Response(content=body, media_type="application/json", headers=self._headers(etag))
+
+    def stats(self) -> dict:
+        return self._bodies.stats()
+
+# Create a single instance that the rest of our app can import
+listing_cache = ListingCache(
+    max_size=settings.LISTING_CACHE_SIZE,
+    ttl_seconds=settings.LISTING_CACHE_TTL_SECONDS,
+)
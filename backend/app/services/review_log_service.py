@@ -0,0 +1,234 @@
+# 1. Standard Library Imports
+import asyncio
+import atexit
+import glob
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+
+# 2. Third-party Imports
+from sqlalchemy import insert
+
+# 3. Local Application Imports
+from ..models import review_log_model
+from ..core.config import settings
+from ..core.database import engine
+
+# --- Write-Behind Buffer ---
+
+class ReviewLogBuffer:
+    """
+    Collects review log rows in memory and writes them in batches, so logging a
+    review never adds a commit to the review itself.
+
+    A background task flushes the buffer every `flush_interval` seconds, or
+    sooner once `flush_size` rows are waiting. Each batch is one INSERT in one
+    transaction; a batch that fails is put back and retried on the next flush,
+    unless that would leave more than `max_buffered` rows in memory, in which
+    case it is spooled to disk instead.
+
+    On shutdown the buffer is flushed one last time. If that write fails, the
+    rows are spooled too. An atexit hook does the same if the process exits
+    without a clean shutdown. Rows still buffered when the process is killed
+    outright are lost: that is the price of keeping the write off the hot path.
+
+    Each spool is its own file next to `spool_path`, written under a temporary
+    name, fsynced and then renamed into place, so a spool is never seen half
+    written. Spools are replayed into the database on start, and after the next
+    successful flush once this process has spooled. A replay claims each file
+    by renaming it first, so when several workers replay at once every file is
+    replayed by exactly one of them. A replay that fails renames the file back
+    for the next attempt; one killed mid-replay leaves a `.replaying` file behind.
+    """
+
+    def __init__(self, flush_size: int, flush_interval: float, spool_path: str, max_buffered: int):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+        self.max_buffered = max_buffered
+        self._spooled = False  # Set once this process spools, so the next good flush replays
+        self._rows = []
+        self._writing = []  # Batches taken from _rows whose write hasn't finished
+        self._lock = threading.Lock()
+        self._loop = None
+        self._wake = None
+        self._task = None
+
+    async def start(self):
+        # Rows spooled by a previous run go in before anything new.
+        try:
+            await asyncio.to_thread(self._replay_spool)
+        except Exception as e:
+            print(f"Could not replay the review log spool, will try again next start: {e}")
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._loop = None
+        await asyncio.to_thread(self.flush_or_spool)
+
+    def record(
+        self,
+        card_id: int,
+        user_id: int | None,
+        was_correct: bool,
+        previous_interval: int | None,
+        new_interval: int,
+        reviewed_at: datetime,
+        latency_ms: int | None = None,
+    ):
+        """
+        Queues one review for the log. Safe to call from any thread.
+        """
+        row = {
+            "card_id": card_id,
+            "user_id": user_id,
+            "was_correct": was_correct,
+            "latency_ms": latency_ms,
+            "previous_interval": previous_interval,
+            "new_interval": new_interval,
+            "reviewed_at": reviewed_at,
+        }
+        with self._lock:
+            self._rows.append(row)
+            full = len(self._rows) >= self.flush_size
+        if not full:
+            return
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wake.set)
+        else:
+            # Nothing is flushing in the background (e.g. a maintenance command), so flush here.
+            self.flush_or_spool()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self._flush()
+
+    def pending(self, card_ids) -> set:
+        """
+        The (card_id, reviewed_at) of the given cards' reviews that are queued in
+        this process but may not be in the database yet.
+        """
+        with self._lock:
+            batches = [self._rows, *self._writing]
+            return {
+                (row["card_id"], row["reviewed_at"])
+                for batch in batches for row in batch if row["card_id"] in card_ids
+            }
+
+    async def _flush(self):
+        rows = self._take()
+        if not rows:
+            return
+        try:
+            await asyncio.to_thread(self._write, rows)
+        except Exception as e:
+            with self._lock:
+                requeue = len(self._rows) + len(rows) <= self.max_buffered
+                if requeue:
+                    self._rows[:0] = rows
+            if requeue:
+                print(f"Review log flush failed, will retry: {e}")
+                return
+            print(f"Review log flush failed, spooling {len(rows)} rows to disk: {e}")
+            try:
+                await asyncio.to_thread(self._spool, rows)
+            except Exception as spool_error:
+                print(f"Could not spool {len(rows)} review log rows, dropping them: {spool_error}")
+            return
+        if self._spooled:
+            self._spooled = False
+            try:
+                await asyncio.to_thread(self._replay_spool)
+            except Exception as e:
+                self._spooled = True
+                print(f"Could not replay the review log spool, will try again: {e}")
+
+    def flush_or_spool(self):
+        """
+        Writes everything buffered, falling back to the spool file if the database write fails.
+        """
+        rows = self._take()
+        if not rows:
+            return
+        try:
+            self._write(rows)
+        except Exception as e:
+            print(f"Review log flush failed, spooling {len(rows)} rows to disk: {e}")
+            self._spool(rows)
+
+    def _take(self) -> list:
+        with self._lock:
+            rows, self._rows = self._rows, []
+            if rows:
+                self._writing.append(rows)
+        return rows
+
+    def _write(self, rows: list):
+        try:
+            with engine.begin() as conn:
+                conn.execute(insert(review_log_model.ReviewLog.__table__), rows)
+        finally:
+            with self._lock:
+                # Committed, put back in _rows, or about to be spooled.
+                self._writing = [batch for batch in self._writing if batch is not rows]
+
+    def _spool_files(self) -> list:
+        root, extension = os.path.splitext(self.spool_path)
+        return sorted(glob.glob(f"{glob.escape(root)}.*{extension}"))
+
+    def _spool(self, rows: list):
+        root, extension = os.path.splitext(self.spool_path)
+        path = f"{root}.{datetime.utcnow():%Y%m%d%H%M%S}-{uuid.uuid4().hex}{extension}"
+        with open(path + ".tmp", "w", encoding="utf-8") as spool:
+            for row in rows:
+                spool.write(json.dumps({**row, "reviewed_at": row["reviewed_at"].isoformat()}) + "\n")
+            spool.flush()
+            os.fsync(spool.fileno())
+        os.replace(path + ".tmp", path)
+        self._spooled = True
+
+    def _replay_spool(self):
+        replayed = 0
+        for path in self._spool_files():
+            claimed = path + ".replaying"
+            try:
+                os.rename(path, claimed)
+            except FileNotFoundError:
+                continue  # Another worker is replaying it
+            try:
+                with open(claimed, encoding="utf-8") as spool:
+                    rows = [json.loads(line) for line in spool if line.strip()]
+                for row in rows:
+                    row["reviewed_at"] = datetime.fromisoformat(row["reviewed_at"])
+                if rows:
+                    self._write(rows)
+            except Exception:
+                os.rename(claimed, path)
+                raise
+            # Only removed once the rows are committed; a crash before this leaves the claimed file.
+            os.remove(claimed)
+            replayed += len(rows)
+        if replayed:
+            print(f"Replayed {replayed} spooled review log rows.")
+
+# Create a single instance that the rest of our app can import
+review_log = ReviewLogBuffer(
+    flush_size=settings.REVIEW_LOG_FLUSH_SIZE,
+    flush_interval=settings.REVIEW_LOG_FLUSH_INTERVAL_SECONDS,
+    spool_path=settings.REVIEW_LOG_SPOOL_PATH,
+    max_buffered=settings.REVIEW_LOG_MAX_BUFFERED_ROWS,
+)
+atexit.register(review_log.flush_or_spool)
@@ -0,0 +1,230 @@
+# 1. Standard Library Imports
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+# 2. Third-party Imports
+import numpy as np
+from sqlalchemy import String, select, type_coerce, update
+from sqlalchemy.orm import Session
+
+# 3. Local Application Imports
+from ..models import card_model, deck_model
+from ..core.config import settings
+from .forecast_service import bump_schedule_statement
+
+# --- Scheduler Interface ---
+
+class Scheduler(ABC):
+    """
+    A spaced repetition algorithm. Subclasses implement the scheduling math once,
+    on NumPy arrays, so the same code serves a single review and a whole deck.
+    """
+    name = None
+
+    def __init__(self, max_interval: int = 36500):
+        self.max_interval = max_interval
+
+    @abstractmethod
+    def review_batch(self, intervals: np.ndarray, ease_factors: np.ndarray, was_correct: np.ndarray):
+        """
+        Returns the new (intervals, ease_factors) after one review of each card.
+        """
+
+    def normalize_batch(self, intervals: np.ndarray, ease_factors: np.ndarray):
+        """
+        Brings existing (intervals, ease_factors) in line with this scheduler's
+        parameters, e.g. after switching algorithms or lowering max_interval.
+        """
+        return np.clip(intervals, 1, self.max_interval), ease_factors
+
+    def review(self, interval: int, ease_factor: float, was_correct: bool, reviewed_at: datetime):
+        """
+        Schedules a single review. Returns (interval, ease_factor, next_review_date).
+        """
+        intervals, ease_factors = self.review_batch(
+            np.array([interval]), np.array([ease_factor], dtype=float), np.array([was_correct])
+        )
+        new_interval = int(intervals[0])
+        return new_interval, float(ease_factors[0]), reviewed_at + timedelta(days=new_interval)
+
+    def _grow(self, intervals: np.ndarray, factors: np.ndarray):
+        # Rounds like Python's round(), and always moves at least one day forward.
+        grown = np.maximum(np.round(intervals * factors), intervals + 1)
+        return np.clip(grown, 1, self.max_interval).astype(np.int64)
+
+
+class SM2Scheduler(Scheduler):
+    """
+    SuperMemo SM-2. Correct and incorrect answers are graded as fixed SM-2
+    qualities (0-5); the ease factor moves with the grade and never drops below
+    min_ease. Intervals grow by the ease factor and reset to a day on a lapse.
+    A correct answer is graded 5, the only grade that raises the ease factor
+    (4 leaves it unchanged), so a card can recover from its lapses.
+    """
+    name = "sm2"
+
+    def __init__(
+        self,
+        max_interval: int = 36500,
+        min_ease: float = 1.3,
+        interval_modifier: float = 1.0,
+        correct_quality: int = 5,
+        incorrect_quality: int = 2,
+    ):
+        super().__init__(max_interval)
+        self.min_ease = min_ease
+        self.interval_modifier = interval_modifier
+        self.correct_quality = correct_quality
+        self.incorrect_quality = incorrect_quality
+
+    def review_batch(self, intervals, ease_factors, was_correct):
+        quality = np.where(was_correct, self.correct_quality, self.incorrect_quality)
+        missed = 5 - quality
+        new_ease = np.maximum(ease_factors + (0.1 - missed * (0.08 + missed * 0.02)), self.min_ease)
+        # The interval grows by the ease factor the card had going into the review.
+        new_intervals = np.where(
+            was_correct, self._grow(intervals, ease_factors * self.interval_modifier), 1
+        )
+        return new_intervals, new_ease
+
+    def normalize_batch(self, intervals, ease_factors):
+        return np.clip(intervals, 1, self.max_interval), np.maximum(ease_factors, self.min_ease)
+
+
+class LeitnerScheduler(Scheduler):
+    """
+    The Leitner box system: every correct answer moves the card up a box
+    (the interval multiplies by `multiplier`), a wrong answer sends it back to
+    the first box. Ease factors are left untouched.
+    """
+    name = "leitner"
+
+    def __init__(self, max_interval: int = 36500, multiplier: float = 2.0):
+        super().__init__(max_interval)
+        self.multiplier = multiplier
+
+    def review_batch(self, intervals, ease_factors, was_correct):
+        new_intervals = np.where(was_correct, self._grow(intervals, self.multiplier), 1)
+        return new_intervals, ease_factors
+
+    def normalize_batch(self, intervals, ease_factors):
+        # Snap each interval down to the nearest box (1, m, m^2, ...).
+        intervals = np.clip(intervals, 1, self.max_interval)
+        boxes = np.floor(np.log(intervals) / np.log(self.multiplier) + 1e-9)
+        return np.maximum(np.round(self.multiplier ** boxes), 1).astype(np.int64), ease_factors
+
+
+SCHEDULERS = {scheduler.name: scheduler for scheduler in (SM2Scheduler, LeitnerScheduler)}
+
+def create_scheduler(name: str, max_interval: int | None = None) -> Scheduler:
+    """
+    Builds the named scheduler, capped at max_interval days or the configured cap.
+    """
+    if name not in SCHEDULERS:
+        raise ValueError(f"Unknown scheduler '{name}'; choose one of {sorted(SCHEDULERS)}")
+    return SCHEDULERS[name](max_interval=max_interval or settings.SCHEDULER_MAX_INTERVAL_DAYS)
+
+# Create a single instance that the rest of our app can import
+scheduler = create_scheduler(settings.SCHEDULER_ALGORITHM)
+
+@lru_cache(maxsize=256)
+def _deck_scheduler(name: str, max_interval: int) -> Scheduler:
+    return create_scheduler(name, max_interval)
+
+def scheduler_for(algorithm: str | None, max_interval_days: int | None) -> Scheduler:
+    """
+    The scheduler for a deck's scheduler_algorithm and scheduler_max_interval_days;
+    a deck that sets neither uses the configured one.
+    """
+    if algorithm is None and max_interval_days is None:
+        return scheduler
+    return _deck_scheduler(
+        algorithm or settings.SCHEDULER_ALGORITHM, max_interval_days or settings.SCHEDULER_MAX_INTERVAL_DAYS
+    )
+
+# --- Bulk Rescheduling ---
+
+RESCHEDULE_CHUNK_SIZE = 50_000
+
+def _deck_schedulers(db: Session, deck_id: int | None, user_id: int | None) -> dict:
+    # {deck id: scheduler} for the decks being rescheduled that have settings of their own.
+    decks = deck_model.Deck.__table__
+    query = select(decks.c.id, decks.c.scheduler_algorithm, decks.c.scheduler_max_interval_days).where(
+        (decks.c.scheduler_algorithm.is_not(None)) | (decks.c.scheduler_max_interval_days.is_not(None))
+    )
+    if deck_id is not None:
+        query = query.where(decks.c.id == deck_id)
+    if user_id is not None:
+        query = query.where(decks.c.user_id == user_id)
+    return {row.id: scheduler_for(row.scheduler_algorithm, row.scheduler_max_interval_days) for row in db.execute(query)}
+
+def reschedule_cards(
+    db: Session, deck_id: int | None = None, user_id: int | None = None, algorithm: Scheduler | None = None
+) -> int:
+    """
+    Recomputes interval, ease_factor and next_review_date for every card in a deck,
+    in a user's decks, or everywhere if neither is given, under each deck's scheduler
+    settings, or under `algorithm` for every card if it is given. Cards are read
+    in id-ordered chunks, recomputed as arrays, one array operation per distinct
+    scheduler, and written back with one bulk UPDATE by primary key per chunk, all
+    in a single transaction. Cards that have never been reviewed keep their due
+    date. Returns the number of cards rescheduled.
+    """
+    deck_schedulers = {} if algorithm is not None else _deck_schedulers(db, deck_id, user_id)
+    default = algorithm or scheduler
+    # Decks that share settings share a scheduler, and are normalized together.
+    decks_by_scheduler = {}
+    for deck, deck_scheduler in deck_schedulers.items():
+        decks_by_scheduler.setdefault(deck_scheduler, []).append(deck)
+    cards = card_model.Card.__table__
+    decks = deck_model.Deck.__table__
+
+    rescheduled = 0
+    last_id = 0
+    while True:
+        # Dates are fetched as stored and parsed by NumPy in one go.
+        query = select(
+            cards.c.id, cards.c.deck_id, cards.c.interval, cards.c.ease_factor,
+            type_coerce(cards.c.next_review_date, String),
+            type_coerce(cards.c.last_reviewed_at, String),
+        ).where(cards.c.id > last_id)
+        if deck_id is not None:
+            query = query.where(cards.c.deck_id == deck_id)
+        if user_id is not None:
+            query = query.join(decks, decks.c.id == cards.c.deck_id).where(decks.c.user_id == user_id)
+        rows = db.execute(query.order_by(cards.c.id).limit(RESCHEDULE_CHUNK_SIZE)).all()
+        if not rows:
+            break
+        last_id = rows[-1][0]
+
+        ids, card_deck_ids, intervals, ease_factors, next_dates, last_reviewed = zip(*rows)
+        intervals = np.array(intervals, dtype=np.int64)
+        ease_factors = np.array(ease_factors, dtype=float)
+        card_deck_ids = np.array(card_deck_ids)
+        groups = [(default, ~np.isin(card_deck_ids, list(deck_schedulers)))] + [
+            (deck_scheduler, np.isin(card_deck_ids, deck_ids)) for deck_scheduler, deck_ids in decks_by_scheduler.items()
+        ]
+        for group_scheduler, in_group in groups:
+            if in_group.any():
+                intervals[in_group], ease_factors[in_group] = group_scheduler.normalize_batch(
+                    intervals[in_group], ease_factors[in_group]
+                )
+        last_reviewed = np.array(last_reviewed, dtype="datetime64[us]")
+        next_dates = np.where(
+            np.isnat(last_reviewed),
+            np.array(next_dates, dtype="datetime64[us]"),
+            last_reviewed + intervals.astype("timedelta64[D]"),
+        )
+
+        db.execute(update(card_model.Card), [
+            {"id": card_id, "interval": interval, "ease_factor": ease_factor, "next_review_date": next_date}
+            for card_id, interval, ease_factor, next_date in zip(
+                ids, intervals.tolist(), ease_factors.tolist(), next_dates.tolist()
+            )
+        ])
+        rescheduled += len(rows)
+
+    db.execute(bump_schedule_statement(None if deck_id is None else {deck_id}, user_id))
+    db.commit()
+    return rescheduled
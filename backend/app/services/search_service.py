@@ -0,0 +1,202 @@
+# 1. Standard Library Imports
+import re
+
+# 2. Third-party Imports
+from sqlalchemy import func, select, text
+from sqlalchemy.orm import Session
+
+# 3. Local Application Imports
+from ..models import card_model
+from ..models.card_model import CARDS_FTS_TABLE, SEARCH_VECTOR_SQL
+from ..core.database import engine
+from ..core.pagination import decode_ranked_cursor, encode_ranked_cursor
+
+# --- Search Index Maintenance ---
+# On SQLite the index is the cards_fts FTS5 table (see card_model), one row per
+# card with the card's id as its rowid. Nothing keeps it in step automatically,
+# so every write that adds, edits or removes cards executes the statements below
+# in the same transaction. On PostgreSQL the GIN index follows the cards table by
+# itself and these return no statements.
+
+def _uses_fts5() -> bool:
+    return engine.dialect.name == "sqlite"
+
+_INDEX_CARD = text(
+    f"INSERT INTO {CARDS_FTS_TABLE} (rowid, question, answer, deck, owner) "
+    "VALUES (:id, :question, :answer, :deck_id, :user_id)"
+)
+_UNINDEX_CARD = text(f"DELETE FROM {CARDS_FTS_TABLE} WHERE rowid = :id")
+_UNINDEX_DECK = text(
+    f"DELETE FROM {CARDS_FTS_TABLE} WHERE rowid IN (SELECT id FROM cards WHERE deck_id = :deck_id)"
+)
+
+def index_card_statements(card, user_id: int, replace: bool = False) -> list:
+    """
+    (statement, params) pairs that index a new card in a deck the user owns,
+    or re-index an edited one with replace=True.
+    """
+    if not _uses_fts5():
+        return []
+    statements = [(_UNINDEX_CARD, {"id": card.id})] if replace else []
+    statements.append((_INDEX_CARD, {
+        "id": card.id, "question": card.question, "answer": card.answer,
+        "deck_id": card.deck_id, "user_id": user_id,
+    }))
+    return statements
+
+def index_cards_statements(rows: list) -> list:
+    """
+    The same for a batch of new cards, as one executemany; rows are dicts with
+    id, question, answer, deck_id and user_id (the deck's owner).
+    """
+    return [(_INDEX_CARD, rows)] if _uses_fts5() and rows else []
+
+def unindex_card_statements(card_id: int) -> list:
+    return [(_UNINDEX_CARD, {"id": card_id})] if _uses_fts5() else []
+
+def unindex_deck_statements(deck_id: int) -> list:
+    # Must run before the deck's cards are deleted, since it finds them through the cards table.
+    return [(_UNINDEX_DECK, {"deck_id": deck_id})] if _uses_fts5() else []
+
+def rebuild_search_index(db: Session) -> int:
+    """
+    Rebuilds the index from the cards table and returns how many cards it covers.
+    For databases that predate search, or whose index has drifted from the cards table.
+    """
+    if _uses_fts5():
+        db.execute(text(f"DELETE FROM {CARDS_FTS_TABLE}"))
+        db.execute(text(
+            f"INSERT INTO {CARDS_FTS_TABLE} (rowid, question, answer, deck, owner) "
+            "SELECT cards.id, cards.question, cards.answer, cards.deck_id, decks.user_id "
+            "FROM cards JOIN decks ON decks.id = cards.deck_id"
+        ))
+        # Merge the index's segments into one, which is what queries read fastest.
+        db.execute(text(f"INSERT INTO {CARDS_FTS_TABLE} ({CARDS_FTS_TABLE}) VALUES ('optimize')"))
+    else:
+        db.execute(text("REINDEX INDEX ix_cards_search"))
+    db.commit()
+    return db.scalar(select(func.count(card_model.Card.id)))
+
+# --- Queries ---
+
+SEARCH_MAX_TERMS = 16
+SEARCH_MIN_PREFIX_LENGTH = 3  # Shorter prefixes match too much of the index to rank quickly
+# Ranking costs time per matching card, so a query matching more cards than this
+# (a word on most cards, say) only ranks its most recently added matches, and
+# its pages say so with "truncated".
+SEARCH_MAX_RANKED = 5000
+# Scores are paged as integer ranks, the score to six decimals, so the cursor's
+# "same rank" comparison is exact rather than a float equality.
+_RANK_SCALE = 1_000_000
+
+# bm25() weights per column: a match in the question counts twice a match in the
+# answer, and the deck and owner columns (only there for filtering) don't count.
+# Lower scores are better, which is also the order the ranked cursor pages in.
+_BM25 = f"bm25({CARDS_FTS_TABLE}, 2.0, 1.0, 0.0, 0.0)"
+# The rowid of the SEARCH_MAX_RANKED-th newest match (0 when there are fewer),
+# found by walking the index's rowid order without ranking anything.
+_RANKED_CUTOFF = (
+    f"coalesce((SELECT rowid FROM {CARDS_FTS_TABLE} WHERE {CARDS_FTS_TABLE} MATCH :query "
+    "ORDER BY rowid DESC LIMIT 1 OFFSET :ranked_offset), 0)"
+)
+# Whether there is a match past the SEARCH_MAX_RANKED-th, i.e. some went unranked.
+_RANKED_TRUNCATED = (
+    f"((SELECT rowid FROM {CARDS_FTS_TABLE} WHERE {CARDS_FTS_TABLE} MATCH :query "
+    "LIMIT 1 OFFSET :max_ranked) IS NOT NULL)"
+)
+# PostgreSQL ranks higher-is-better, so it's negated to page the same way.
+_TS_RANK = f"-ts_rank({SEARCH_VECTOR_SQL}, websearch_to_tsquery('simple', :query))"
+
+def fts5_query(q: str, user_id: int, deck_id: int | None = None) -> str | None:
+    """
+    Turns free text into an FTS5 query over the user's cards: every word must
+    match the question or the answer, and the last one may be a prefix (so
+    results show up while the user is still typing). Each word is quoted, so FTS5
+    operators and punctuation in the input are never interpreted.
+    Returns None when there is nothing to search for.
+    """
+    terms = re.findall(r"\w+", q.casefold())[:SEARCH_MAX_TERMS]
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    if len(terms[-1]) >= SEARCH_MIN_PREFIX_LENGTH:
+        quoted[-1] += "*"
+    query = f'{{question answer}} : ({" ".join(quoted)}) AND owner : "{int(user_id)}"'
+    if deck_id is not None:
+        query += f' AND deck : "{int(deck_id)}"'
+    return query
+
+def search_statement(q: str, user_id: int, deck_id: int | None, limit: int, cursor: str | None):
+    """
+    One page of the user's cards matching `q`, best match first, as (id, question,
+    answer, deck_id, rank, min_id, max_id, truncated) rows; one extra row is
+    fetched to tell whether there is a next page. Returns None when `q` has
+    nothing to search for.
+
+    The first page fixes a snapshot of what gets ranked: cards with ids from
+    min_id (the ranking cutoff) up to max_id (the newest card at the time).
+    Later pages rank within the snapshot from their cursor, so cards added while
+    paging, which would move the cutoff, can't shift pages already served.
+    """
+    if _uses_fts5():
+        query = fts5_query(q, user_id, deck_id)
+        score = _BM25
+        source = f"{CARDS_FTS_TABLE} JOIN cards ON cards.id = {CARDS_FTS_TABLE}.rowid"
+        conditions = [f"{CARDS_FTS_TABLE} MATCH :query"]
+        params = {"query": query}
+        min_id, truncated = _RANKED_CUTOFF, _RANKED_TRUNCATED
+        # Bounding the index's rowid lets FTS5 skip older matches instead of ranking them.
+        id_column = f"{CARDS_FTS_TABLE}.rowid"
+    else:
+        query = q.strip() or None
+        score = _TS_RANK
+        source = "cards JOIN decks ON decks.id = cards.deck_id"
+        conditions = [
+            f"({SEARCH_VECTOR_SQL}) @@ websearch_to_tsquery('simple', :query)", "decks.user_id = :user_id"
+        ]
+        params = {"query": query, "user_id": user_id}
+        if deck_id is not None:
+            conditions.append("cards.deck_id = :deck_id")
+            params["deck_id"] = deck_id
+        min_id, truncated = "0", "false"
+        id_column = "cards.id"
+    if query is None:
+        return None
+
+    rank = f"CAST(round(({score}) * {_RANK_SCALE}) AS BIGINT)"
+    params["limit"] = limit + 1
+    after = decode_ranked_cursor(cursor)
+    if after is None:
+        max_id = "(SELECT max(id) FROM cards)"
+        if _uses_fts5():
+            params["ranked_offset"], params["max_ranked"] = SEARCH_MAX_RANKED - 1, SEARCH_MAX_RANKED
+    else:
+        params["after_rank"], params["after_id"], snapshot = after
+        conditions.append(f"({rank} > :after_rank OR ({rank} = :after_rank AND cards.id > :after_id))")
+        min_id, max_id, truncated = "CAST(:min_id AS BIGINT)", "CAST(:max_id AS BIGINT)", "CAST(:truncated AS BOOLEAN)"
+        params.update(snapshot)
+    conditions += [f"{id_column} >= {min_id}", f"{id_column} <= {max_id}"]
+
+    return text(
+        f"SELECT cards.id, cards.question, cards.answer, cards.deck_id, {rank} AS rank, "
+        f"{min_id} AS min_id, {max_id} AS max_id, {truncated} AS truncated "
+        f"FROM {source} WHERE {' AND '.join(conditions)} "
+        "ORDER BY rank, cards.id LIMIT :limit"
+    ).bindparams(**params)
+
+def build_search_page(rows: list, limit: int) -> dict:
+    if not rows:
+        return {"items": [], "next_cursor": None, "truncated": False}
+    items = rows[:limit]
+    snapshot = {"min_id": rows[0].min_id, "max_id": rows[0].max_id, "truncated": bool(rows[0].truncated)}
+    next_cursor = encode_ranked_cursor(items[-1].rank, items[-1].id, snapshot) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor, "truncated": snapshot["truncated"]}
+
+def search_cards(db: Session, q: str, user_id: int, deck_id: int | None, limit: int, cursor: str | None = None):
+    """
+    Logic to search the questions and answers of the user's cards, optionally within one deck.
+    """
+    statement = search_statement(q, user_id, deck_id, limit, cursor)
+    if statement is None:
+        return {"items": [], "next_cursor": None, "truncated": False}
+    return build_search_page(db.execute(statement).all(), limit)
@@ -1,105 +1,474 @@
 # 1. Standard Library Imports
-from datetime import datetime, timedelta
-import heapq
+import asyncio
+from datetime import datetime, timezone
 
 # 2. Third-party Imports
-from sqlalchemy.orm import Session
-from fastapi import HTTPException
-import google.generativeai as genai
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session, contains_eager
+from fastapi import HTTPException, status
 
 # 3. Local Application Imports
-from ..models import card_model
+from ..models import card_model, deck_model, review_log_model
+from ..core.ai_client import ai_client, AIClientError
 from ..core.config import settings
+from ..core.telemetry import record_answer_verdict
+from .answer_cache import answers_match, verification_cache
+from .answer_scoring import AnswerScore, score_answer
+from . import hint_service
+from .scheduler import scheduler_for
+from .review_log_service import review_log
+from .forecast_service import bump_schedule_statement
+from .card_service import owned_card_statement
 
-# --- Configure the Gemini API Client ---
-genai.configure(api_key=settings.GEMINI_API_KEY)
-
-# --- THIS IS THE CRUCIAL CHANGE ---
-# We are switching to the more specific and stable 'gemini-1.0-pro' model name.
-ai_model = genai.GenerativeModel('gemini-1.0-pro')
-
-# --- Private Helper Function for AI Verification ---
-def _verify_answer_with_ai(correct_answer: str, user_answer: str) -> bool:
+# --- Private Helper Functions for Answer Verification ---
+async def _verify_answer_with_ai(correct_answer: str, user_answer: str) -> bool:
     """
     Internal function to call the Gemini API for semantic verification.
+    The call is awaited, so no worker thread is held while the model thinks.
+    Raises AIClientError if the model can't give a verdict.
+    """
+    prompt = f"""
+    The correct answer is: '{correct_answer}'.
+    The user's answer is: '{user_answer}'.
+    Is the user's answer semantically correct and contains the key information? 
+    Your response must be only the single word 'true' or 'false'.
+    """
+    response_text = await ai_client.generate_content(prompt, operation="verify_answer")
+    result = response_text.strip().lower()
+    return result == 'true'
+
+async def verify_answer(card_id: int, correct_answer: str, user_answer: str) -> bool | None:
     """
+    Decides whether an answer is correct, asking the AI only when it has to:
+    1. Clear cases are scored locally (see answer_scoring): matches and typos,
+       equal or different numbers and dates, non-answers like "idk".
+    2. Repeat answers reuse the cached verdict.
+    3. Everything else goes to the AI, and the verdict is cached.
+    Returns None when the AI was needed but couldn't answer, so the caller can
+    leave the card as it was instead of marking a possibly right answer wrong.
+    Without an API key there is no AI to ask: answers the local rules can't
+    decide are wrong unless they score ANSWER_LOCAL_ONLY_ACCEPT_SCORE.
+    """
+    if settings.ANSWER_LOCAL_SCORING:
+        local_score = score_answer(correct_answer, user_answer)
+    elif answers_match(correct_answer, user_answer):
+        local_score = AnswerScore(True, 1.0, "match")
+    else:
+        local_score = AnswerScore(None, 0.0, "local scoring off")
+    if local_score.verdict is not None:
+        record_answer_verdict("local", local_score.verdict)
+        return local_score.verdict
+    if not ai_client.enabled:
+        was_correct = local_score.score >= settings.ANSWER_LOCAL_ONLY_ACCEPT_SCORE
+        record_answer_verdict("local_score", was_correct)
+        return was_correct
+
+    cached_verdict = verification_cache.get(card_id, correct_answer, user_answer)
+    if cached_verdict is not None:
+        record_answer_verdict("cache", cached_verdict)
+        return cached_verdict
+
     try:
-        prompt = f"""
-        The correct answer is: '{correct_answer}'.
-        The user's answer is: '{user_answer}'.
-        Is the user's answer semantically correct and contains the key information? 
-        Your response must be only the single word 'true' or 'false'.
-        """
-        response = ai_model.generate_content(prompt)
-        result = response.text.strip().lower()
-        return result == 'true'
-    except Exception as e:
+        was_correct = await _verify_answer_with_ai(correct_answer, user_answer)
+    except AIClientError as e:
+        # Failures are not cached, so the next attempt asks the AI again.
         print(f"Gemini API call failed during verification: {e}")
-        return False
+        record_answer_verdict("unverified", None)
+        return None
+
+    verification_cache.set(card_id, correct_answer, user_answer, was_correct)
+    record_answer_verdict("ai", was_correct)
+    return was_correct
+
+def answer_unverified():
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Your answer couldn't be checked right now, so the card wasn't changed. Please try again shortly.",
+        headers={"Retry-After": "5"},
+    )
 
 # --- Spaced Repetition Logic (The Main Stuff) ---
 
-def get_next_card_to_study(db: Session, deck_id: int):
+def due_cards_statement(deck_id: int, user_id: int):
     """
-    Uses a Priority Queue (min-heap) to find the most urgent card to review.
+    Builds the select() for a deck's due cards, most urgent first: oldest
+    next_review_date, ties broken by id so the order is deterministic.
+    The ordering is served by the (deck_id, next_review_date) index.
+    The deck id is matched through a subquery that also checks the owner, so a
+    deck the user doesn't own has no due cards, at the cost of one primary-key read.
+    Shared with the async study service so both paths order cards identically.
     """
-    due_cards = db.query(card_model.Card).filter(
-        card_model.Card.deck_id == deck_id,
+    owned_deck_id = select(deck_model.Deck.id).where(
+        deck_model.Deck.id == deck_id, deck_model.Deck.user_id == user_id
+    ).scalar_subquery()
+    return select(card_model.Card).where(
+        card_model.Card.deck_id == owned_deck_id,
         card_model.Card.next_review_date <= datetime.utcnow()
-    ).all()
+    ).order_by(
+        card_model.Card.next_review_date,
+        card_model.Card.id
+    )
 
-    if not due_cards:
-        return None
+def get_next_card_to_study(db: Session, deck_id: int, user_id: int):
+    """
+    Finds the most urgent card to review with an indexed ORDER BY ... LIMIT 1,
+    so only a single row is read no matter how large the backlog is.
+    """
+    return db.scalars(due_cards_statement(deck_id, user_id).limit(1)).first()
 
-    priority_queue = []
-    for card in due_cards:
-        heapq.heappush(priority_queue, (card.next_review_date, card))
-    
-    most_urgent_card = heapq.heappop(priority_queue)[1]
-    return most_urgent_card
+def get_next_cards_to_study(db: Session, deck_id: int, user_id: int, limit: int):
+    """
+    Returns up to `limit` due cards in the same priority order as
+    get_next_card_to_study, so a client can prefetch a study queue
+    with a single query instead of one request per card.
+    """
+    return db.scalars(due_cards_statement(deck_id, user_id).limit(limit)).all()
 
-def review_card(db: Session, card_id: int, user_answer: str):
+REVIEW_SAVE_ATTEMPTS = 3  # Re-plans when another review changes a card mid-save
+
+def review_update(card, was_correct: bool) -> dict:
     """
-    Updates a card's review schedule after verifying the answer with AI.
+    Schedules a review of the card with its deck's scheduler, as a row for
+    review_batch_update_statement(): it only applies if the card hasn't been
+    reviewed since it was read.
     """
-    card = db.query(card_model.Card).filter(card_model.Card.id == card_id).first()
+    reviewed_at = datetime.utcnow()
+    deck = card.deck
+    interval, ease_factor, next_review_date = scheduler_for(
+        deck.scheduler_algorithm, deck.scheduler_max_interval_days
+    ).review(card.interval, card.ease_factor, was_correct, reviewed_at)
+    return {
+        "card_id": card.id,
+        "read_last_reviewed_at": card.last_reviewed_at,
+        "interval": interval,
+        "ease_factor": ease_factor,
+        "next_review_date": next_review_date,
+        "last_reviewed_at": reviewed_at,
+    }
+
+def _load_card_to_review(db: Session, card_id: int, user_id: int):
+    card = db.scalars(owned_card_statement(card_id, user_id)).first()
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
+    correct_answer = card.answer
+    # End the read transaction so no pooled connection is held while we wait on the AI.
+    db.commit()
+    return correct_answer
 
-    was_correct = _verify_answer_with_ai(card.answer, user_answer)
+def card_to_save_statement(card_id: int, user_id: int):
+    """
+    Re-reads a card's schedule, with its deck's scheduler settings, once its answer
+    is verified, over what the session already holds: another review may have
+    changed it while we waited on the AI. Server databases lock the row until the
+    review is saved.
+    """
+    return (
+        owned_card_statement(card_id, user_id)
+        .options(contains_eager(card_model.Card.deck))
+        .with_for_update(of=card_model.Card)
+        .execution_options(populate_existing=True)
+    )
 
-    if was_correct:
-        new_interval = round(card.interval * card.ease_factor)
-        card.interval = new_interval
-    else:
-        card.interval = 1 # Reset if wrong
-    
-    card.next_review_date = datetime.utcnow() + timedelta(days=card.interval)
+def review_conflict():
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="This card kept changing while the review was saved. Please resubmit it.",
+    )
+
+def _save_review(db: Session, card_id: int, user_id: int, was_correct: bool):
+    for _ in range(REVIEW_SAVE_ATTEMPTS):
+        card = db.scalars(card_to_save_statement(card_id, user_id)).first()
+        if not card:
+            raise HTTPException(status_code=404, detail="Card not found")
+        update_row = review_update(card, was_correct)
+        if db.execute(review_batch_update_statement(), update_row).rowcount == 1:
+            db.execute(bump_schedule_statement({card.deck_id}))
+            db.commit()
+            return card.interval, update_row["interval"], update_row["last_reviewed_at"], card.answer
+        # Another review of the card landed after the re-read: schedule on top of it.
+        db.rollback()
+    raise review_conflict()
+
+async def review_card(db: Session, card_id: int, user_answer: str, user_id: int, latency_ms: int | None = None):
+    """
+    Updates a card's review schedule after verifying the answer with AI,
+    and queues the review for the review log.
+    The blocking database calls run in a thread, as in hint_service: on the
+    event loop, a write waiting on SQLite's busy_timeout would stall every
+    other request in the worker.
+    """
+    correct_answer = await asyncio.to_thread(_load_card_to_review, db, card_id, user_id)
+
+    was_correct = await verify_answer(card_id, correct_answer, user_answer)
+    if was_correct is None:
+        raise answer_unverified()
 
+    previous_interval, new_interval, reviewed_at, answer = await asyncio.to_thread(
+        _save_review, db, card_id, user_id, was_correct
+    )
+    review_log.record(card_id, user_id, was_correct, previous_interval, new_interval, reviewed_at, latency_ms)
+
+    return {"was_correct": was_correct, "correct_answer": answer}
+
+# --- Batch Review Submission ---
+
+def _answered_at_utc(answered_at: datetime, now: datetime) -> datetime:
+    # Timestamps are stored as naive UTC. Clamp client clocks that run ahead of ours.
+    if answered_at.tzinfo is not None:
+        answered_at = answered_at.astimezone(timezone.utc).replace(tzinfo=None)
+    return min(answered_at, now)
+
+def _is_new_review(answered_at: datetime, last_reviewed_at: datetime | None) -> bool:
+    return last_reviewed_at is None or answered_at > last_reviewed_at
+
+def _old_review_status(card_id: int, answered_at: datetime, last_reviewed_at: datetime, applied_before: set) -> str:
+    # An applied review sets last_reviewed_at to its answered_at and goes into the
+    # review log, so a review found either way is this one coming back; any other
+    # review answered before the card's last one was overtaken.
+    if answered_at == last_reviewed_at or (card_id, answered_at) in applied_before:
+        return "duplicate"
+    return "stale"
+
+def logged_reviews_statement(reviews, cards: dict):
+    """
+    Selects the review log's (card_id, reviewed_at) pairs for the reviews in the
+    batch that are older than their card's last review, so that each one that was
+    already applied comes back as a duplicate. None when there are no such reviews.
+    """
+    now = datetime.utcnow()
+    old = {
+        (review.card_id, _answered_at_utc(review.answered_at, now))
+        for review in reviews
+        if review.card_id in cards
+        and not _is_new_review(_answered_at_utc(review.answered_at, now), cards[review.card_id].last_reviewed_at)
+    }
+    if not old:
+        return None
+    log = review_log_model.ReviewLog
+    return select(log.card_id, log.reviewed_at).where(
+        log.card_id.in_({card_id for card_id, _ in old}), log.reviewed_at.in_({answered_at for _, answered_at in old})
+    )
+
+def logged_reviews(rows, card_ids) -> set:
+    """
+    The (card_id, reviewed_at) pairs of logged_reviews_statement()'s rows, plus the
+    reviews of those cards still waiting in this process's review log buffer.
+    """
+    return {(row.card_id, row.reviewed_at) for row in rows} | review_log.pending(card_ids)
+
+def review_batch_cards_statement(card_ids, user_id: int):
+    """
+    Selects the columns batch review needs for those of the given cards that are
+    in the user's decks; the rest are reported as not found.
+    """
+    return select(
+        card_model.Card.id,
+        card_model.Card.deck_id,
+        card_model.Card.answer,
+        card_model.Card.interval,
+        card_model.Card.ease_factor,
+        card_model.Card.last_reviewed_at,
+        deck_model.Deck.scheduler_algorithm,
+        deck_model.Deck.scheduler_max_interval_days,
+    ).join(card_model.Card.deck).where(
+        card_model.Card.id.in_(card_ids), deck_model.Deck.user_id == user_id
+    )
+
+def review_batch_update_statement():
+    """
+    The UPDATE for review_update()'s row, or in bulk for plan_review_batch()'s. A
+    card is only changed if its last_reviewed_at is still the one the plan was
+    made from, so a review that lands between the re-read and the commit is never
+    overwritten; the caller checks the row count and plans again.
+    """
+    card = card_model.Card.__table__
+    return update(card).where(
+        card.c.id == bindparam("card_id"),
+        card.c.last_reviewed_at.is_not_distinct_from(bindparam("read_last_reviewed_at")),
+    )
+
+async def verify_review_batch(reviews, cards: dict) -> dict:
+    """
+    Verifies every review that would be applied, concurrently, with each distinct
+    (card, answer) pair checked once. Returns {(card_id, user_answer): was_correct},
+    where was_correct is None for answers that couldn't be verified.
+    """
+    now = datetime.utcnow()
+    pending = {
+        (review.card_id, review.user_answer)
+        for review in reviews
+        if review.card_id in cards
+        and _is_new_review(_answered_at_utc(review.answered_at, now), cards[review.card_id].last_reviewed_at)
+    }
+    verdicts = await asyncio.gather(*(
+        verify_answer(card_id, cards[card_id].answer, user_answer)
+        for card_id, user_answer in pending
+    ))
+    return dict(zip(pending, verdicts))
+
+def plan_review_batch(reviews, cards: dict, verdicts: dict, applied_before: set = frozenset()):
+    """
+    Works out the result of each review, in order, against the cards' current
+    schedules. Reviews of the same card build on each other. A review answered at
+    or before the card's last review isn't applied: it is a duplicate if it was
+    applied before, i.e. it is the card's last review or it is in
+    `applied_before` (logged_reviews()), and stale, overtaken by a later review,
+    otherwise.
+    Reviews whose answer couldn't be verified are skipped as unverified.
+    Returns (results, updates, logged), where updates holds one row per changed
+    card for review_batch_update_statement() and logged holds one review log
+    entry per applied review.
+    """
+    now = datetime.utcnow()
+    state = {
+        card_id: {"interval": card.interval, "ease_factor": card.ease_factor, "last_reviewed_at": card.last_reviewed_at}
+        for card_id, card in cards.items()
+    }
+    results = []
+    updates = {}
+    logged = []
+    for review in reviews:
+        result = {"card_id": review.card_id, "answered_at": review.answered_at}
+        card = state.get(review.card_id)
+        if card is None:
+            results.append({**result, "status": "not_found"})
+            continue
+        result["correct_answer"] = cards[review.card_id].answer
+
+        answered_at = _answered_at_utc(review.answered_at, now)
+        if not _is_new_review(answered_at, card["last_reviewed_at"]):
+            results.append({
+                **result, "status": _old_review_status(review.card_id, answered_at, card["last_reviewed_at"], applied_before)
+            })
+            continue
+        verdict_key = (review.card_id, review.user_answer)
+        if verdict_key not in verdicts:
+            # It wasn't new when the batch was first read, and the card's schedule has been reset since.
+            results.append({**result, "status": "stale"})
+            continue
+        verdict = verdicts[verdict_key]
+        if verdict is None:
+            # The AI couldn't be reached: leave the card alone so the review can be resubmitted.
+            results.append({**result, "status": "unverified"})
+            continue
+
+        previous_interval = card["interval"]
+        deck_scheduler = scheduler_for(
+            cards[review.card_id].scheduler_algorithm, cards[review.card_id].scheduler_max_interval_days
+        )
+        card["interval"], card["ease_factor"], next_review_date = deck_scheduler.review(
+            card["interval"], card["ease_factor"], verdict, answered_at
+        )
+        card["last_reviewed_at"] = answered_at
+        updates[review.card_id] = {
+            "card_id": review.card_id,
+            "read_last_reviewed_at": cards[review.card_id].last_reviewed_at,
+            "interval": card["interval"],
+            "ease_factor": card["ease_factor"],
+            "next_review_date": next_review_date,
+            "last_reviewed_at": answered_at,
+        }
+        logged.append((review, verdict, previous_interval, card["interval"], answered_at))
+        results.append({**result, "status": "applied", "was_correct": verdict})
+    return results, list(updates.values()), logged
+
+def review_batch_bump_statement(cards: dict, updates: list):
+    # Moves the forecasts of the decks whose cards the batch reschedules.
+    return bump_schedule_statement({cards[row["card_id"]].deck_id for row in updates})
+
+def after_review_batch(logged, user_id: int):
+    """
+    Runs once a batch's updates are committed: queues the applied reviews for the review log.
+    """
+    for review, was_correct, previous_interval, new_interval, answered_at in logged:
+        review_log.record(
+            review.card_id, user_id, was_correct, previous_interval, new_interval, answered_at, review.latency_ms
+        )
+
+def _load_review_batch_cards(db: Session, card_ids, user_id: int) -> dict:
+    cards = {row.id: row for row in db.execute(review_batch_cards_statement(card_ids, user_id))}
+    # Release the connection while we wait on the AI.
     db.commit()
-    
-    return {"was_correct": was_correct, "correct_answer": card.answer}
+    return cards
+
+def review_batch_conflict():
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="These cards kept changing while the reviews were saved. Please resubmit them.",
+    )
 
-def get_hint_for_card(db: Session, card_id: int):
+def _apply_review_batch_updates(db: Session, updates: list) -> bool:
+    # True when every planned row was changed.
+    statement = review_batch_update_statement()
+    if db.bind.dialect.supports_sane_multi_rowcount:
+        return db.execute(statement, updates).rowcount == len(updates)
+    # Drivers that can't count an executemany's rows (psycopg2, asyncpg) get one UPDATE per card.
+    return all(db.execute(statement, row).rowcount == 1 for row in updates)
+
+def _save_review_batch(db: Session, reviews, card_ids, user_id: int, verdicts: dict):
+    for _ in range(REVIEW_SAVE_ATTEMPTS):
+        # Re-read the schedules inside the write transaction so reviews that landed
+        # in the meantime are built upon rather than overwritten.
+        cards = {row.id: row for row in db.execute(review_batch_cards_statement(card_ids, user_id))}
+        statement = logged_reviews_statement(reviews, cards)
+        applied_before = logged_reviews(db.execute(statement), card_ids) if statement is not None else set()
+        results, updates, logged = plan_review_batch(reviews, cards, verdicts, applied_before)
+        if not updates or _apply_review_batch_updates(db, updates):
+            if updates:
+                db.execute(review_batch_bump_statement(cards, updates))
+            db.commit()
+            return results, logged
+        # Another review changed one of the cards after the re-read: plan again on top of it.
+        db.rollback()
+    raise review_batch_conflict()
+
+async def review_batch(db: Session, reviews, user_id: int):
     """
-    Generates a hint for a specific card using the Gemini API.
+    Applies an ordered batch of reviews, e.g. ones queued while offline.
+    The answers are verified together, then every schedule change is written
+    in a single transaction with one bulk UPDATE. Resubmitting a batch is safe:
+    reviews that were already applied come back as duplicates.
+    The database work runs in a thread, as in review_card.
     """
-    card = db.query(card_model.Card).filter(card_model.Card.id == card_id).first()
+    card_ids = {review.card_id for review in reviews}
+    cards = await asyncio.to_thread(_load_review_batch_cards, db, card_ids, user_id)
+
+    verdicts = await verify_review_batch(reviews, cards)
+
+    results, logged = await asyncio.to_thread(_save_review_batch, db, reviews, card_ids, user_id, verdicts)
+    after_review_batch(logged, user_id)
+    return {"results": results}
+
+def _load_card_for_hint(db: Session, card_id: int, user_id: int):
+    card = db.scalars(owned_card_statement(card_id, user_id)).first()
     if not card:
         raise HTTPException(status_code=404, detail="Card not found")
+    fields = card.hint, card.question, card.answer
+    # Release the connection before waiting on the AI.
+    db.commit()
+    return fields
+
+def _store_hint_and_commit(db: Session, card_id: int, question: str, answer: str, hint: str):
+    hint_service.store_hint(db, card_id, question, answer, hint)
+    db.commit()
+
+async def get_hint_for_card(db: Session, card_id: int, user_id: int):
+    """
+    Returns the card's precomputed hint. Hints are generated in the background
+    when a card is created or edited, so this is normally a single primary-key read
+    (joined to the card's deck to check its owner).
+    If the hint isn't ready yet, it is generated now and saved for next time.
+    The database work runs in a thread, as in review_card.
+    """
+    stored_hint, question, answer = await asyncio.to_thread(_load_card_for_hint, db, card_id, user_id)
+    if stored_hint:
+        return {"hint": stored_hint}
 
     try:
-        prompt = f"""
-        The question is: '{card.question}'.
-        The answer is: '{card.answer}'.
-        Generate a single, short, one-sentence hint for the user that guides them
-        towards the answer without giving it away completely.
-        """
-        response = ai_model.generate_content(prompt)
-        return {"hint": response.text.strip()}
-    except Exception as e:
+        hint = await hint_service.generate_hint(question, answer)
+    except AIClientError as e:
         print(f"Gemini API hint generation failed: {e}")
         raise HTTPException(status_code=500, detail="Failed to generate hint")
 
-
-
+    await asyncio.to_thread(_store_hint_and_commit, db, card_id, question, answer, hint)
+    return {"hint": hint}
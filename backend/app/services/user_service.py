@@ -1,46 +1,85 @@
+import asyncio
+
 from sqlalchemy.orm import Session
 from fastapi import HTTPException, status
 
 from ..models import user_model
 from ..schemas import user_schema
 from ..core import security
+from ..core.deps import invalidate_cached_user
 
-def create_user(db: Session, user: user_schema.UserCreate):
-    """
-    Creates a new user in the database after hashing their password.
-    """
+# The blocking database calls below run in a thread while the handlers await
+# bcrypt: on the event loop, a write waiting on SQLite's busy_timeout would
+# stall every other request in the worker.
+
+def _check_email_free(db: Session, email: str):
     # Check if a user with this email already exists
-    db_user = db.query(user_model.User).filter(user_model.User.email == user.email).first()
+    db_user = db.query(user_model.User).filter(user_model.User.email == email).first()
     if db_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered",
         )
-    
-    # Hash the plain text password before storing it
-    hashed_password = security.get_password_hash(user.password)
-    
+    # Release the connection while we wait for the hash.
+    db.commit()
+
+def _insert_user(db: Session, email: str, hashed_password: str):
     # Create the new database model instance
-    db_user = user_model.User(email=user.email, hashed_password=hashed_password)
+    db_user = user_model.User(email=email, hashed_password=hashed_password)
     
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
     return db_user
 
-def authenticate_user(db: Session, email: str, password: str):
+async def create_user(db: Session, user: user_schema.UserCreate):
+    """
+    Creates a new user in the database after hashing their password.
+    Hashing runs in the password worker pool, off the request threads.
+    """
+    await asyncio.to_thread(_check_email_free, db, user.email)
+
+    # Hash the plain text password before storing it
+    hashed_password = await security.get_password_hash_async(user.password)
+
+    return await asyncio.to_thread(_insert_user, db, user.email, hashed_password)
+
+def _load_credentials(db: Session, email: str):
+    user = db.query(user_model.User).filter(user_model.User.email == email).first()
+    if not user:
+        return None
+    credentials = user, user.id, user.hashed_password
+    # Release the connection while we wait for bcrypt.
+    db.commit()
+    return credentials
+
+def _save_password_hash(db: Session, user: user_model.User, new_hash: str):
+    user.hashed_password = new_hash
+    db.commit()
+    invalidate_cached_user(user.email)
+
+async def authenticate_user(db: Session, email: str, password: str):
     """
     Authenticates a user by checking their email and password.
     Returns a JWT token if successful, otherwise returns False.
+    If the stored hash was made with an outdated bcrypt cost, it is
+    transparently replaced with one at the current cost.
     """
-    user = db.query(user_model.User).filter(user_model.User.email == email).first()
-    
-    # Check if user exists and if the provided password is correct
-    if not user or not security.verify_password(password, user.hashed_password):
+    credentials = await asyncio.to_thread(_load_credentials, db, email)
+    if credentials is None:
+        return False
+    user, user_id, hashed_password = credentials
+
+    # Check if the provided password is correct
+    is_valid, new_hash = await security.verify_and_update_password_async(password, hashed_password)
+    if not is_valid:
         return False
+    if new_hash:
+        await asyncio.to_thread(_save_password_hash, db, user, new_hash)
         
     # If credentials are correct, create a JWT token
     access_token = security.create_access_token(
-        data={"sub": user.email} # "sub" is a standard JWT claim for "subject"
+        # "sub" is a standard JWT claim for "subject"; "uid" lets us skip the email lookup.
+        data={"sub": email, "uid": user_id}
     )
     return {"access_token": access_token, "token_type": "bearer"}
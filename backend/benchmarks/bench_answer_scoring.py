@@ -0,0 +1,167 @@
+"""
+Benchmark for answer_scoring, the local tier of answer verification.
+
+Scores the labeled answers in benchmarks/answer_eval.jsonl and reports, per
+kind of answer, how many were decided locally, how many would go to the AI,
+and how many local verdicts disagree with the label. It then sweeps the
+thresholds in Settings, times the local scorer, and times verify_answer() end
+to end against the fake Gemini server with local scoring on and off, and with
+the model down.
+
+Run from the backend directory:
+    python -m benchmarks.bench_answer_scoring
+"""
+import asyncio
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+AI_PORT = 8766
+AI_LATENCY_MS = 200
+EVAL_SET = Path(__file__).with_name("answer_eval.jsonl")
+TIMING_ROUNDS = 200
+SWEEP = [(accept, reject) for accept in (0.8, 0.85, 0.9, 0.95) for reject in (0.0, 0.25)]
+
+_tmp_dir = tempfile.mkdtemp(prefix="lexilearn-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/bench.db")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ["GEMINI_API_BASE_URL"] = f"http://127.0.0.1:{AI_PORT}"
+os.environ["FAKE_GEMINI_LATENCY_MS"] = str(AI_LATENCY_MS)
+
+import uvicorn  # noqa: E402
+
+from app.core.ai_client import ai_client  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.services import answer_scoring  # noqa: E402
+from app.services.answer_cache import verification_cache  # noqa: E402
+from app.services.study_service import verify_answer  # noqa: E402
+from benchmarks import fake_gemini  # noqa: E402
+
+
+def _load() -> list:
+    with EVAL_SET.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _score_all(cases: list) -> list:
+    return [answer_scoring.score_answer(case["correct_answer"], case["user_answer"]) for case in cases]
+
+
+def _tally(cases: list, scores: list) -> dict:
+    counts = Counter()
+    for case, score in zip(cases, scores):
+        if score.verdict is None:
+            counts["escalated"] += 1
+        elif score.verdict == case["correct"]:
+            counts["right"] += 1
+        else:
+            counts["false accepts" if score.verdict else "false rejects"] += 1
+    return counts
+
+
+def _report_accuracy(cases: list):
+    scores = _score_all(cases)
+    print(f"{'kind':<12} | {'answers':>7} | {'local':>5} | {'to AI':>5} | {'wrong':>5}")
+    print("-" * 46)
+    for kind in dict.fromkeys(case["kind"] for case in cases):
+        members = [(case, score) for case, score in zip(cases, scores) if case["kind"] == kind]
+        counts = _tally(*zip(*members))
+        local = len(members) - counts["escalated"]
+        wrong = counts["false accepts"] + counts["false rejects"]
+        print(f"{kind:<12} | {len(members):>7} | {local:>5} | {counts['escalated']:>5} | {wrong:>5}")
+    counts = _tally(cases, scores)
+    print("-" * 46)
+    print(f"{'total':<12} | {len(cases):>7} | {len(cases) - counts['escalated']:>5} | "
+          f"{counts['escalated']:>5} | {counts['false accepts'] + counts['false rejects']:>5}")
+    for case, score in zip(cases, scores):
+        if score.verdict is not None and score.verdict != case["correct"]:
+            print(f"  wrong: {case['correct_answer']!r} / {case['user_answer']!r} -> {score}")
+    print("Decided by:", dict(Counter(score.reason for score in scores if score.verdict is not None)))
+    print("Escalated because:", dict(Counter(score.reason for score in scores if score.verdict is None)))
+
+
+def _report_sweep(cases: list):
+    settings = get_settings()
+    defaults = settings.ANSWER_ACCEPT_SIMILARITY, settings.ANSWER_REJECT_SIMILARITY
+    print(f"\n{'accept sim':>10} | {'reject sim':>10} | {'to AI':>6} | {'false accepts':>13} | {'false rejects':>13}")
+    print("-" * 63)
+    for accept, reject in SWEEP:
+        settings.ANSWER_ACCEPT_SIMILARITY, settings.ANSWER_REJECT_SIMILARITY = accept, reject
+        counts = _tally(cases, _score_all(cases))
+        print(f"{accept:>10} | {reject:>10} | {counts['escalated'] / len(cases):>6.0%} | "
+              f"{counts['false accepts']:>13} | {counts['false rejects']:>13}")
+    settings.ANSWER_ACCEPT_SIMILARITY, settings.ANSWER_REJECT_SIMILARITY = defaults
+
+
+def _report_scoring_time(cases: list):
+    timings = []
+    for _ in range(TIMING_ROUNDS):
+        for case in cases:
+            # Cold: nothing parsed yet, as for a new answer to a new card.
+            answer_scoring._parse.cache_clear()
+            started = time.perf_counter()
+            answer_scoring.score_answer(case["correct_answer"], case["user_answer"])
+            timings.append(time.perf_counter() - started)
+    timings.sort()
+    print(f"\nLocal scoring: median {statistics.median(timings) * 1e6:.0f} µs, "
+          f"p99 {timings[int(len(timings) * 0.99)] * 1e6:.0f} µs per answer")
+
+
+def _start_fake_gemini():
+    server = uvicorn.Server(uvicorn.Config(fake_gemini.app, port=AI_PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+
+async def _verify_all(cases: list) -> tuple:
+    """Verifies every case once, one at a time. Returns (latencies, verdicts)."""
+    verification_cache.clear()
+    latencies, verdicts = [], []
+    for card_id, case in enumerate(cases):
+        started = time.perf_counter()
+        verdicts.append(await verify_answer(card_id, case["correct_answer"], case["user_answer"]))
+        latencies.append(time.perf_counter() - started)
+    return latencies, verdicts
+
+
+async def _report_review_latency(cases: list):
+    settings = get_settings()
+    print(f"\nverify_answer() with a {AI_LATENCY_MS} ms model, one review at a time:")
+    print(f"{'local scoring':<14} | {'AI calls':>8} | {'mean ms':>7} | {'p50 ms':>6} | {'p95 ms':>6}")
+    print("-" * 53)
+    for enabled in (False, True):
+        settings.ANSWER_LOCAL_SCORING = enabled
+        calls_before = fake_gemini.stats["calls"]
+        latencies, _ = await _verify_all(cases)
+        latencies.sort()
+        print(f"{'on' if enabled else 'off':<14} | {fake_gemini.stats['calls'] - calls_before:>8} | "
+              f"{statistics.mean(latencies) * 1000:>7.1f} | {statistics.median(latencies) * 1000:>6.1f} | "
+              f"{latencies[int(len(latencies) * 0.95)] * 1000:>6.1f}")
+
+    # With the model unreachable, unsure answers come back unverified (None),
+    # so the review is refused instead of marking a possibly right answer wrong.
+    ai_client._configure()
+    ai_client.base_url = "http://127.0.0.1:1"
+    ai_client._http = None
+    _, verdicts = await _verify_all(cases)
+    print(f"\nModel down: {sum(v is not None for v in verdicts)} answers decided locally, "
+          f"{sum(v is None for v in verdicts)} left unverified, none marked wrong for lack of a verdict")
+
+
+def main():
+    cases = _load()
+    _report_accuracy(cases)
+    _report_sweep(cases)
+    _report_scoring_time(cases)
+    _start_fake_gemini()
+    asyncio.run(_report_review_latency(cases))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Compares the sync (threadpool) and async (AsyncSession) data-access paths.
+
+Starts the API twice in a uvicorn subprocess, once with DB_ASYNC=false and
+once with DB_ASYNC=true, against the same seeded database, then drives the
+read-heavy study and listing endpoints with many concurrent clients and
+reports throughput, latency percentiles and errors for each mode.
+
+The sync path runs every request on the ~40-thread threadpool, which is
+larger than the connection pool; under enough load the threads all block
+waiting for connections held by requests that need a thread to finish, and
+requests fail with pool timeouts. The async path waits for connections on
+the event loop instead.
+
+Run from the backend directory:
+    python -m benchmarks.bench_async_db
+"""
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+PORT = 8766
+CONCURRENCY = 100
+REQUESTS_PER_MODE = 2000
+CARDS = 1000
+
+_tmp_dir = tempfile.mkdtemp(prefix="lexilearn-bench-")
+DATABASE_URL = f"sqlite:///{_tmp_dir}/bench.db"
+BASE_URL = f"http://127.0.0.1:{PORT}"
+
+
+def _start_server(db_async: bool) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": DATABASE_URL,
+        "GEMINI_API_KEY": "benchmark",
+        "DB_ASYNC": "true" if db_async else "false",
+        "BCRYPT_ROUNDS": "4",
+        # Fail pool waits quickly so a starved run finishes in reasonable time.
+        "DB_POOL_TIMEOUT_SECONDS": "5",
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT), "--log-level", "warning"],
+        env=env,
+        stderr=subprocess.DEVNULL,
+    )
+    for _ in range(200):
+        try:
+            httpx.get(f"{BASE_URL}/")
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("API server did not start")
+
+
+async def _setup(client: httpx.AsyncClient):
+    credentials = {"email": "bench@example.com", "password": "benchmark-password"}
+    await client.post("/api/users/signup", json=credentials)
+    response = await client.post(
+        "/api/users/login",
+        data={"username": credentials["email"], "password": credentials["password"]},
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    decks = (await client.get("/api/decks/", headers=headers)).json()["items"]
+    if decks:
+        return headers, decks[0]["id"]
+    deck = (await client.post("/api/decks/", json={"name": "Bench"}, headers=headers)).json()
+    rows = "question,answer\n" + "".join(f"Question {i},Answer {i}\n" for i in range(CARDS))
+    await client.post(
+        f"/api/decks/{deck['id']}/cards/import",
+        files={"file": ("cards.csv", rows.encode())},
+        headers=headers,
+    )
+    return headers, deck["id"]
+
+
+async def _drive(headers: dict, deck_id: int):
+    paths = [
+        f"/api/decks/{deck_id}/study",
+        f"/api/decks/{deck_id}/study/batch",
+        "/api/decks/",
+        f"/api/decks/{deck_id}/cards",
+    ]
+    timings = []
+    errors = 0
+    remaining = iter(range(REQUESTS_PER_MODE))
+    limits = httpx.Limits(max_connections=CONCURRENCY, max_keepalive_connections=CONCURRENCY)
+
+    async with httpx.AsyncClient(base_url=BASE_URL, limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors
+            for i in remaining:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(paths[i % len(paths)], headers=headers)
+                    ok = response.status_code == 200
+                except httpx.TransportError:
+                    ok = False
+                timings.append((time.perf_counter() - started) * 1000)
+                if not ok:
+                    errors += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(CONCURRENCY)))
+        elapsed = time.perf_counter() - started
+
+    timings.sort()
+    def percentile(p):
+        return timings[min(len(timings) - 1, int(len(timings) * p))]
+    return len(timings) / elapsed, percentile(0.50), percentile(0.95), percentile(0.99), errors
+
+
+async def _run_mode(db_async: bool):
+    server = _start_server(db_async)
+    try:
+        async with httpx.AsyncClient(base_url=BASE_URL, timeout=60) as client:
+            headers, deck_id = await _setup(client)
+        return await _drive(headers, deck_id)
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main():
+    print(f"{CONCURRENCY} concurrent clients, {REQUESTS_PER_MODE} requests per mode")
+    print(f"{'mode':>6} | {'req/s':>8} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8} | {'errors':>6}")
+    print("-" * 60)
+    for db_async in (False, True):
+        rps, p50, p95, p99, errors = asyncio.run(_run_mode(db_async))
+        mode = "async" if db_async else "sync"
+        print(f"{mode:>6} | {rps:>8.1f} | {p50:>8.1f} | {p95:>8.1f} | {p99:>8.1f} | {errors:>6}")
+
+
+if __name__ == "__main__":
+    main()
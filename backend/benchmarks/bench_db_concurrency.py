@@ -0,0 +1,107 @@
+"""
+Mixed read/write throughput against the configured database engine profile.
+
+Runs 1, 2, 4 and 8 worker processes, each doing a study-like mix of operations
+for a fixed time: mostly due-card batch reads, plus review-style UPDATEs that
+commit. With the tuned SQLite profile (WAL + busy_timeout) readers are never
+blocked by writers, so total throughput should rise with the worker count
+instead of collapsing into "database is locked" errors.
+
+Run from the backend directory (DB_PROFILE / DATABASE_URL are honoured):
+    python -m benchmarks.bench_db_concurrency
+"""
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_tmp_dir = tempfile.mkdtemp(prefix="lexilearn-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/bench.db")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+WORKER_COUNTS = [1, 2, 4, 8]
+DURATION_SECONDS = 5
+WRITE_FRACTION = 0.2
+DECKS = 20
+CARDS_PER_DECK = 5_000
+
+
+def _setup():
+    from app.core.database import engine, init_db
+    from app.models import card_model, deck_model, user_model
+
+    init_db()
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(user_model.User.__table__.insert(), {"id": 1, "email": "bench@example.com", "hashed_password": "-"})
+        for deck_id in range(1, DECKS + 1):
+            conn.execute(deck_model.Deck.__table__.insert(), {"id": deck_id, "name": f"Deck {deck_id}", "user_id": 1})
+            conn.execute(card_model.Card.__table__.insert(), [
+                {
+                    "question": f"Q{i}", "answer": f"A{i}", "deck_id": deck_id,
+                    "interval": 1, "ease_factor": 2.5,
+                    "next_review_date": now - timedelta(minutes=random.randint(1, 100_000)),
+                }
+                for i in range(CARDS_PER_DECK)
+            ])
+    engine.dispose()
+
+
+def _worker(ready, start, results):
+    # Each process builds its own engine (and connection pool) on import.
+    from app.core.database import SessionLocal
+    from app.models import card_model, deck_model, user_model  # noqa: F401 (registers Deck and User)
+    from app.services import study_service
+
+    max_card_id = DECKS * CARDS_PER_DECK
+    reads = writes = 0
+    db = SessionLocal()
+    # Start all workers at the same moment, once every one of them has finished importing.
+    ready.put(True)
+    start.wait()
+    deadline = time.time() + DURATION_SECONDS
+    while time.time() < deadline:
+        if random.random() < WRITE_FRACTION:
+            db.query(card_model.Card).filter(
+                card_model.Card.id == random.randint(1, max_card_id)
+            ).update({
+                card_model.Card.interval: random.randint(1, 30),
+                card_model.Card.next_review_date: datetime.utcnow() + timedelta(days=1),
+            }, synchronize_session=False)
+            db.commit()
+            writes += 1
+        else:
+            study_service.get_next_cards_to_study(db, deck_id=random.randint(1, DECKS), user_id=1, limit=20)
+            db.commit()
+            reads += 1
+    db.close()
+    results.put((reads, writes))
+
+
+def main():
+    _setup()
+    from app.core.database import engine
+    print(f"database: {engine.url}  CPUs: {os.cpu_count()}")
+    print(f"{'workers':>7} | {'reads/s':>9} | {'writes/s':>9} | {'total ops/s':>11}")
+    print("-" * 46)
+    context = multiprocessing.get_context("spawn")
+    for workers in WORKER_COUNTS:
+        ready, start, results = context.Queue(), context.Event(), context.Queue()
+        processes = [context.Process(target=_worker, args=(ready, start, results)) for _ in range(workers)]
+        for process in processes:
+            process.start()
+        for _ in processes:
+            ready.get()
+        start.set()
+        totals = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+        reads = sum(r for r, _ in totals) / DURATION_SECONDS
+        writes = sum(w for _, w in totals) / DURATION_SECONDS
+        print(f"{workers:>7} | {reads:>9.0f} | {writes:>9.0f} | {reads + writes:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Benchmark for duplicate_service.
+
+Grows one deck from 1,000 to 300,000 cards of generated, sentence-like
+questions, about 1% of them exact copies and 1% one-letter edits of an earlier
+card. At every step it reports how long the duplicates report takes, how many
+of the planted copies and edits it found (counting the edits that are still
+near-duplicates of their original), and the median time of the check
+create_card() runs before adding a card. For comparison it times the naive
+report (comparing every pair of questions) on a sample of pairs and
+extrapolates it to the whole deck.
+
+Run from the backend directory:
+    python -m benchmarks.bench_duplicates
+"""
+import os
+import random
+import statistics
+import tempfile
+import time
+
+# The app reads its settings at import time, so point it at a throwaway
+# database before importing anything from it.
+_tmp_dir = tempfile.mkdtemp(prefix="lexilearn-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/bench.db")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import card_lsh_model, card_model, deck_model, user_model  # noqa: E402,F401
+from app.services import duplicate_service  # noqa: E402
+
+DECK_SIZES = [1_000, 10_000, 100_000, 300_000]
+COPY_RATE = 0.01
+EDIT_RATE = 0.01
+CHECKS = 200
+PAIRWISE_SAMPLE = 200_000
+INSERT_BATCH = 50_000
+
+_SYLLABLES = ["ka", "to", "ri", "men", "sa", "lo", "ver", "di", "an", "pe", "ul", "mo", "ther", "in", "es", "co"]
+_OPENERS = ["What is", "Who wrote", "Where is", "Define", "Translate", "When did", "How many", "Why does"]
+
+
+def _vocabulary(rng: random.Random, size: int = 20_000) -> list:
+    return ["".join(rng.choices(_SYLLABLES, k=rng.randint(2, 4))) for _ in range(size)]
+
+
+def _questions(rng: random.Random, vocabulary: list, stop: int, questions: list, planted: list, first_copies: dict):
+    """
+    Appends questions to `questions` until it holds `stop`, recording each
+    planted (original index, copy index, kind) in `planted`. The report stands a
+    copy's first copy in for it, so that's the original an edit of a copy is
+    recorded with; `first_copies` maps copies to it.
+    """
+    for i in range(len(questions), stop):
+        roll = rng.random()
+        if i and roll < COPY_RATE:
+            pick = rng.randrange(i)
+            original = first_copies.get(pick, pick)
+            questions.append(questions[original])
+            first_copies[i] = original
+            planted.append((original, i, "exact"))
+        elif i and roll < COPY_RATE + EDIT_RATE:
+            pick = rng.randrange(i)
+            original = first_copies.get(pick, pick)
+            text = questions[original]
+            position = rng.randrange(len(text) - 1)
+            edited = text[:position] + ("z" if text[position] != "z" else "y") + text[position + 1:]
+            questions.append(edited)
+            # On a short question one letter can be a big change; only count the
+            # edits that are near-duplicates by the service's own definition.
+            if duplicate_service.similarity(
+                duplicate_service.shingles(text), duplicate_service.shingles(edited)
+            ) >= duplicate_service.NEAR_DUPLICATE_THRESHOLD:
+                planted.append((original, i, "near"))
+        else:
+            words = " ".join(rng.choices(vocabulary, k=rng.randint(3, 6)))
+            questions.append(f"{rng.choice(_OPENERS)} {words}?")
+
+
+def _insert_cards(deck_id: int, questions: list, start: int) -> list:
+    """
+    Inserts the questions without fingerprints, the way cards created before the
+    duplicate index was added look, and returns their ids.
+    """
+    table = card_model.Card.__table__
+    ids = []
+    with engine.begin() as conn:
+        for batch_start in range(start, len(questions), INSERT_BATCH):
+            rows = [
+                {"question": question, "answer": "-", "deck_id": deck_id}
+                for question in questions[batch_start:batch_start + INSERT_BATCH]
+            ]
+            ids += conn.execute(table.insert().returning(table.c.id), rows).scalars().all()
+    return ids
+
+
+def _found(report: dict, card_ids: list, planted: list) -> tuple:
+    """
+    Returns (planted copies found, planted edits found): a plant counts as found
+    when its card and the original end up in the same group.
+    """
+    group_of = {}
+    for kind in ("exact", "near"):
+        for number, group in enumerate(report[kind]):
+            for card_id in group["card_ids"]:
+                group_of.setdefault(card_id, set()).add((kind, number))
+    found = {"exact": 0, "near": 0}
+    for original, copy, kind in planted:
+        if group_of.get(card_ids[original], set()) & group_of.get(card_ids[copy], set()):
+            found[kind] += 1
+    return found["exact"], found["near"]
+
+
+def _pairwise_seconds(rng: random.Random, questions: list) -> float:
+    """
+    Times Jaccard similarity on a sample of random pairs and extrapolates it to
+    every pair in the deck.
+    """
+    shingles = [duplicate_service.shingles(question) for question in rng.sample(questions, min(len(questions), 2000))]
+    pairs = [(rng.choice(shingles), rng.choice(shingles)) for _ in range(PAIRWISE_SAMPLE)]
+    started = time.perf_counter()
+    for first, second in pairs:
+        duplicate_service.similarity(first, second)
+    per_pair = (time.perf_counter() - started) / PAIRWISE_SAMPLE
+    return per_pair * len(questions) * (len(questions) - 1) / 2
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = user_model.User(email="bench@example.com", hashed_password="-")
+    db.add(user)
+    db.flush()
+    deck = deck_model.Deck(name="Benchmark deck", user_id=user.id)
+    db.add(deck)
+    db.commit()
+    deck_id = deck.id
+
+    rng = random.Random(7)
+    vocabulary = _vocabulary(rng)
+    questions, planted, first_copies, card_ids = [], [], {}, []
+
+    print(f"{'cards':>8} | {'fingerprint s':>13} | {'report s':>8} | {'copies found':>12} | "
+          f"{'edits found':>11} | {'check ms':>8} | {'all pairs s':>11}")
+    print("-" * 92)
+    for size in DECK_SIZES:
+        start = len(questions)
+        _questions(rng, vocabulary, size, questions, planted, first_copies)
+        card_ids += _insert_cards(deck_id, questions, start)
+
+        started = time.perf_counter()
+        duplicate_service.fingerprint_cards(db, deck_id)
+        fingerprint_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        report = duplicate_service.report_duplicates(db, deck_id)
+        report_seconds = time.perf_counter() - started
+        db.commit()
+        copies, edits = _found(report, card_ids, planted)
+        planted_copies = sum(1 for plant in planted if plant[2] == "exact")
+
+        timings = []
+        for question in rng.sample(questions, CHECKS):
+            started = time.perf_counter()
+            duplicate_service.check_question(db, deck_id, duplicate_service.fingerprint(question))
+            timings.append(time.perf_counter() - started)
+        db.commit()
+
+        print(f"{size:>8,} | {fingerprint_seconds:>13.2f} | {report_seconds:>8.2f} | "
+              f"{copies:>5}/{planted_copies:<6} | {edits:>4}/{len(planted) - planted_copies:<6} | "
+              f"{statistics.median(timings) * 1000:>8.2f} | {_pairwise_seconds(rng, questions):>11,.0f}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
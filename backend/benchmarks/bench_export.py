@@ -0,0 +1,124 @@
+"""
+Benchmark for card_service.export_cards_response.
+
+Grows one deck from 10,000 to 1,000,000 cards and streams a CSV and a JSONL
+export of it at every step, reporting the time taken and the peak Python memory
+allocated while exporting. The export reads and writes EXPORT_BATCH_SIZE rows at
+a time, so its peak stays flat while the deck grows a hundredfold. For
+comparison it also measures the old way of pulling a deck (load every card
+with .all(), then serialize the list), up to 100,000 cards.
+
+Run from the backend directory:
+    python -m benchmarks.bench_export
+"""
+import asyncio
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# The app reads its settings at import time, so point it at a throwaway
+# database before importing anything from it.
+_tmp_dir = tempfile.mkdtemp(prefix="lexilearn-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/bench.db")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import card_model, deck_model, user_model  # noqa: E402
+from app.schemas import card_schema  # noqa: E402
+from app.services import card_service  # noqa: E402
+
+DECK_SIZES = [10_000, 100_000, 1_000_000]
+MATERIALIZED_MAX_SIZE = 100_000
+INSERT_BATCH = 50_000
+
+
+def _insert_cards(deck_id: int, start: int, stop: int):
+    now = datetime.utcnow()
+    table = card_model.Card.__table__
+    with engine.begin() as conn:
+        for batch_start in range(start, stop, INSERT_BATCH):
+            conn.execute(table.insert(), [
+                {
+                    "question": f"What is the answer to question {i}?",
+                    "answer": f"Answer {i}, with a comma",
+                    "hint": f"Starts with 'Answer {i // 10}'",
+                    "deck_id": deck_id,
+                    "interval": i % 30 + 1,
+                    "ease_factor": 1.3 + (i % 17) / 10,
+                    "next_review_date": now + timedelta(minutes=i % 100_000),
+                }
+                for i in range(batch_start, min(batch_start + INSERT_BATCH, stop))
+            ])
+
+
+async def _drain(response) -> int:
+    size = 0
+    async for chunk in response.body_iterator:
+        size += len(chunk)
+    return size
+
+
+def _measure(export) -> tuple:
+    """
+    Runs export() twice: timed, then under tracemalloc (which slows it down too
+    much to time). Returns (seconds, bytes written, peak MB).
+    """
+    started = time.perf_counter()
+    size = export()
+    elapsed = time.perf_counter() - started
+    tracemalloc.start()
+    export()
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return elapsed, size, peak
+
+
+def _streamed(db, deck_id: int, user_id: int, file_format: str):
+    response = card_service.export_cards_response(db, deck_id, user_id, file_format)
+    db.commit()
+    return asyncio.run(_drain(response))
+
+
+def _materialized(db, deck_id: int):
+    cards = db.query(card_model.Card).filter(card_model.Card.deck_id == deck_id).all()
+    body = json.dumps([card_schema.Card.model_validate(card).model_dump() for card in cards])
+    db.expunge_all()
+    db.commit()
+    return len(body)
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = user_model.User(email="bench@example.com", hashed_password="-")
+    db.add(user)
+    db.flush()
+    deck = deck_model.Deck(name="Benchmark deck", user_id=user.id)
+    db.add(deck)
+    db.commit()
+    deck_id, user_id = deck.id, user.id
+
+    print(f"{'cards':>10} | {'export':<12} | {'seconds':>8} | {'MB written':>10} | {'peak MB':>8}")
+    print("-" * 62)
+    inserted = 0
+    for size in DECK_SIZES:
+        _insert_cards(deck_id, inserted, size)
+        inserted = size
+
+        runs = [(f"{file_format} stream", lambda f=file_format: _streamed(db, deck_id, user_id, f))
+                for file_format in ("csv", "jsonl")]
+        if size <= MATERIALIZED_MAX_SIZE:
+            runs.append(("all() + json", lambda: _materialized(db, deck_id)))
+        for label, export in runs:
+            elapsed, written, peak = _measure(export)
+            print(f"{size:>10,} | {label:<12} | {elapsed:>8.2f} | {written / 2**20:>10.1f} | {peak:>8.1f}")
+        print("-" * 62)
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Cold-start budget check for a uvicorn worker.
+
+Imports app.main in fresh interpreters and checks that:
+  - it works with no GEMINI_API_KEY set,
+  - it doesn't touch the database (the SQLite file must not be created),
+  - it doesn't import httpx (the AI client is only set up on first use),
+  - the median import time is within --budget-ms.
+Then it starts a real uvicorn worker and times how long it takes to serve its
+first request (import plus startup, which is where the schema is created),
+checked against --startup-budget-ms.
+
+Prints the slowest imports from `python -X importtime` so a regression points
+at the module that caused it. Exits with 1 when a check fails, so it can gate CI.
+
+Run from the backend directory:
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --runs 10 --budget-ms 1500
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PORT = 8792
+
+IMPORT_PROBE = """
+import sys, time
+started = time.perf_counter()
+import app.main
+print(time.perf_counter() - started)
+print("httpx" in sys.modules)
+"""
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_import")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=2000.0, help="Max median import time of app.main.")
+    parser.add_argument("--startup-budget-ms", type=float, default=5000.0, help="Max time for a worker to serve its first request.")
+    parser.add_argument("--top", type=int, default=12, help="How many of the slowest imports to list.")
+    return parser.parse_args(argv)
+
+
+def _env(tmp_dir: str) -> dict:
+    env = {key: value for key, value in os.environ.items() if key != "GEMINI_API_KEY"}
+    env["DATABASE_URL"] = f"sqlite:///{tmp_dir}/cold.db"
+    env["REVIEW_LOG_SPOOL_PATH"] = os.path.join(tmp_dir, "review_log.spool.jsonl")
+    return env
+
+
+def _slowest_imports(env: dict, top: int) -> list:
+    """
+    (cumulative ms, module) for the slowest packages and app modules that app.main pulls in.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        module = module.strip()
+        # Top-level packages and our own modules; a package's submodules would repeat its time.
+        if "." not in module or module.startswith("app."):
+            timings.append((int(cumulative_us) / 1000, module))
+    return sorted(timings, reverse=True)[:top]
+
+
+def _time_first_request(env: dict) -> float:
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+            try:
+                httpx.get(f"http://127.0.0.1:{PORT}/", timeout=1)
+                return (time.perf_counter() - started) * 1000
+            except httpx.TransportError:
+                time.sleep(0.01)
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main(argv=None):
+    args = _parse_args(argv if argv is not None else sys.argv[1:])
+    failures = []
+
+    timings = []
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            result = subprocess.run(
+                [sys.executable, "-c", IMPORT_PROBE],
+                cwd=BACKEND_DIR, env=_env(tmp_dir), capture_output=True, text=True,
+            )
+            if result.returncode != 0:
+                print(result.stderr)
+                print("FAIL: app.main could not be imported without a GEMINI_API_KEY")
+                sys.exit(1)
+            seconds, httpx_imported = result.stdout.split()
+            timings.append(float(seconds) * 1000)
+            if os.path.exists(os.path.join(tmp_dir, "cold.db")):
+                failures.append("importing app.main created the database")
+            if httpx_imported == "True":
+                failures.append("importing app.main imported httpx")
+
+    median = statistics.median(timings)
+    print(f"import app.main: median {median:.0f} ms, min {min(timings):.0f} ms, max {max(timings):.0f} ms ({args.runs} runs)")
+    if median > args.budget_ms:
+        failures.append(f"median import time {median:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        env = _env(tmp_dir)
+        print("\nslowest imports (cumulative ms):")
+        for cumulative_ms, module in _slowest_imports(env, args.top):
+            print(f"  {cumulative_ms:8.1f}  {module}")
+
+        first_request = _time_first_request(env)
+    print(f"\nuvicorn worker, spawn to first response: {first_request:.0f} ms")
+    if first_request > args.startup_budget_ms:
+        failures.append(f"worker startup {first_request:.0f} ms is over the {args.startup_budget_ms:.0f} ms budget")
+
+    # The same failure can show up on every run; report it once.
+    for failure in dict.fromkeys(failures):
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("OK: within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Login throughput vs. latency of the other endpoints.
+
+Hammers /api/users/login with concurrent clients for a fixed duration while a
+separate client keeps listing decks, then reports logins per second and the
+p50/p99 latency of the deck listing. bcrypt runs in the password worker pool,
+so a login burst should barely move the deck listing's p99; logins beyond
+PASSWORD_HASH_MAX_PENDING are shed with 503s instead of queueing.
+
+Run from the backend directory:
+    python -m benchmarks.bench_login
+"""
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+DURATION_SECONDS = 10
+CONCURRENT_LOGINS = 16
+
+_tmp_dir = tempfile.mkdtemp(prefix="lexilearn-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/bench.db")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from app.core.security import shutdown_password_pool  # noqa: E402
+
+CREDENTIALS = {"username": "bench@example.com", "password": "benchmark-password"}
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def _login_loop(client, deadline, statuses):
+    while time.perf_counter() < deadline:
+        response = await client.post("/api/users/login", data=CREDENTIALS)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+async def _deck_listing_loop(client, headers, deadline, timings):
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await client.get("/api/decks/", headers=headers)
+        timings.append((time.perf_counter() - started) * 1000)
+
+
+async def main():
+    # ASGITransport doesn't run the app's lifespan, which is where tables are created.
+    init_db()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://app", timeout=60) as client:
+        await client.post("/api/users/signup", json={
+            "email": CREDENTIALS["username"], "password": CREDENTIALS["password"],
+        })
+        token = (await client.post("/api/users/login", data=CREDENTIALS)).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        # Baseline: deck listing with no login traffic.
+        baseline = []
+        await _deck_listing_loop(client, headers, time.perf_counter() + 2, baseline)
+
+        statuses = {}
+        under_load = []
+        deadline = time.perf_counter() + DURATION_SECONDS
+        await asyncio.gather(
+            _deck_listing_loop(client, headers, deadline, under_load),
+            *(_login_loop(client, deadline, statuses) for _ in range(CONCURRENT_LOGINS)),
+        )
+
+    shutdown_password_pool()
+    print(f"concurrent login clients: {CONCURRENT_LOGINS}, duration: {DURATION_SECONDS}s")
+    print(f"login responses by status: {statuses}")
+    print(f"successful logins/sec: {statuses.get(200, 0) / DURATION_SECONDS:.1f}")
+    for label, timings in (("idle", baseline), ("during logins", under_load)):
+        print(
+            f"deck listing ({label}): p50 {statistics.median(timings):6.2f} ms"
+            f"   p99 {_percentile(timings, 0.99):6.2f} ms   ({len(timings)} requests)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
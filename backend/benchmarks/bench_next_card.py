@@ -0,0 +1,87 @@
+"""
+Benchmark for study_service.get_next_card_to_study.
+
+Grows the due backlog of a single deck from 10 to 1,000,000 cards and times
+the next-card lookup at every step. With the (deck_id, next_review_date)
+index the latency should stay flat as the backlog grows.
+
+Run from the backend directory:
+    python -m benchmarks.bench_next_card
+"""
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# The app reads its settings at import time, so point it at a throwaway
+# database before importing anything from it.
+_tmp_dir = tempfile.mkdtemp(prefix="lexilearn-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/bench.db")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import card_model, deck_model, user_model  # noqa: E402
+from app.services import study_service  # noqa: E402
+
+BACKLOG_SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+RUNS_PER_SIZE = 200
+INSERT_BATCH = 50_000
+
+
+def _insert_due_cards(deck_id: int, start: int, stop: int):
+    """Bulk-inserts due cards with ids in [start, stop) and spread-out due dates."""
+    now = datetime.utcnow()
+    table = card_model.Card.__table__
+    with engine.begin() as conn:
+        for batch_start in range(start, stop, INSERT_BATCH):
+            batch_stop = min(batch_start + INSERT_BATCH, stop)
+            conn.execute(table.insert(), [
+                {
+                    "question": f"Question {i}",
+                    "answer": f"Answer {i}",
+                    "deck_id": deck_id,
+                    "interval": 1,
+                    "ease_factor": 2.5,
+                    # Every card is overdue by a different number of minutes.
+                    "next_review_date": now - timedelta(minutes=(i * 7919) % 525_600 + 1),
+                }
+                for i in range(batch_start, batch_stop)
+            ])
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = user_model.User(email="bench@example.com", hashed_password="-")
+    db.add(user)
+    db.flush()
+    deck = deck_model.Deck(name="Benchmark deck", user_id=user.id)
+    db.add(deck)
+    db.commit()
+    deck_id, user_id = deck.id, user.id
+
+    print(f"{'due cards':>10} | {'median ms':>10} | {'p95 ms':>8}")
+    print("-" * 35)
+    inserted = 0
+    for size in BACKLOG_SIZES:
+        _insert_due_cards(deck_id, inserted, size)
+        inserted = size
+
+        timings = []
+        for _ in range(RUNS_PER_SIZE):
+            db.expunge_all()
+            started = time.perf_counter()
+            card = study_service.get_next_card_to_study(db=db, deck_id=deck_id, user_id=user_id)
+            timings.append((time.perf_counter() - started) * 1000)
+            assert card is not None
+
+        timings.sort()
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        print(f"{size:>10,} | {statistics.median(timings):>10.3f} | {p95:>8.3f}")
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
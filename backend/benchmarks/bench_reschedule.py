@@ -0,0 +1,97 @@
+"""
+Benchmark for scheduler.reschedule_cards.
+
+Fills one deck with 1,000,000 reviewed cards, then reschedules the whole deck
+under each scheduler and reports how long the read, the vectorized recompute
+and the bulk write-back took together. For comparison it also times the
+naive approach (load each card as an ORM object, update it, flush) on a
+sample and extrapolates it to the full deck.
+
+Run from the backend directory:
+    python -m benchmarks.bench_reschedule
+"""
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+_tmp_dir = tempfile.mkdtemp(prefix="lexilearn-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/bench.db")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from app.core.database import SessionLocal, engine, init_db  # noqa: E402
+from app.models import card_model, deck_model, user_model  # noqa: E402,F401
+from app.services import scheduler  # noqa: E402
+
+CARDS = 1_000_000
+NAIVE_SAMPLE = 10_000
+INSERT_BATCH = 50_000
+
+
+def _insert_cards(deck_id: int):
+    now = datetime.utcnow()
+    rng = random.Random(42)
+    table = card_model.Card.__table__
+    with engine.begin() as conn:
+        for batch_start in range(0, CARDS, INSERT_BATCH):
+            rows = []
+            for i in range(batch_start, min(batch_start + INSERT_BATCH, CARDS)):
+                interval = rng.choice([1, 2, 5, 12, 30, 75, 190, 400])
+                reviewed = now - timedelta(days=rng.randint(0, interval))
+                rows.append({
+                    "question": f"Question {i}",
+                    "answer": f"Answer {i}",
+                    "deck_id": deck_id,
+                    "interval": interval,
+                    "ease_factor": rng.uniform(1.1, 3.0),
+                    "last_reviewed_at": reviewed,
+                    "next_review_date": reviewed + timedelta(days=interval),
+                })
+            conn.execute(table.insert(), rows)
+
+
+def _naive_reschedule(db, deck_id: int, algorithm: scheduler.Scheduler) -> int:
+    """One ORM object and one scalar scheduler call per card."""
+    cards = db.query(card_model.Card).filter(card_model.Card.deck_id == deck_id).limit(NAIVE_SAMPLE).all()
+    for card in cards:
+        interval, ease = algorithm.normalize_batch(
+            scheduler.np.array([card.interval]), scheduler.np.array([card.ease_factor])
+        )
+        card.interval, card.ease_factor = int(interval[0]), float(ease[0])
+        card.next_review_date = card.last_reviewed_at + timedelta(days=card.interval)
+    db.commit()
+    return len(cards)
+
+
+def main():
+    init_db()
+    db = SessionLocal()
+    deck = deck_model.Deck(name="Benchmark deck")
+    db.add(deck)
+    db.commit()
+    deck_id = deck.id
+
+    started = time.perf_counter()
+    _insert_cards(deck_id)
+    print(f"Inserted {CARDS:,} cards in {time.perf_counter() - started:.1f}s")
+
+    print(f"{'scheduler':>10} | {'cards':>10} | {'seconds':>8} | {'cards/s':>10}")
+    print("-" * 48)
+    for name in scheduler.SCHEDULERS:
+        algorithm = scheduler.create_scheduler(name)
+        started = time.perf_counter()
+        rescheduled = scheduler.reschedule_cards(db, deck_id=deck_id, algorithm=algorithm)
+        elapsed = time.perf_counter() - started
+        print(f"{name:>10} | {rescheduled:>10,} | {elapsed:>8.2f} | {rescheduled / elapsed:>10,.0f}")
+
+    started = time.perf_counter()
+    sampled = _naive_reschedule(db, deck_id, scheduler.create_scheduler("sm2"))
+    elapsed = time.perf_counter() - started
+    print(f"\nNaive per-card ORM loop: {sampled:,} cards in {elapsed:.2f}s "
+          f"(~{elapsed * CARDS / sampled:.0f}s for {CARDS:,} cards)")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
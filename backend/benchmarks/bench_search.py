@@ -0,0 +1,114 @@
+"""
+Benchmark for search_service.search_cards.
+
+Grows the cards table from 1,000 to 1,000,000 cards of generated text (words drawn
+from a Zipf-like vocabulary, so some words are everywhere and most are rare) and
+times a first page of results for a few kinds of query at every step. With the
+full-text index, latency grows with the number of cards a query ranks, not the
+size of the table; a query matching more than SEARCH_MAX_RANKED cards only ranks
+that many, which keeps even a word found on most cards in the tens of milliseconds.
+
+Run from the backend directory:
+    python -m benchmarks.bench_search
+"""
+import itertools
+import os
+import random
+import statistics
+import tempfile
+import time
+
+# The app reads its settings at import time, so point it at a throwaway
+# database before importing anything from it.
+_tmp_dir = tempfile.mkdtemp(prefix="lexilearn-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/bench.db")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.database import Base, SessionLocal, engine  # noqa: E402
+from app.models import card_model, deck_model, user_model  # noqa: E402
+from app.services import search_service  # noqa: E402
+
+TABLE_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+RUNS_PER_QUERY = 50
+INSERT_BATCH = 50_000
+DECKS = 100
+VOCABULARY_SIZE = 20_000
+PAGE_SIZE = 20
+
+_random = random.Random(42)
+VOCABULARY = [f"w{i}x" for i in range(VOCABULARY_SIZE)]
+# Zipf-like: word i is drawn with weight 1/(i+1).
+CUMULATIVE_WEIGHTS = list(itertools.accumulate(1 / (i + 1) for i in range(VOCABULARY_SIZE)))
+
+# (label, query, search one deck?)
+QUERIES = [
+    ("common word", VOCABULARY[0], False),
+    ("mid word", VOCABULARY[200], False),
+    ("rare word", VOCABULARY[5_000], False),
+    ("two words", f"{VOCABULARY[3]} {VOCABULARY[40]}", False),
+    ("prefix", VOCABULARY[1234][:4], False),
+    ("deck scoped", VOCABULARY[200], True),
+]
+
+
+def _sentence(words: int) -> str:
+    return " ".join(_random.choices(VOCABULARY, cum_weights=CUMULATIVE_WEIGHTS, k=words))
+
+
+def _insert_cards(deck_ids: list, user_id: int, count: int):
+    with engine.begin() as conn:
+        for batch_start in range(0, count, INSERT_BATCH):
+            rows = [
+                {"question": _sentence(8), "answer": _sentence(4), "deck_id": deck_ids[i % len(deck_ids)]}
+                for i in range(batch_start, min(batch_start + INSERT_BATCH, count))
+            ]
+            card_ids = conn.scalars(
+                insert(card_model.Card).returning(card_model.Card.id, sort_by_parameter_order=True), rows
+            ).all()
+            indexed = [{"id": card_id, "user_id": user_id, **row} for card_id, row in zip(card_ids, rows)]
+            for statement, params in search_service.index_cards_statements(indexed):
+                conn.execute(statement, params)
+
+
+def main():
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = user_model.User(email="bench@example.com", hashed_password="-")
+    db.add(user)
+    db.flush()
+    decks = [deck_model.Deck(name=f"Benchmark deck {i}", user_id=user.id) for i in range(DECKS)]
+    db.add_all(decks)
+    db.commit()
+    deck_ids, user_id = [deck.id for deck in decks], user.id
+
+    print(f"{'cards':>10} | {'query':<12} | {'ranked':>8} | {'median ms':>10} | {'p95 ms':>8}")
+    print("-" * 60)
+    inserted = 0
+    for size in TABLE_SIZES:
+        _insert_cards(deck_ids, user_id, size - inserted)
+        inserted = size
+
+        for label, query, scoped in QUERIES:
+            deck_id = deck_ids[0] if scoped else None
+            matches = len(search_service.search_cards(
+                db, query, user_id, deck_id, limit=search_service.SEARCH_MAX_RANKED
+            )["items"])
+            timings = []
+            for _ in range(RUNS_PER_QUERY):
+                started = time.perf_counter()
+                page = search_service.search_cards(db, query, user_id, deck_id, limit=PAGE_SIZE)
+                timings.append((time.perf_counter() - started) * 1000)
+                assert len(page["items"]) == min(PAGE_SIZE, matches)
+
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(f"{size:>10,} | {label:<12} | {matches:>8,} | {statistics.median(timings):>10.3f} | {p95:>8.3f}")
+        print("-" * 60)
+
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Shows that a slow model can't take down unrelated traffic.
+
+Starts the fake Gemini server with a large injected latency, floods the
+review and hint endpoints with concurrent requests, and meanwhile measures
+how long deck listings take. With the async AI client the deck listings
+should stay fast, and AI calls beyond the deadline fail fast instead of
+piling up.
+
+Run from the backend directory:
+    python -m benchmarks.bench_slow_ai
+"""
+import asyncio
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+AI_PORT = 8765
+AI_LATENCY_MS = 2000
+CONCURRENT_AI_REQUESTS = 200
+DECK_LISTINGS = 50
+
+_tmp_dir = tempfile.mkdtemp(prefix="lexilearn-bench-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{_tmp_dir}/bench.db")
+os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+os.environ["GEMINI_API_BASE_URL"] = f"http://127.0.0.1:{AI_PORT}"
+os.environ["FAKE_GEMINI_LATENCY_MS"] = str(AI_LATENCY_MS)
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.core.database import init_db  # noqa: E402
+from benchmarks import fake_gemini  # noqa: E402
+
+
+def _start_fake_gemini():
+    server = uvicorn.Server(uvicorn.Config(fake_gemini.app, port=AI_PORT, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+
+
+async def _setup(client: httpx.AsyncClient):
+    credentials = {"email": "bench@example.com", "password": "benchmark-password"}
+    await client.post("/api/users/signup", json=credentials)
+    response = await client.post(
+        "/api/users/login",
+        data={"username": credentials["email"], "password": credentials["password"]},
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    deck = (await client.post("/api/decks/", json={"name": "Bench"}, headers=headers)).json()
+    card = (await client.post(
+        f"/api/decks/{deck['id']}/cards",
+        json={"question": "Capital of France?", "answer": "Paris"},
+        headers=headers,
+    )).json()
+    return headers, card["id"]
+
+
+async def _timed(coro):
+    started = time.perf_counter()
+    response = await coro
+    return (time.perf_counter() - started) * 1000, response.status_code
+
+
+async def main():
+    _start_fake_gemini()
+    # ASGITransport doesn't run the app's lifespan, which is where tables are created.
+    init_db()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://app", timeout=60) as client:
+        headers, card_id = await _setup(client)
+
+        ai_calls = [
+            asyncio.create_task(_timed(client.get(f"/api/cards/{card_id}/hint", headers=headers)))
+            for _ in range(CONCURRENT_AI_REQUESTS)
+        ]
+        # Give the AI requests a head start so they are all in flight.
+        await asyncio.sleep(0.2)
+
+        deck_timings = []
+        for _ in range(DECK_LISTINGS):
+            elapsed, _status = await _timed(client.get("/api/decks/", headers=headers))
+            deck_timings.append(elapsed)
+
+        ai_results = await asyncio.gather(*ai_calls)
+
+    ai_timings = sorted(elapsed for elapsed, _ in ai_results)
+    statuses = {}
+    for _, status in ai_results:
+        statuses[status] = statuses.get(status, 0) + 1
+
+    print(f"AI latency injected: {AI_LATENCY_MS} ms, concurrent hint requests: {CONCURRENT_AI_REQUESTS}")
+    print(f"hint responses by status: {statuses}")
+    print(f"hint latency  median {statistics.median(ai_timings):8.1f} ms   max {ai_timings[-1]:8.1f} ms")
+    print(f"deck listing  median {statistics.median(deck_timings):8.1f} ms   max {max(deck_timings):8.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
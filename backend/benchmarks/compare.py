@@ -0,0 +1,98 @@
+"""
+Compares two benchmarks.load result files, endpoint by endpoint.
+
+Run from the backend directory:
+    python -m benchmarks.compare results/load-abc1234-....json results/load-def5678-....json
+    python -m benchmarks.compare base.json head.json --threshold 15 --fail-on-regression
+
+The first file is the baseline. A regression is a p95 or p99 latency that grew,
+or a throughput that dropped, by more than --threshold percent, or an endpoint
+that started returning errors. With --fail-on-regression the exit code is 1
+when there is one, so the comparison can gate CI.
+"""
+import argparse
+import json
+import sys
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.compare")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Percent change that counts as a regression.")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    return parser.parse_args(argv)
+
+
+def _change(before, after) -> float | None:
+    if not before or after is None:
+        return None
+    return (after - before) / before * 100
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> tuple:
+    """
+    Returns the table rows and the list of regressions found.
+    """
+    rows = []
+    regressions = []
+    labels = list(baseline["endpoints"]) + [
+        label for label in candidate["endpoints"] if label not in baseline["endpoints"]
+    ]
+    for label in labels + ["TOTAL"]:
+        before = baseline["total"] if label == "TOTAL" else baseline["endpoints"].get(label)
+        after = candidate["total"] if label == "TOTAL" else candidate["endpoints"].get(label)
+        if before is None or after is None:
+            rows.append((label, None, None, None, "only in " + ("candidate" if before is None else "baseline")))
+            continue
+        rps = _change(before["throughput_rps"], after["throughput_rps"])
+        p95 = _change(before["p95_ms"], after["p95_ms"])
+        p99 = _change(before["p99_ms"], after["p99_ms"])
+        notes = []
+        if rps is not None and rps < -threshold:
+            notes.append("throughput")
+        if p95 is not None and p95 > threshold:
+            notes.append("p95")
+        if p99 is not None and p99 > threshold:
+            notes.append("p99")
+        if after["errors"] > before["errors"] and after["errors"] / after["requests"] > before["errors"] / before["requests"]:
+            notes.append("errors")
+        if notes:
+            regressions.append((label, notes))
+        rows.append((label, rps, p95, p99, "REGRESSION: " + ", ".join(notes) if notes else ""))
+    return rows, regressions
+
+
+def _format_change(value) -> str:
+    return "n/a" if value is None else f"{value:+.1f}%"
+
+
+def main(argv=None):
+    args = _parse_args(argv if argv is not None else sys.argv[1:])
+    with open(args.baseline, encoding="utf-8") as baseline_file:
+        baseline = json.load(baseline_file)
+    with open(args.candidate, encoding="utf-8") as candidate_file:
+        candidate = json.load(candidate_file)
+
+    print(f"baseline:  {baseline['meta']['commit']} ({baseline['meta']['timestamp']})")
+    print(f"candidate: {candidate['meta']['commit']} ({candidate['meta']['timestamp']})")
+    if baseline["meta"]["config"] != candidate["meta"]["config"]:
+        print("warning: the runs used different configurations; deltas may not be comparable")
+
+    rows, regressions = compare(baseline, candidate, args.threshold)
+    header = f"{'endpoint':<40} | {'req/s':>8} | {'p95':>8} | {'p99':>8} |"
+    print(header)
+    print("-" * len(header))
+    for label, rps, p95, p99, note in rows:
+        print(f"{label:<40} | {_format_change(rps):>8} | {_format_change(p95):>8} | {_format_change(p99):>8} | {note}")
+
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {args.threshold:.0f}%")
+        if args.fail_on_regression:
+            sys.exit(1)
+    else:
+        print(f"No regressions beyond {args.threshold:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Synthetic data generator for benchmarks.
+
+Creates users, decks and cards at a configurable scale with bulk inserts,
+and writes a JSON manifest (credentials and each user's deck ids) that the
+load driver reads. Card due dates are spread from a month overdue to two
+months ahead, and a share of cards already have their hint, so the study and
+hint endpoints see realistic data.
+
+Run from the backend directory:
+    python -m benchmarks.datagen --database-url sqlite:///./bench.db \\
+        --users 10 --decks-per-user 20 --cards-per-deck 500 --manifest bench-manifest.json
+
+The database must be empty (or not exist yet); tables are created as needed.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+PASSWORD = "benchmark-password"
+INSERT_BATCH = 10_000
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.datagen")
+    parser.add_argument("--database-url", required=True)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--decks-per-user", type=int, default=20)
+    parser.add_argument("--cards-per-deck", type=int, default=200)
+    parser.add_argument("--hinted-share", type=float, default=0.5, help="Share of cards that already have a hint.")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--manifest", required=True, help="Where to write the JSON manifest.")
+    return parser.parse_args(argv)
+
+
+def generate(users: int, decks_per_user: int, cards_per_deck: int, hinted_share: float, seed: int) -> dict:
+    """
+    Fills the configured database and returns the manifest.
+    The app's settings are read at import time, so DATABASE_URL must be set first.
+    """
+    from app.core.database import SessionLocal, engine, init_db
+    from app.core.security import get_password_hash
+    from app.models import card_model, deck_model, review_log_model, user_model  # noqa: F401
+    from app.services import search_service
+
+    init_db()
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    # Every user gets the same password, so it is only hashed once.
+    hashed_password = get_password_hash(PASSWORD)
+    emails = [f"bench{i}@example.com" for i in range(users)]
+
+    with engine.begin() as conn:
+        conn.execute(user_model.User.__table__.insert(), [
+            {"email": email, "hashed_password": hashed_password} for email in emails
+        ])
+        user_ids = [row.id for row in conn.execute(user_model.User.__table__.select().order_by(user_model.User.id))]
+        conn.execute(deck_model.Deck.__table__.insert(), [
+            {"name": f"Deck {user} / {deck}", "user_id": user_id}
+            for user, user_id in enumerate(user_ids) for deck in range(decks_per_user)
+        ])
+        decks = conn.execute(deck_model.Deck.__table__.select().order_by(deck_model.Deck.id)).all()
+    deck_ids = [deck.id for deck in decks]
+    decks_by_user = {
+        email: [deck.id for deck in decks if deck.user_id == user_id] for email, user_id in zip(emails, user_ids)
+    }
+
+    cards = card_model.Card.__table__
+    batch = []
+    serial = 0
+    for deck_id in deck_ids:
+        for _ in range(cards_per_deck):
+            serial += 1
+            interval = rng.choice([1, 2, 5, 12, 30])
+            batch.append({
+                "deck_id": deck_id,
+                "question": f"What is the answer to question {serial}?",
+                "answer": f"Answer {serial}",
+                "hint": f"It starts with 'Answer {serial // 10}'" if rng.random() < hinted_share else None,
+                "interval": interval,
+                "ease_factor": 2.5,
+                "next_review_date": now + timedelta(minutes=rng.randint(-30 * 1440, 60 * 1440)),
+            })
+            if len(batch) >= INSERT_BATCH:
+                with engine.begin() as conn:
+                    conn.execute(cards.insert(), batch)
+                batch = []
+    if batch:
+        with engine.begin() as conn:
+            conn.execute(cards.insert(), batch)
+    # The bulk inserts bypass the card service, so index the cards for search in one pass.
+    with SessionLocal() as db:
+        search_service.rebuild_search_index(db)
+
+    return {
+        "password": PASSWORD,
+        "users": emails,
+        "deck_ids": deck_ids,
+        "decks_by_user": decks_by_user,
+        "cards": serial,
+        "seed": seed,
+    }
+
+
+def main(argv=None):
+    args = _parse_args(argv if argv is not None else sys.argv[1:])
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+
+    started = time.perf_counter()
+    manifest = generate(args.users, args.decks_per_user, args.cards_per_deck, args.hinted_share, args.seed)
+    with open(args.manifest, "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    print(
+        f"Generated {len(manifest['users'])} users, {len(manifest['deck_ids'])} decks and "
+        f"{manifest['cards']:,} cards in {time.perf_counter() - started:.1f}s -> {args.manifest}"
+    )
+
+
+if __name__ == "__main__":
+    main()
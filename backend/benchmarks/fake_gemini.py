@@ -0,0 +1,53 @@
+"""
+A local stand-in for the Gemini REST API, for benchmarks and manual testing.
+
+It answers `POST /v1beta/models/{model}:generateContent` after an injected
+delay, so you can see how the app behaves when the model is slow, and fails
+a configurable share of calls, so you can see how it behaves when the model
+is flaky.
+
+Run from the backend directory:
+    FAKE_GEMINI_LATENCY_MS=2000 python -m uvicorn benchmarks.fake_gemini:app --port 8001
+
+and point the app at it with GEMINI_API_BASE_URL=http://127.0.0.1:8001.
+
+Environment variables:
+    FAKE_GEMINI_LATENCY_MS   Delay before every response (default 500).
+    FAKE_GEMINI_JITTER_MS    Extra random delay, uniform in [0, jitter] (default 0).
+    FAKE_GEMINI_ERROR_RATE   Share of calls answered with a 500, 0.0-1.0 (default 0).
+    FAKE_GEMINI_REPLY        Text returned by the model (default "true").
+    FAKE_GEMINI_SEED         Seed for the jitter and errors, for repeatable runs.
+"""
+import asyncio
+import os
+import random
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+LATENCY_MS = float(os.environ.get("FAKE_GEMINI_LATENCY_MS", "500"))
+JITTER_MS = float(os.environ.get("FAKE_GEMINI_JITTER_MS", "0"))
+ERROR_RATE = float(os.environ.get("FAKE_GEMINI_ERROR_RATE", "0"))
+REPLY = os.environ.get("FAKE_GEMINI_REPLY", "true")
+
+_random = random.Random(os.environ.get("FAKE_GEMINI_SEED"))
+
+app = FastAPI(title="Fake Gemini")
+
+# Counts what the stub has served, so benchmarks can report it.
+stats = {"calls": 0, "errors": 0}
+
+
+@app.post("/v1beta/models/{model}:generateContent")
+async def generate_content(model: str):
+    stats["calls"] += 1
+    await asyncio.sleep((LATENCY_MS + _random.uniform(0, JITTER_MS)) / 1000)
+    if _random.random() < ERROR_RATE:
+        stats["errors"] += 1
+        return JSONResponse(status_code=500, content={"error": {"code": 500, "message": "Injected failure"}})
+    return {"candidates": [{"content": {"parts": [{"text": REPLY}]}}]}
+
+
+@app.get("/stats")
+async def get_stats():
+    return stats
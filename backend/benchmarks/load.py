@@ -0,0 +1,367 @@
+"""
+End-to-end load driver.
+
+By default it builds everything it needs in a temporary directory:
+  1. generates a database with benchmarks.datagen,
+  2. starts benchmarks.fake_gemini with the requested latency and error rate,
+  3. starts the API with uvicorn against both,
+then drives a weighted mix of the deck, card, study and login endpoints with
+concurrent clients for a fixed duration. It prints throughput, error counts
+and p50/p95/p99 latency per endpoint and writes the same numbers, with the
+git commit and run configuration, to a JSON file that benchmarks.compare
+can diff against another run.
+
+Run from the backend directory:
+    python -m benchmarks.load
+    python -m benchmarks.load --concurrency 64 --duration 60 --ai-latency-ms 800 --ai-error-rate 0.1
+    python -m benchmarks.load --db-async --output results/async.json
+
+To load an API that is already running, pass --base-url and the --manifest
+that benchmarks.datagen wrote for its database.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import httpx
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# Endpoint label -> relative weight in the request mix.
+SCENARIO_WEIGHTS = {
+    "GET /api/decks/": 10,
+    "GET /api/decks/{deck_id}": 5,
+    "GET /api/decks/{deck_id}/cards": 10,
+    "GET /api/decks/{deck_id}/study": 15,
+    "GET /api/decks/{deck_id}/study/batch": 10,
+    "PATCH /api/cards/{card_id}/review": 15,
+    "GET /api/cards/{card_id}/hint": 5,
+    "GET /api/decks/forecast": 5,
+    "GET /api/decks/{deck_id}/forecast": 5,
+    "POST /api/decks/{deck_id}/cards": 3,
+    "POST /api/users/login": 2,
+}
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.load")
+    scale = parser.add_argument_group("data scale")
+    scale.add_argument("--users", type=int, default=4)
+    scale.add_argument("--decks-per-user", type=int, default=25)
+    scale.add_argument("--cards-per-deck", type=int, default=200)
+    load = parser.add_argument_group("load")
+    load.add_argument("--concurrency", type=int, default=32)
+    load.add_argument("--duration", type=float, default=20.0, help="Seconds of measured load.")
+    load.add_argument("--warmup", type=float, default=2.0, help="Seconds of unmeasured load first.")
+    load.add_argument("--seed", type=int, default=42)
+    ai = parser.add_argument_group("fake AI server")
+    ai.add_argument("--ai-latency-ms", type=float, default=300.0)
+    ai.add_argument("--ai-jitter-ms", type=float, default=200.0)
+    ai.add_argument("--ai-error-rate", type=float, default=0.02)
+    server = parser.add_argument_group("API server")
+    server.add_argument("--db-async", action="store_true", help="Run the API with DB_ASYNC=true.")
+    server.add_argument("--bcrypt-rounds", type=int, default=12)
+    server.add_argument("--port", type=int, default=8790)
+    server.add_argument("--ai-port", type=int, default=8791)
+    server.add_argument("--base-url", help="Load an API that is already running instead of starting one.")
+    server.add_argument("--manifest", help="benchmarks.datagen manifest for the --base-url database.")
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/load-<commit>-<time>.json).")
+    args = parser.parse_args(argv)
+    if args.base_url and not args.manifest:
+        parser.error("--base-url needs the --manifest of the database it serves")
+    return args
+
+
+# --- Processes ---
+
+def _wait_until_up(url: str, process: subprocess.Popen):
+    for _ in range(300):
+        if process.poll() is not None:
+            raise RuntimeError(f"Server for {url} exited with code {process.returncode}")
+        try:
+            httpx.get(url, timeout=1)
+            return
+        except httpx.TransportError:
+            time.sleep(0.1)
+    raise RuntimeError(f"Server for {url} did not start")
+
+
+def _start_uvicorn(app_path: str, port: int, env: dict, log_path: str) -> subprocess.Popen:
+    # Server output goes to a log file so it doesn't interleave with the report.
+    with open(log_path, "w", encoding="utf-8") as log:
+        return subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", app_path, "--port", str(port), "--log-level", "warning"],
+            env={**os.environ, **env},
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# --- Load ---
+
+class Recorder:
+    """Collects (latency, ok) samples per endpoint while recording is on."""
+
+    def __init__(self):
+        self.recording = False
+        self.samples = {label: [] for label in SCENARIO_WEIGHTS}
+        self.errors = {label: 0 for label in SCENARIO_WEIGHTS}
+
+    def add(self, label: str, elapsed_ms: float, ok: bool):
+        if not self.recording:
+            return
+        self.samples[label].append(elapsed_ms)
+        if not ok:
+            self.errors[label] += 1
+
+
+async def _login(client: httpx.AsyncClient, email: str, password: str) -> dict:
+    response = await client.post("/api/users/login", data={"username": email, "password": password})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def _load_card_pool(client: httpx.AsyncClient, headers: dict, deck_ids: list) -> dict:
+    """deck id -> [(card id, answer)], from the first page of each deck's cards."""
+    pool = {}
+    for deck_id in deck_ids:
+        response = await client.get(f"/api/decks/{deck_id}/cards", params={"limit": 50}, headers=headers)
+        response.raise_for_status()
+        pool[deck_id] = [(card["id"], card["answer"]) for card in response.json()["items"]]
+    return {deck_id: cards for deck_id, cards in pool.items() if cards}
+
+
+async def _request(client, label, rng, headers, manifest, card_pool):
+    deck_id = rng.choice(list(card_pool))
+    card_id, answer = rng.choice(card_pool[deck_id])
+    if label == "GET /api/decks/":
+        return await client.get("/api/decks/", headers=headers)
+    if label == "GET /api/decks/{deck_id}":
+        return await client.get(f"/api/decks/{deck_id}", headers=headers)
+    if label == "GET /api/decks/{deck_id}/cards":
+        return await client.get(f"/api/decks/{deck_id}/cards", headers=headers)
+    if label == "GET /api/decks/{deck_id}/study":
+        return await client.get(f"/api/decks/{deck_id}/study", headers=headers)
+    if label == "GET /api/decks/{deck_id}/study/batch":
+        return await client.get(f"/api/decks/{deck_id}/study/batch", headers=headers)
+    if label == "PATCH /api/cards/{card_id}/review":
+        # Half the answers match exactly; the rest need the AI to judge them.
+        user_answer = answer if rng.random() < 0.5 else f"I think it is {answer.lower()}"
+        return await client.patch(
+            f"/api/cards/{card_id}/review",
+            json={"user_answer": user_answer, "latency_ms": rng.randint(1000, 15000)},
+            headers=headers,
+        )
+    if label == "GET /api/cards/{card_id}/hint":
+        return await client.get(f"/api/cards/{card_id}/hint", headers=headers)
+    if label == "GET /api/decks/forecast":
+        return await client.get("/api/decks/forecast", params={"days": 7}, headers=headers)
+    if label == "GET /api/decks/{deck_id}/forecast":
+        return await client.get(f"/api/decks/{deck_id}/forecast", params={"days": 30}, headers=headers)
+    if label == "POST /api/decks/{deck_id}/cards":
+        serial = rng.randint(0, 10**9)
+        return await client.post(
+            f"/api/decks/{deck_id}/cards",
+            json={"question": f"Load question {serial}", "answer": f"Load answer {serial}"},
+            headers=headers,
+        )
+    if label == "POST /api/users/login":
+        return await client.post(
+            "/api/users/login",
+            data={"username": rng.choice(manifest["users"]), "password": manifest["password"]},
+        )
+    raise ValueError(label)
+
+
+async def _worker(client, rng, headers, manifest, card_pool, recorder, deadline):
+    labels = list(SCENARIO_WEIGHTS)
+    weights = list(SCENARIO_WEIGHTS.values())
+    while time.perf_counter() < deadline:
+        label = rng.choices(labels, weights)[0]
+        started = time.perf_counter()
+        try:
+            response = await _request(client, label, rng, headers, manifest, card_pool)
+            ok = response.status_code < 400
+        except httpx.TransportError:
+            ok = False
+        recorder.add(label, (time.perf_counter() - started) * 1000, ok)
+
+
+async def _run_load(base_url: str, manifest: dict, args) -> tuple:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        sessions = [await _login(client, email, manifest["password"]) for email in manifest["users"]]
+        # Decks are private, so each session studies and edits its own user's decks.
+        card_pools = [
+            await _load_card_pool(client, headers, manifest["decks_by_user"][email])
+            for email, headers in zip(manifest["users"], sessions)
+        ]
+
+        recorder = Recorder()
+        started = time.perf_counter()
+        deadline = started + args.warmup + args.duration
+        workers = [
+            asyncio.create_task(_worker(
+                client, random.Random(args.seed + i), sessions[i % len(sessions)],
+                manifest, card_pools[i % len(sessions)], recorder, deadline,
+            ))
+            for i in range(args.concurrency)
+        ]
+        await asyncio.sleep(args.warmup)
+        recorder.recording = True
+        measured_from = time.perf_counter()
+        await asyncio.gather(*workers)
+        elapsed = time.perf_counter() - measured_from
+    return recorder, elapsed
+
+
+# --- Reporting ---
+
+def _percentile(ordered: list, fraction: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> dict:
+    endpoints = {}
+    all_samples = []
+    for label, samples in recorder.samples.items():
+        if not samples:
+            continue
+        ordered = sorted(samples)
+        all_samples.extend(samples)
+        endpoints[label] = {
+            "requests": len(samples),
+            "errors": recorder.errors[label],
+            "throughput_rps": len(samples) / elapsed,
+            "p50_ms": _percentile(ordered, 0.50),
+            "p95_ms": _percentile(ordered, 0.95),
+            "p99_ms": _percentile(ordered, 0.99),
+            "max_ms": ordered[-1],
+        }
+    ordered = sorted(all_samples)
+    total = {
+        "requests": len(ordered),
+        "errors": sum(recorder.errors.values()),
+        "throughput_rps": len(ordered) / elapsed,
+        "p50_ms": _percentile(ordered, 0.50) if ordered else None,
+        "p95_ms": _percentile(ordered, 0.95) if ordered else None,
+        "p99_ms": _percentile(ordered, 0.99) if ordered else None,
+    }
+    return {"endpoints": endpoints, "total": total}
+
+
+def print_report(summary: dict):
+    header = f"{'endpoint':<40} | {'reqs':>6} | {'err':>5} | {'req/s':>7} | {'p50 ms':>8} | {'p95 ms':>8} | {'p99 ms':>8}"
+    print(header)
+    print("-" * len(header))
+    rows = list(summary["endpoints"].items()) + [("TOTAL", summary["total"])]
+    for label, stats in rows:
+        print(
+            f"{label:<40} | {stats['requests']:>6} | {stats['errors']:>5} | {stats['throughput_rps']:>7.1f} | "
+            f"{stats['p50_ms'] or 0:>8.1f} | {stats['p95_ms'] or 0:>8.1f} | {stats['p99_ms'] or 0:>8.1f}"
+        )
+
+
+def main(argv=None):
+    args = _parse_args(argv if argv is not None else sys.argv[1:])
+    processes = []
+    ai_stats = None
+    try:
+        if args.base_url:
+            base_url = args.base_url
+            with open(args.manifest, encoding="utf-8") as manifest_file:
+                manifest = json.load(manifest_file)
+        else:
+            tmp_dir = tempfile.mkdtemp(prefix="lexilearn-load-")
+            database_url = f"sqlite:///{tmp_dir}/load.db"
+            manifest_path = os.path.join(tmp_dir, "manifest.json")
+            server_env = {
+                "DATABASE_URL": database_url,
+                "GEMINI_API_KEY": "benchmark",
+                "GEMINI_API_BASE_URL": f"http://127.0.0.1:{args.ai_port}",
+                "BCRYPT_ROUNDS": str(args.bcrypt_rounds),
+                "DB_ASYNC": "true" if args.db_async else "false",
+                "REVIEW_LOG_SPOOL_PATH": os.path.join(tmp_dir, "review_log.spool.jsonl"),
+            }
+            subprocess.run([
+                sys.executable, "-m", "benchmarks.datagen",
+                "--database-url", database_url, "--manifest", manifest_path, "--seed", str(args.seed),
+                "--users", str(args.users), "--decks-per-user", str(args.decks_per_user),
+                "--cards-per-deck", str(args.cards_per_deck),
+            ], env={**os.environ, **server_env}, check=True)
+            with open(manifest_path, encoding="utf-8") as manifest_file:
+                manifest = json.load(manifest_file)
+
+            ai_process = _start_uvicorn("benchmarks.fake_gemini:app", args.ai_port, {
+                "FAKE_GEMINI_LATENCY_MS": str(args.ai_latency_ms),
+                "FAKE_GEMINI_JITTER_MS": str(args.ai_jitter_ms),
+                "FAKE_GEMINI_ERROR_RATE": str(args.ai_error_rate),
+                "FAKE_GEMINI_SEED": str(args.seed),
+            }, os.path.join(tmp_dir, "fake_gemini.log"))
+            processes.append(ai_process)
+            _wait_until_up(f"http://127.0.0.1:{args.ai_port}/stats", ai_process)
+
+            api_process = _start_uvicorn("app.main:app", args.port, server_env, os.path.join(tmp_dir, "api.log"))
+            processes.append(api_process)
+            base_url = f"http://127.0.0.1:{args.port}"
+            _wait_until_up(f"{base_url}/", api_process)
+
+        if not args.base_url:
+            print(f"Server logs are in {tmp_dir}")
+        print(f"Loading {base_url} with {args.concurrency} clients for {args.duration:.0f}s...")
+        recorder, elapsed = asyncio.run(_run_load(base_url, manifest, args))
+        if not args.base_url:
+            ai_stats = httpx.get(f"http://127.0.0.1:{args.ai_port}/stats").json()
+    finally:
+        for process in reversed(processes):
+            process.terminate()
+            process.wait()
+
+    summary = summarize(recorder, elapsed)
+    print_report(summary)
+    if ai_stats:
+        print(f"Fake AI served {ai_stats['calls']} calls ({ai_stats['errors']} injected failures)")
+
+    commit = _git_commit()
+    result = {
+        "meta": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "config": {key: value for key, value in vars(args).items() if key not in ("output", "manifest")},
+            "scenario_weights": SCENARIO_WEIGHTS,
+            "measured_seconds": elapsed,
+        },
+        **summary,
+        "ai_stub": ai_stats,
+    }
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"load-{commit or 'nogit'}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as output_file:
+        json.dump(result, output_file, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
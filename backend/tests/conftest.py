@@ -0,0 +1,59 @@
+# The app reads its settings at import time, so point it at a throwaway database
+# (and away from the real AI) before anything imports it. Set DB_ASYNC=true in
+# the environment to run the suite against the AsyncSession path instead.
+import itertools
+import os
+import tempfile
+
+_tmp_dir = tempfile.mkdtemp(prefix="lexilearn-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_dir}/test.db"
+os.environ["GEMINI_API_KEY"] = ""
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["REVIEW_LOG_SPOOL_PATH"] = f"{_tmp_dir}/review_log.spool.jsonl"
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+_emails = (f"user{number}@example.com" for number in itertools.count())
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_user(client):
+    """
+    Signs up a new user and returns the Authorization headers for them.
+    """
+    def sign_up() -> dict:
+        email = next(_emails)
+        client.post("/api/users/signup", json={"email": email, "password": "password123"})
+        token = client.post("/api/users/login", data={"username": email, "password": "password123"})
+        return {"Authorization": f"Bearer {token.json()['access_token']}"}
+    return sign_up
+
+
+@pytest.fixture
+def auth(make_user):
+    return make_user()
+
+
+@pytest.fixture
+def make_deck(client):
+    """
+    Creates a deck with the given cards, as (question, answer) pairs, and returns its id.
+    """
+    def create(headers: dict, cards=(), name: str = "Deck") -> int:
+        deck_id = client.post("/api/decks/", json={"name": name}, headers=headers).json()["id"]
+        for question, answer in cards:
+            response = client.post(
+                f"/api/decks/{deck_id}/cards", json={"question": question, "answer": answer}, headers=headers
+            )
+            assert response.status_code == 201, response.text
+        return deck_id
+    return create
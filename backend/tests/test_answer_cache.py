@@ -0,0 +1,33 @@
+from app.services.answer_cache import VerificationCache, answers_match
+
+
+def test_answers_match_ignores_case_spacing_and_punctuation():
+    assert answers_match("Paris", "  paris ")
+    assert answers_match("The Eiffel-Tower.", "the eiffel tower")
+    assert answers_match("U.S.A.", "usa")
+
+
+def test_answers_match_keeps_word_breaks():
+    assert answers_match("New York", "new  york")
+    assert not answers_match("100", "10 0")
+    assert not answers_match("", "")
+
+
+def test_verification_cache_invalidates_one_card():
+    cache = VerificationCache(max_size=10, ttl_seconds=60)
+    cache.set(1, "Paris", "paris city", True)
+    cache.set(1, "Paris", "lyon", False)
+    cache.set(2, "Rome", "roma", True)
+    cache.invalidate_card(1)
+    assert cache.get(1, "Paris", "paris city") is None
+    assert cache.get(1, "Paris", "lyon") is None
+    assert cache.get(2, "Rome", "roma") is True
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 2, "hit_rate": 1 / 3}
+
+
+def test_verification_cache_forgets_evicted_keys():
+    cache = VerificationCache(max_size=1, ttl_seconds=60)
+    cache.set(1, "Paris", "paris city", True)
+    cache.set(2, "Rome", "roma", True)
+    assert cache.get(1, "Paris", "paris city") is None
+    assert cache._keys_by_card.keys() == {2}
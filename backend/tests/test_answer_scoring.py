@@ -0,0 +1,65 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from app.services.answer_scoring import score_answer
+from app.services.study_service import verify_answer
+
+EVAL_SET = Path(__file__).resolve().parent.parent / "benchmarks" / "answer_eval.jsonl"
+
+# Wrong answers that look close to the right one.
+WRONG_ANSWERS = [
+    ("Iraq", "Iran"),
+    ("Austria", "Australia"),
+    ("Louis XIV", "Louis XVI"),
+    ("World War I", "World War II"),
+    ("Henry V", "Henry VIII"),
+    ("Option A", "B"),
+    ("Vitamin C", "Vitamin D"),
+    ("Type 1 diabetes", "Type 2 diabetes"),
+    ("100", "10 0"),
+    ("3.14", "314"),
+    ("1066", "1067"),
+    ("Paris", "idk"),
+    ("absorption", "adsorption"),
+    ("The Earth orbits the Sun", "The Sun orbits the Earth"),
+    ("It converts light energy into chemical energy", "It converts chemical energy into light energy"),
+    ("From 1939 to 1945", "From 1945 to 1939"),
+]
+
+RIGHT_ANSWERS = [
+    ("Paris", "  paris "),
+    ("U.S.A.", "usa"),
+    ("The Eiffel-Tower.", "the eiffel tower"),
+    ("Eiffel Tower", "the eifel tower"),
+    ("8", "eight"),
+    ("Louis XIV", "King Louis XIV"),
+    ("The Earth orbits the Sun", "the earth orbits around the sun"),
+    ("salt and pepper", "pepper and salt"),
+    ("The Moon orbits the Earth, and the Earth orbits the Sun", "The Earth orbits the Sun and the Moon orbits the Earth"),
+]
+
+
+@pytest.mark.parametrize("correct_answer, user_answer", WRONG_ANSWERS)
+def test_close_wrong_answers_are_never_accepted(correct_answer, user_answer):
+    assert score_answer(correct_answer, user_answer).verdict is not True
+
+
+@pytest.mark.parametrize("correct_answer, user_answer", RIGHT_ANSWERS)
+def test_right_answers_are_accepted(correct_answer, user_answer):
+    assert score_answer(correct_answer, user_answer).verdict is True
+
+
+def test_eval_set_has_no_wrong_local_verdicts():
+    for line in EVAL_SET.read_text(encoding="utf-8").splitlines():
+        case = json.loads(line)
+        verdict = score_answer(case["correct_answer"], case["user_answer"]).verdict
+        assert verdict in (None, case["correct"]), case
+
+
+@pytest.mark.parametrize("correct_answer, user_answer", [("Iraq", "Iran"), ("George Washington", "Washington")])
+def test_unsure_answers_are_wrong_without_an_api_key(correct_answer, user_answer):
+    assert score_answer(correct_answer, user_answer).verdict is None
+    assert asyncio.run(verify_answer(1, correct_answer, user_answer)) is False
@@ -0,0 +1,36 @@
+def test_deck_list_etag_round_trip(client, auth, make_deck):
+    deck_id = make_deck(auth)
+    first = client.get("/api/decks/", headers=auth)
+    etag = first.headers["ETag"]
+
+    unchanged = client.get("/api/decks/", headers={**auth, "If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+
+    # Deck lists show card counts, so adding a card changes the list.
+    client.post(f"/api/decks/{deck_id}/cards", json={"question": "Q", "answer": "A"}, headers=auth)
+    changed = client.get("/api/decks/", headers={**auth, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert changed.json()["items"][0]["card_count"] == 1
+
+
+def test_card_list_etag_round_trip(client, auth, make_deck):
+    deck_id = make_deck(auth, [("Q", "A")])
+    first = client.get(f"/api/decks/{deck_id}/cards", headers=auth)
+    etag = first.headers["ETag"]
+    card_id = first.json()["items"][0]["id"]
+    assert client.get(f"/api/decks/{deck_id}/cards", headers={**auth, "If-None-Match": etag}).status_code == 304
+
+    client.patch(f"/api/cards/{card_id}", json={"answer": "B"}, headers=auth)
+    changed = client.get(f"/api/decks/{deck_id}/cards", headers={**auth, "If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["items"][0]["answer"] == "B"
+
+
+def test_etags_differ_between_users(client, make_user, make_deck):
+    first, second = make_user(), make_user()
+    make_deck(first)
+    make_deck(second)
+    etag = client.get("/api/decks/", headers=first).headers["ETag"]
+    assert client.get("/api/decks/", headers={**second, "If-None-Match": etag}).status_code == 200
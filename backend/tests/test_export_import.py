@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+
+import pytest
+
+# Cards with the awkward parts of CSV and JSON in them, and a schedule.
+CARDS = [
+    {
+        "question": "What does \"SQL\" stand for?",
+        "answer": "Structured Query Language",
+        "hint": "Databases, comma, quotes",
+        "interval": 6,
+        "ease_factor": 2.36,
+        "next_review_date": "2024-03-07T09:30:00",
+        "last_reviewed_at": "2024-03-01T09:30:00",
+    },
+    {
+        "question": "Name two primary colours, e.g. red, blue",
+        "answer": "Red, blue\nor yellow",
+        "hint": None,
+        "interval": 1,
+        "ease_factor": 2.5,
+        "next_review_date": "2024-01-02T00:00:00",
+        "last_reviewed_at": None,
+    },
+    {
+        "question": "Capital of Japan? 日本",
+        "answer": "Tōkyō",
+        "hint": "東",
+        "interval": 30,
+        "ease_factor": 1.3,
+        "next_review_date": "2024-05-01T00:00:00",
+        "last_reviewed_at": "2024-04-01T00:00:00",
+    },
+]
+
+
+def _import(client, headers: dict, deck_id: int, filename: str, content: bytes) -> dict:
+    response = client.post(
+        f"/api/decks/{deck_id}/cards/import", files={"file": (filename, content)}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def _export(client, headers: dict, deck_id: int, file_format: str) -> bytes:
+    response = client.get(f"/api/decks/{deck_id}/export", params={"format": file_format}, headers=headers)
+    assert response.status_code == 200
+    return response.content
+
+
+def _rows(content: bytes, file_format: str) -> list:
+    text = content.decode("utf-8")
+    if file_format == "csv":
+        rows = list(csv.DictReader(io.StringIO(text)))
+        # CSV has no null: empty cells are missing values.
+        return [{name: value or None for name, value in row.items()} for row in rows]
+    return [json.loads(line) for line in text.splitlines()]
+
+
+def _normalized(rows: list) -> list:
+    return [
+        {
+            **row,
+            "interval": int(row["interval"]),
+            "ease_factor": float(row["ease_factor"]),
+            "next_review_date": row["next_review_date"][:19],
+            "last_reviewed_at": row["last_reviewed_at"] and row["last_reviewed_at"][:19],
+        }
+        for row in rows
+    ]
+
+
+@pytest.mark.parametrize("file_format", ["csv", "jsonl"])
+def test_export_import_round_trip(client, auth, make_deck, file_format):
+    source = make_deck(auth)
+    jsonl = "\n".join(json.dumps(card, ensure_ascii=False) for card in CARDS).encode("utf-8")
+    assert _import(client, auth, source, "cards.jsonl", jsonl) == {"imported": 3, "failed": 0, "errors": []}
+
+    exported = _export(client, auth, source, file_format)
+    assert _normalized(_rows(exported, file_format)) == _normalized(CARDS)
+
+    copy = make_deck(auth)
+    assert _import(client, auth, copy, f"cards.{file_format}", exported)["imported"] == 3
+    assert _export(client, auth, copy, file_format) == exported
+
+
+def test_plain_csv_import_gets_default_schedule(client, auth, make_deck):
+    deck_id = make_deck(auth)
+    result = _import(client, auth, deck_id, "cards.csv", b"question,answer\nQ1,A1\nQ2,\nQ3,A3\n")
+    assert result["imported"] == 2
+    assert result["failed"] == 1
+    rows = _rows(_export(client, auth, deck_id, "csv"), "csv")
+    assert [(row["question"], row["interval"], row["ease_factor"]) for row in rows] == [
+        ("Q1", "1", "2.5"), ("Q3", "1", "2.5"),
+    ]
@@ -0,0 +1,86 @@
+# Another user's deck or card must look exactly like one that doesn't exist.
+import pytest
+
+
+@pytest.fixture
+def foreign(client, make_user, make_deck):
+    """
+    A deck and card owned by one user, and the headers of a different user.
+    """
+    owner = make_user()
+    deck_id = make_deck(owner, [("What is the capital of France?", "Paris")])
+    card_id = client.get(f"/api/decks/{deck_id}/cards", headers=owner).json()["items"][0]["id"]
+    return {"owner": owner, "intruder": make_user(), "deck_id": deck_id, "card_id": card_id}
+
+
+DECK_REQUESTS = [
+    ("GET", "/api/decks/{deck_id}", None),
+    ("PATCH", "/api/decks/{deck_id}", {"name": "Mine now"}),
+    ("GET", "/api/decks/{deck_id}/cards", None),
+    ("POST", "/api/decks/{deck_id}/cards", {"question": "Q", "answer": "A"}),
+    ("GET", "/api/decks/{deck_id}/export", None),
+    ("GET", "/api/decks/{deck_id}/duplicates", None),
+    ("GET", "/api/decks/{deck_id}/forecast", None),
+    ("POST", "/api/decks/{deck_id}/reschedule", None),
+    ("DELETE", "/api/decks/{deck_id}", None),
+]
+
+CARD_REQUESTS = [
+    ("PATCH", "/api/cards/{card_id}", {"answer": "Lyon"}),
+    ("PATCH", "/api/cards/{card_id}/review", {"user_answer": "Paris"}),
+    ("GET", "/api/cards/{card_id}/hint", None),
+    ("DELETE", "/api/cards/{card_id}", None),
+]
+
+
+@pytest.mark.parametrize("method, url, body", DECK_REQUESTS + CARD_REQUESTS)
+def test_other_users_deck_and_card_are_not_found(client, foreign, method, url, body):
+    response = client.request(
+        method, url.format(deck_id=foreign["deck_id"], card_id=foreign["card_id"]), json=body, headers=foreign["intruder"]
+    )
+    missing = client.request(method, url.format(deck_id=999999, card_id=999999), json=body, headers=foreign["intruder"])
+    assert response.status_code == 404
+    assert response.json() == missing.json()
+
+
+@pytest.mark.parametrize("url, empty", [("/api/decks/{deck_id}/study", None), ("/api/decks/{deck_id}/study/batch", [])])
+def test_other_users_deck_has_nothing_to_study(client, foreign, url, empty):
+    # Like a deck that doesn't exist: no due cards rather than a 404.
+    response = client.get(url.format(deck_id=foreign["deck_id"]), headers=foreign["intruder"])
+    assert response.status_code == 200
+    assert response.json() == empty
+    assert client.get(url.format(deck_id=foreign["deck_id"]), headers=foreign["owner"]).json()
+
+
+def test_other_users_deck_import_is_not_found(client, foreign):
+    response = client.post(
+        f"/api/decks/{foreign['deck_id']}/cards/import",
+        files={"file": ("cards.csv", b"question,answer\nQ,A\n", "text/csv")},
+        headers=foreign["intruder"],
+    )
+    assert response.status_code == 404
+
+
+def test_other_users_cards_stay_untouched(client, foreign):
+    for method, url, body in DECK_REQUESTS + CARD_REQUESTS:
+        url = url.format(deck_id=foreign["deck_id"], card_id=foreign["card_id"])
+        client.request(method, url, json=body, headers=foreign["intruder"])
+    cards = client.get(f"/api/decks/{foreign['deck_id']}/cards", headers=foreign["owner"]).json()["items"]
+    assert [(card["id"], card["answer"]) for card in cards] == [(foreign["card_id"], "Paris")]
+
+
+def test_other_users_decks_are_not_listed_or_searched(client, foreign):
+    intruder = foreign["intruder"]
+    assert client.get("/api/decks/", headers=intruder).json()["items"] == []
+    assert client.get("/api/cards/search", params={"q": "capital"}, headers=intruder).json()["items"] == []
+    assert client.get("/api/decks/forecast", headers=intruder).json()["decks"] == []
+
+
+def test_other_users_card_in_a_review_batch_is_not_found(client, foreign):
+    response = client.post(
+        "/api/reviews/batch",
+        json={"reviews": [{"card_id": foreign["card_id"], "user_answer": "Paris", "answered_at": "2024-01-01T00:00:00"}]},
+        headers=foreign["intruder"],
+    )
+    assert response.status_code == 200
+    assert response.json()["results"][0]["status"] == "not_found"
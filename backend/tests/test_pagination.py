@@ -0,0 +1,26 @@
+def _all_pages(client, url: str, headers: dict, limit: int) -> list:
+    ids, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        page = client.get(url, params=params, headers=headers).json()
+        ids += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_deck_pages_cover_every_deck_once(client, auth, make_deck):
+    deck_ids = [make_deck(auth, name=f"Deck {number}") for number in range(5)]
+    assert _all_pages(client, "/api/decks/", auth, limit=2) == deck_ids
+
+
+def test_card_pages_cover_every_card_once(client, auth, make_deck):
+    deck_id = make_deck(auth, [(f"Question {number}", "Answer") for number in range(7)])
+    card_ids = _all_pages(client, f"/api/decks/{deck_id}/cards", auth, limit=3)
+    assert len(card_ids) == 7
+    assert card_ids == sorted(set(card_ids))
+
+
+def test_invalid_cursor_is_rejected(client, auth, make_deck):
+    make_deck(auth)
+    assert client.get("/api/decks/", params={"cursor": "not-a-cursor"}, headers=auth).status_code == 400
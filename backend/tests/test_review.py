@@ -0,0 +1,32 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.services.scheduler import scheduler
+
+
+def _schedule(card_id: int):
+    with engine.connect() as conn:
+        return conn.execute(text("SELECT interval, ease_factor FROM cards WHERE id = :id"), {"id": card_id}).one()
+
+
+def test_concurrent_reviews_of_a_card_both_apply(client, auth, make_deck):
+    deck_id = make_deck(auth, [("What is the capital of France?", "Paris")])
+    card_id = client.get(f"/api/decks/{deck_id}/cards", headers=auth).json()["items"][0]["id"]
+    interval, ease_factor = _schedule(card_id)
+
+    def review(_):
+        return client.patch(f"/api/cards/{card_id}/review", json={"user_answer": "Paris"}, headers=auth)
+
+    # A lost update depends on timing, so give it a few chances to happen.
+    for _ in range(5):
+        with ThreadPoolExecutor(2) as pool:
+            responses = list(pool.map(review, range(2)))
+        assert [response.status_code for response in responses] == [200, 200]
+
+        # Each review builds on the other, as if they had come one after the other.
+        for _ in range(2):
+            interval, ease_factor, _ = scheduler.review(interval, ease_factor, True, datetime.utcnow())
+        assert tuple(_schedule(card_id)) == (interval, ease_factor)
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.review_log_service import review_log
+
+
+def _review(card_id: int, answered_at: datetime, user_answer: str = "Paris") -> dict:
+    return {"card_id": card_id, "user_answer": user_answer, "answered_at": answered_at.isoformat()}
+
+
+def _statuses(client, auth, reviews: list) -> list:
+    response = client.post("/api/reviews/batch", json={"reviews": reviews}, headers=auth)
+    assert response.status_code == 200, response.text
+    return [result["status"] for result in response.json()["results"]]
+
+
+@pytest.fixture
+def card_id(client, auth, make_deck):
+    deck_id = make_deck(auth, [("What is the capital of France?", "Paris")])
+    return client.get(f"/api/decks/{deck_id}/cards", headers=auth).json()["items"][0]["id"]
+
+
+@pytest.mark.parametrize("flushed", [False, True], ids=["buffered", "flushed"])
+def test_resubmitted_batch_is_all_duplicates(client, auth, card_id, flushed):
+    start = datetime.utcnow() - timedelta(hours=1)
+    reviews = [_review(card_id, start + timedelta(minutes=minutes)) for minutes in (0, 10, 20)]
+    assert _statuses(client, auth, reviews) == ["applied"] * 3
+    if flushed:
+        review_log.flush_or_spool()
+    assert _statuses(client, auth, reviews) == ["duplicate"] * 3
+
+
+def test_review_overtaken_by_a_later_one_is_stale(client, auth, card_id):
+    start = datetime.utcnow() - timedelta(hours=1)
+    assert _statuses(client, auth, [_review(card_id, start + timedelta(minutes=10))]) == ["applied"]
+    later_first = [_review(card_id, start), _review(card_id, start + timedelta(minutes=10))]
+    assert _statuses(client, auth, later_first) == ["stale", "duplicate"]
@@ -0,0 +1,150 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import text
+
+from app.core.database import engine
+from app.services.scheduler import LeitnerScheduler, SM2Scheduler, Scheduler, create_scheduler
+
+REVIEWED_AT = datetime(2024, 1, 1, 12, 0)
+
+
+def test_scheduler_is_abstract():
+    with pytest.raises(TypeError):
+        Scheduler()
+
+
+def test_unknown_scheduler_name():
+    with pytest.raises(ValueError):
+        create_scheduler("anki")
+
+
+def test_sm2_correct_answer_grows_interval_and_raises_ease():
+    interval, ease, next_review = SM2Scheduler().review(10, 2.5, True, REVIEWED_AT)
+    assert interval == 25
+    assert ease == pytest.approx(2.6)
+    assert next_review == REVIEWED_AT + timedelta(days=25)
+
+
+def test_sm2_wrong_answer_resets_interval_and_lowers_ease():
+    interval, ease, _ = SM2Scheduler().review(10, 2.5, False, REVIEWED_AT)
+    assert interval == 1
+    assert ease == pytest.approx(2.18)
+
+
+def test_sm2_ease_never_drops_below_minimum():
+    _, ease, _ = SM2Scheduler(min_ease=1.3).review(1, 1.3, False, REVIEWED_AT)
+    assert ease == pytest.approx(1.3)
+
+
+def test_sm2_card_recovers_from_lapses():
+    scheduler = SM2Scheduler()
+    _, ease, _ = scheduler.review(1, 1.3, True, REVIEWED_AT)
+    assert ease > 1.3
+
+
+def test_interval_always_moves_forward():
+    # round(1 * 1.3) is 1, but a correct answer still pushes the card a day further.
+    interval, _, _ = SM2Scheduler().review(1, 1.3, True, REVIEWED_AT)
+    assert interval == 2
+
+
+def test_interval_is_capped():
+    interval, _, _ = SM2Scheduler(max_interval=30).review(20, 2.5, True, REVIEWED_AT)
+    assert interval == 30
+
+
+def test_batch_matches_single_reviews():
+    scheduler = SM2Scheduler()
+    intervals = np.array([1, 4, 10, 200])
+    ease_factors = np.array([2.5, 1.3, 2.1, 3.0])
+    was_correct = np.array([True, True, False, True])
+    batch_intervals, batch_ease = scheduler.review_batch(intervals, ease_factors, was_correct)
+    for i in range(len(intervals)):
+        interval, ease, _ = scheduler.review(int(intervals[i]), float(ease_factors[i]), bool(was_correct[i]), REVIEWED_AT)
+        assert batch_intervals[i] == interval
+        assert batch_ease[i] == pytest.approx(ease)
+
+
+def test_leitner_doubles_and_resets():
+    scheduler = LeitnerScheduler()
+    assert scheduler.review(4, 2.5, True, REVIEWED_AT)[:2] == (8, 2.5)
+    assert scheduler.review(4, 2.5, False, REVIEWED_AT)[:2] == (1, 2.5)
+
+
+def test_leitner_normalize_snaps_to_boxes():
+    intervals, _ = LeitnerScheduler().normalize_batch(np.array([0, 1, 3, 5, 8, 9]), np.ones(6))
+    assert intervals.tolist() == [1, 1, 2, 4, 8, 8]
+
+
+def _schedule(card_id: int):
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT interval, next_review_date FROM cards WHERE id = :id"), {"id": card_id}
+        ).one()
+
+
+def test_reschedule_only_touches_the_users_decks(client, make_user, make_deck):
+    owner, other = make_user(), make_user()
+    owner_deck = make_deck(owner, [("Q1", "A1")])
+    other_deck = make_deck(other, [("Q2", "A2")])
+    owner_card = client.get(f"/api/decks/{owner_deck}/cards", headers=owner).json()["items"][0]["id"]
+    other_card = client.get(f"/api/decks/{other_deck}/cards", headers=other).json()["items"][0]["id"]
+    # An interval beyond the cap, which rescheduling brings back down.
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE cards SET interval = 100000, last_reviewed_at = :at WHERE id IN (:a, :b)"),
+            {"at": REVIEWED_AT, "a": owner_card, "b": other_card},
+        )
+
+    response = client.post("/api/decks/reschedule", headers=owner)
+    assert response.status_code == 200
+    assert response.json()["rescheduled"] == 1
+    assert _schedule(owner_card).interval < 100000
+    assert _schedule(other_card).interval == 100000
+
+
+def test_reschedule_uses_the_decks_own_settings(client, auth, make_deck):
+    capped_deck, other_deck = make_deck(auth, [("Q1", "A1")]), make_deck(auth, [("Q2", "A2")])
+    capped_card = client.get(f"/api/decks/{capped_deck}/cards", headers=auth).json()["items"][0]["id"]
+    other_card = client.get(f"/api/decks/{other_deck}/cards", headers=auth).json()["items"][0]["id"]
+    with engine.begin() as conn:
+        conn.execute(
+            text("UPDATE cards SET interval = 100, last_reviewed_at = :at WHERE id IN (:a, :b)"),
+            {"at": REVIEWED_AT, "a": capped_card, "b": other_card},
+        )
+
+    response = client.patch(
+        f"/api/decks/{capped_deck}", json={"scheduler_algorithm": "leitner", "scheduler_max_interval_days": 30},
+        headers=auth,
+    )
+    assert response.status_code == 200
+    assert response.json()["scheduler_algorithm"] == "leitner"
+    assert client.post("/api/decks/reschedule", headers=auth).json()["rescheduled"] == 2
+
+    # Capped at 30 days, then snapped down to a Leitner box.
+    assert _schedule(capped_card).interval == 16
+    assert datetime.fromisoformat(_schedule(capped_card).next_review_date) == REVIEWED_AT + timedelta(days=16)
+    assert _schedule(other_card).interval == 100
+
+
+def test_reviews_use_the_decks_own_settings(client, auth, make_deck):
+    deck_id = make_deck(auth, [("What is the capital of France?", "Paris")])
+    card_id = client.get(f"/api/decks/{deck_id}/cards", headers=auth).json()["items"][0]["id"]
+    client.patch(f"/api/decks/{deck_id}", json={"scheduler_algorithm": "leitner"}, headers=auth)
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE cards SET interval = 8, ease_factor = 1.3 WHERE id = :id"), {"id": card_id})
+
+    client.patch(f"/api/cards/{card_id}/review", json={"user_answer": "Paris"}, headers=auth)
+    assert _schedule(card_id).interval == 16
+    review = {"card_id": card_id, "user_answer": "Paris", "answered_at": datetime.utcnow().isoformat()}
+    results = client.post("/api/reviews/batch", json={"reviews": [review]}, headers=auth).json()["results"]
+    assert results[0]["status"] == "applied"
+    assert _schedule(card_id).interval == 32
+
+
+def test_invalid_deck_scheduler_settings_are_rejected(client, auth, make_deck):
+    deck_id = make_deck(auth)
+    for body in ({"scheduler_algorithm": "anki"}, {"scheduler_max_interval_days": 0}):
+        assert client.patch(f"/api/decks/{deck_id}", json=body, headers=auth).status_code == 422
@@ -0,0 +1,13 @@
+def test_search_pages_cover_every_match_once(client, auth, make_deck):
+    make_deck(auth, [(f"Owl fact {number}", "bird " * (number % 3 + 1)) for number in range(7)])
+    make_deck(auth, [("Cat fact", "mammal")])
+    ids, cursor = [], None
+    while True:
+        params = {"q": "owl", "limit": 2, **({"cursor": cursor} if cursor else {})}
+        page = client.get("/api/cards/search", params=params, headers=auth).json()
+        assert page["truncated"] is False
+        ids += [item["id"] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert len(ids) == len(set(ids)) == 7
@@ -36,7 +36,7 @@ const actionButtonStyle = {
     backgroundColor: 'var(--bg-light)',
 };
 
-function DeckCard({ deck, onEdit, onDelete }) {
+function DeckCard({ deck, dueToday, onEdit, onDelete }) {
     const navigate = useNavigate();
 
     const handleMouseOver = (e) => {
@@ -78,6 +78,7 @@ function DeckCard({ deck, onEdit, onDelete }) {
                 */}
                 <p style={{ color: 'var(--text-secondary)' }}>
                     {deck.card_count} {deck.card_count === 1 ? 'card' : 'cards'}
+                    {dueToday > 0 && ` · ${dueToday} due today`}
                 </p>
             </div>
 
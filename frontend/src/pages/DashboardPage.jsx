@@ -35,6 +35,8 @@ const deckGridStyle = {
 function DashboardPage() {
     // --- State Management ---
     const [decks, setDecks] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null); // Cursor for the next page of decks, if any
+    const [dueToday, setDueToday] = useState({}); // deck id -> cards due today (including overdue)
     const [loading, setLoading] = useState(true);
     const [actionLoading, setActionLoading] = useState(false); // For create/update actions
     const [error, setError] = useState('');
@@ -53,8 +55,15 @@ function DashboardPage() {
         if (!token) return;
         try {
             setLoading(true);
-            const response = await api.getDecks(token);
-            setDecks(response.data);
+            const [response, forecast] = await Promise.all([
+                api.getDecks(token),
+                api.getForecast(1, token),
+            ]);
+            setDecks(response.data.items);
+            setNextCursor(response.data.next_cursor);
+            setDueToday(Object.fromEntries(
+                forecast.data.decks.map(deckForecast => [deckForecast.deck_id, deckForecast.days[0].due])
+            ));
         } catch (err) {
             setError('Failed to load decks.');
         } finally {
@@ -62,6 +71,23 @@ function DashboardPage() {
         }
     };
 
+    const loadMoreDecks = async () => {
+        try {
+            setLoading(true);
+            const response = await api.getDecks(token, nextCursor);
+            // Skip decks we already have (e.g. ones created since the first page loaded).
+            setDecks(prevDecks => {
+                const knownIds = new Set(prevDecks.map(deck => deck.id));
+                return [...prevDecks, ...response.data.items.filter(deck => !knownIds.has(deck.id))];
+            });
+            setNextCursor(response.data.next_cursor);
+        } catch (err) {
+            setError('Failed to load more decks.');
+        } finally {
+            setLoading(false);
+        }
+    };
+
     useEffect(() => {
         fetchDecks();
     }, [token]);
@@ -140,11 +166,18 @@ function DashboardPage() {
                         <DeckCard 
                             key={deck.id} 
                             deck={deck}
+                            dueToday={dueToday[deck.id] ?? 0}
                             onEdit={openEditModal}      // Pass the handler function down as a prop
                             onDelete={handleDeleteDeck} // Pass the handler function down as a prop
                         />
                     ))}
                 </div>
+
+                {nextCursor && (
+                    <button onClick={loadMoreDecks} disabled={loading} style={{ marginTop: '30px' }}>
+                        {loading ? 'Loading...' : 'Load More Decks'}
+                    </button>
+                )}
             </main>
 
             {/* --- Modals for Create and Edit --- */}
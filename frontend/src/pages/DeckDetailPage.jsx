@@ -52,6 +52,7 @@ function DeckDetailPage() {
     const navigate = useNavigate();
     
     const [cards, setCards] = useState([]);
+    const [nextCursor, setNextCursor] = useState(null); // Cursor for the next page of cards, if any
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState('');
     const [actionLoading, setActionLoading] = useState(false);
@@ -70,7 +71,8 @@ function DeckDetailPage() {
         try {
             setLoading(true);
             const response = await api.getCardsInDeck(deckId, token);
-            setCards(response.data);
+            setCards(response.data.items);
+            setNextCursor(response.data.next_cursor);
         } catch (err) {
             setError('Failed to load cards.');
         } finally {
@@ -78,6 +80,23 @@ function DeckDetailPage() {
         }
     };
 
+    const loadMoreCards = async () => {
+        try {
+            setLoading(true);
+            const response = await api.getCardsInDeck(deckId, token, nextCursor);
+            // Skip cards we already have (e.g. ones added since the first page loaded).
+            setCards(prevCards => {
+                const knownIds = new Set(prevCards.map(card => card.id));
+                return [...prevCards, ...response.data.items.filter(card => !knownIds.has(card.id))];
+            });
+            setNextCursor(response.data.next_cursor);
+        } catch (err) {
+            setError('Failed to load more cards.');
+        } finally {
+            setLoading(false);
+        }
+    };
+
     useEffect(() => {
         fetchCards();
     }, [deckId, token]);
@@ -92,8 +111,12 @@ function DeckDetailPage() {
             setCards(prevCards => [...prevCards, response.data]);
             setNewQuestion('');
             setNewAnswer('');
+            setError('');
         } catch (err) {
             console.error("Failed to create card:", err);
+            if (err.response?.status === 409) {
+                setError(err.response.data.detail);
+            }
         } finally {
             setActionLoading(false);
         }
@@ -172,6 +195,12 @@ function DeckDetailPage() {
                     )}
                 </div>
 
+                {nextCursor && (
+                    <button onClick={loadMoreCards} disabled={loading} style={{ alignSelf: 'center' }}>
+                        {loading ? 'Loading...' : 'Load More Cards'}
+                    </button>
+                )}
+
                 {/* "Add New Card" Form */}
                 <form onSubmit={handleAddCard} style={formStyle}>
                     <h3>Add a New Card</h3>
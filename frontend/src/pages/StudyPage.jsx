@@ -1,4 +1,4 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useParams, Link } from 'react-router-dom';
 import { useAuth } from '../context/AuthContext';
 import * as api from '../services/apiService';
@@ -26,6 +26,11 @@ const feedbackStyle = {
     height: '30px', // Reserve space to prevent layout shift
 };
 
+// The study queue is prefetched in batches and refilled when it runs low,
+// so the backend is only contacted every few cards instead of for every card.
+const STUDY_BATCH_SIZE = 20;
+const STUDY_REFILL_THRESHOLD = 3;
+
 const hintContainerStyle = {
     minHeight: '24px', // Reserve space for the hint
     fontStyle: 'italic',
@@ -41,18 +46,34 @@ function StudyPage() {
     const [userAnswer, setUserAnswer] = useState('');
     const [showAnswer, setShowAnswer] = useState(false);
     const [feedback, setFeedback] = useState(null);
+    const [reviewError, setReviewError] = useState(''); // Shown when an answer couldn't be checked
     const [hint, setHint] = useState(''); // <-- New state for the hint
     const [hintLoading, setHintLoading] = useState(false); // <-- New state for hint loading
+    const studyQueue = useRef([]); // Prefetched due cards, most urgent first
+    const cardShownAt = useRef(null); // When the current card appeared, for the review log
+
+    const refillStudyQueue = async (excludeId) => {
+        const response = await api.getStudyBatch(deckId, STUDY_BATCH_SIZE, token);
+        const queuedIds = new Set(studyQueue.current.map((card) => card.id));
+        const freshCards = response.data.filter(
+            (card) => card.id !== excludeId && !queuedIds.has(card.id)
+        );
+        studyQueue.current = [...studyQueue.current, ...freshCards];
+    };
 
     const fetchNextCard = async () => {
         setLoading(true);
         setShowAnswer(false);
         setFeedback(null);
+        setReviewError('');
         setUserAnswer('');
         setHint(''); // Reset hint for the new card
         try {
-            const response = await api.getNextCard(deckId, token);
-            setCurrentCard(response.data);
+            if (studyQueue.current.length <= STUDY_REFILL_THRESHOLD) {
+                await refillStudyQueue(currentCard?.id);
+            }
+            setCurrentCard(studyQueue.current.shift() ?? null);
+            cardShownAt.current = Date.now();
         } catch (error) {
             console.error("Failed to fetch next card:", error);
         } finally {
@@ -61,6 +82,7 @@ function StudyPage() {
     };
 
     useEffect(() => {
+        studyQueue.current = [];
         fetchNextCard();
     }, [deckId, token]);
 
@@ -69,11 +91,17 @@ function StudyPage() {
         if (!currentCard || showAnswer) return;
 
         try {
-            const response = await api.reviewCard(currentCard.id, userAnswer, token);
+            const latencyMs = Math.round(Date.now() - cardShownAt.current);
+            const response = await api.reviewCard(currentCard.id, userAnswer, latencyMs, token);
+            setReviewError('');
             setFeedback(response.data);
             setShowAnswer(true);
         } catch (error) {
             console.error("Failed to review card:", error);
+            // 503: the answer couldn't be checked and the card is unchanged, so it can be submitted again.
+            if (error.response?.status === 503) {
+                setReviewError(error.response.data.detail);
+            }
         }
     };
 
@@ -111,6 +139,7 @@ function StudyPage() {
 
                 <div style={{ ...feedbackStyle, color: feedback?.was_correct ? 'var(--accent-secondary)' : 'var(--error-color)' }}>
                     {feedback && (feedback.was_correct ? "Correct!" : "Not quite...")}
+                    {reviewError && <span style={{ fontSize: '16px', fontWeight: 'normal' }}>{reviewError}</span>}
                 </div>
 
                 {showAnswer ? (
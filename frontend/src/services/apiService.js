@@ -21,8 +21,21 @@ export const signup = (email, password) => {
 
 
 // --- Deck Functions ---
-export const getDecks = (token) => {
+// List endpoints are paginated: pass the previous page's next_cursor to get the next page.
+export const getDecks = (token, cursor = null) => {
     return apiClient.get('/decks/', {
+        params: cursor ? { cursor } : {},
+        headers: { Authorization: `Bearer ${token}` }
+    });
+};
+
+/**
+ * Fetches how many cards fall due on each of the next `days` days, in total and per deck.
+ * One request covers every deck, so the dashboard doesn't need a call per deck.
+ */
+export const getForecast = (days, token) => {
+    return apiClient.get('/decks/forecast', {
+        params: { days },
         headers: { Authorization: `Bearer ${token}` }
     });
 };
@@ -41,8 +54,9 @@ export const deleteDeck = (deckId, token) => {
 
 
 // --- Card Management Functions ---
-export const getCardsInDeck = (deckId, token) => {
+export const getCardsInDeck = (deckId, token, cursor = null) => {
     return apiClient.get(`/decks/${deckId}/cards`, {
+        params: cursor ? { cursor } : {},
         headers: { Authorization: `Bearer ${token}` }
     });
 };
@@ -88,9 +102,23 @@ export const getNextCard = (deckId, token) => {
     });
 };
 
-export const reviewCard = (cardId, userAnswer, token) => {
+/**
+ * @description Prefetches the next most urgent due cards for a study session.
+ * @param {string} deckId - The ID of the deck being studied.
+ * @param {number} limit - How many cards to fetch (max 100).
+ * @param {string} token - The user's JWT for authorization.
+ * @returns {Promise}
+ */
+export const getStudyBatch = (deckId, limit, token) => {
+    return apiClient.get(`/decks/${deckId}/study/batch`, {
+        params: { limit },
+        headers: { Authorization: `Bearer ${token}` }
+    });
+};
+
+export const reviewCard = (cardId, userAnswer, latencyMs, token) => {
     return apiClient.patch(`/cards/${cardId}/review`, 
-        { user_answer: userAnswer }, 
+        { user_answer: userAnswer, latency_ms: latencyMs }, 
         { headers: { Authorization: `Bearer ${token}` } }
     );
 };